@@ -1,7 +1,8 @@
 import certifi
-from pymongo import MongoClient
+from pymongo import MongoClient, AsyncMongoClient
 import os
 from dotenv import load_dotenv
+from .services.metrics import mongo_command_timer
 
 load_dotenv()
 
@@ -12,21 +13,37 @@ ca = certifi.where()
 if not MONGO_URL:
     print("WARNING: No MongoDB URL found in environment variables (MANGO_DB_URL/MONGO_DB_URL/DATABASE_URL)")
 
-# Create MongoDB Client with timeout and SSL/TLS settings using certifi
-client = MongoClient(
-    MONGO_URL,
+CLIENT_OPTIONS = dict(
     serverSelectionTimeoutMS=5000,
     connectTimeoutMS=10000,
     tls=True,
     tlsCAFile=ca,
-    tz_aware=True  # Important for consistent datetime comparisons
+    tz_aware=True,  # Important for consistent datetime comparisons
+    event_listeners=[mongo_command_timer],
 )
 
+# Create MongoDB Client with timeout and SSL/TLS settings using certifi
+client = MongoClient(MONGO_URL, **CLIENT_OPTIONS)
+
 db = client.AutoOfferLetterDB
 
+# Native asyncio client for the hot `async def` routes; connects lazily on first use,
+# inside the server's event loop. Background workers keep using the sync client above.
+async_client = AsyncMongoClient(
+    MONGO_URL,
+    maxPoolSize=int(os.getenv("MONGO_ASYNC_POOL_SIZE", "100")),
+    **CLIENT_OPTIONS
+)
+
+async_db = async_client.AutoOfferLetterDB
+
 # Dependency
 def get_db():
     try:
         yield db
     finally:
-        pass 
+        pass
+
+# Async dependency for `async def` routes
+async def get_async_db():
+    yield async_db
@@ -0,0 +1,82 @@
+"""
+Lazy loading for heavy dependencies.
+
+    pd = lazy_import("pandas")          # imported on first attribute access
+    email_client = lazy_object(EmailService)   # constructed on first attribute access
+
+Keeps pandas, PyMuPDF and friends out of cold start for requests that never use them.
+"""
+import importlib
+import importlib.util
+import threading
+
+
+class LazyModule:
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        # The import system's own locking makes concurrent first use safe
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+class LazyObject:
+    """Proxy that builds its target with `factory()` on first use and forwards everything to it."""
+
+    __slots__ = ("_factory", "_target", "_lock")
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self):
+        target = object.__getattribute__(self, "_target")
+        if target is None:
+            with object.__getattribute__(self, "_lock"):
+                target = object.__getattribute__(self, "_target")
+                if target is None:
+                    target = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, attr):
+        return getattr(self._get(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._get(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._get(), attr)
+
+    def __repr__(self):
+        return repr(self._get())
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def lazy_optional(name):
+    """lazy_import() for optional dependencies: None when the package isn't installed."""
+    try:
+        found = importlib.util.find_spec(name.split(".")[0]) is not None
+    except (ImportError, ValueError):
+        found = False
+    return LazyModule(name) if found else None
+
+
+def lazy_object(factory):
+    return LazyObject(factory)
@@ -1,10 +1,20 @@
-from fastapi import FastAPI, Request, Depends
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from .routes import employee, letter, email, upload, offer_response
-from .routes import agreement_company, agreement_letter, agreement_email
+from .routes import agreement_company, agreement_letter, agreement_email, analytics, assets, profiles
 from . import database
+from .services.outbox import outbox_worker
+from .services.template_render import template_renderer
+from .services.health import health_monitor
+from .services.warmup import warmup
+from .services.search import ensure_indexes
+from .services import metrics, profiling
+from .services.compression import CompressionMiddleware
+from .responses import FastJSONResponse
+from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
 
@@ -12,7 +22,37 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Auto Office Letter Generator")
+MAX_LOGGED_BODY_BYTES = 2048
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # List indexes and the search keys of older documents are a migration, not a warm-up:
+    # searches miss documents without keys, so this runs before serving, whatever WARMUP says
+    await asyncio.to_thread(ensure_indexes, database.db)
+    # Background delivery of queued emails (disable with EMAIL_OUTBOX_WORKER=0)
+    if os.getenv("EMAIL_OUTBOX_WORKER", "1") != "0":
+        outbox_worker.start()
+    # Background dependency checks behind /readyz (disable with HEALTH_MONITOR=0)
+    if os.getenv("HEALTH_MONITOR", "1") != "0":
+        health_monitor.start()
+    else:
+        health_monitor.disable()
+    # Warm pools, templates and the LLM in the background; /readyz waits for it (WARMUP=0 to skip)
+    warmup_task = None
+    if os.getenv("WARMUP", "1") != "0":
+        warmup_task = asyncio.create_task(warmup.run())
+    else:
+        warmup.skip()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    health_monitor.stop()
+    outbox_worker.stop()
+    template_renderer.shutdown()
+    await database.async_client.close()
+
+# Routes with a response model keep Pydantic's direct-to-bytes path; the rest render with orjson
+app = FastAPI(title="Auto Office Letter Generator", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -21,16 +61,29 @@ async def log_requests(request: Request, call_next):
     logger.info(f"Response status: {response.status_code}")
     return response
 
+@app.get("/livez")
+async def livez():
+    """Liveness: the process is up and serving. Never touches a dependency."""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness from the health monitor's last snapshot; 503 until MongoDB is reachable."""
+    ready, report = health_monitor.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=report, headers={"Cache-Control": "no-store"})
+
 @app.get("/")
 @app.get("/health")
-def health(db = Depends(database.get_db)):
-    try:
-        # Ping the database to check connectivity
-        db.command("ping")
+async def health():
+    # Served from the background health snapshot; no database round trip per hit
+    mongo = health_monitor.readiness()[1]["checks"].get("mongo")
+    if mongo is None:
+        db_status = "unknown" if health_monitor.enabled else "not monitored"
+    elif mongo["status"] == "ok":
         db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-        
+    else:
+        db_status = f"error: {mongo['error']}"
+
     return {
         "status": "running", 
         "message": "API is live",
@@ -46,6 +99,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for text responses over COMPRESS_MIN_BYTES
+app.add_middleware(CompressionMiddleware)
+
+# Only installed when PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE is set
+if profiling.enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# Outermost, so the histogram covers CORS and logging too
+app.add_middleware(metrics.MetricsMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
 # Include Routers
 app.include_router(employee.router)
 app.include_router(letter.router)
@@ -55,13 +123,22 @@ app.include_router(offer_response.router)
 app.include_router(agreement_company.router)
 app.include_router(agreement_letter.router)
 app.include_router(agreement_email.router)
+app.include_router(analytics.router)
+app.include_router(assets.router)
+app.include_router(profiles.router)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.error(f"Validation Error: {exc.errors()}")
+    # Drop the echoed input: for a missing field it is the whole body, PDF included
+    errors = [{k: v for k, v in err.items() if k != "input"} for err in exc.errors()]
+    logger.error(f"Validation Error: {errors}")
     body = await request.body()
-    logger.error(f"Request Body: {body.decode()}")
+    # Bodies can carry multi-megabyte PDFs; only log/echo the start of them
+    preview = body[:MAX_LOGGED_BODY_BYTES].decode(errors="replace")
+    if len(body) > MAX_LOGGED_BODY_BYTES:
+        preview += f"... [{len(body) - MAX_LOGGED_BODY_BYTES} more bytes truncated]"
+    logger.error(f"Request Body: {preview}")
     return JSONResponse(
         status_code=422,
-        content={"detail": exc.errors(), "body": body.decode()},
+        content={"detail": errors, "body": preview},
     )
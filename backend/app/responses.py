@@ -0,0 +1,51 @@
+"""
+JSON responses rendered with orjson (several times faster than the stdlib encoder on
+large lists). Mongo types are handled directly, so trusted documents can be returned
+without a jsonable_encoder pass: ObjectId becomes its hex string and NaN (pandas imports
+leave it in optional fields) becomes null instead of failing the response.
+"""
+import json
+import math
+from datetime import date, datetime
+from decimal import Decimal
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # optional: falls back to the stdlib encoder
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):  # stdlib fallback only; orjson handles these
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _nan_to_none(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_nan_to_none(v) for v in value]
+    return value
+
+
+def dumps(content):
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_nan_to_none(content), default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content):
+        return dumps(content)
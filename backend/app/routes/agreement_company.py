@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query
 from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from pydantic import BaseModel
 from .. import database
+from ..services import metrics, search, export
+from ..services.status_stats import company_counts
+from ..lazy import lazy_import
+from ..responses import FastJSONResponse
+from ..serializers import DocumentSerializer
 from bson import ObjectId
-from datetime import datetime, date
-import pandas as pd
+from datetime import datetime, date, timezone
 import io
-import math
+import time
+
+pd = lazy_import("pandas")
 
 router = APIRouter(
     prefix="/agreement-companies",
@@ -52,33 +58,21 @@ def fix_id(doc):
         doc.pop("_id", None)
     return doc
 
-def sanitize_doc(doc):
-    if not doc:
-        return doc
-    
-    email = doc.get("email")
+def _imported_email(email):
+    # Spreadsheet imports can leave a phone-number-like float or nothing in the email column
     if email is not None and not isinstance(email, str):
-        doc["email"] = f"{int(email)}@imported.local"
-    elif not email:
-        doc["email"] = "unknown@imported.local"
-    
-    for field in ["designation", "department", "name", "emp_id", "location", 
-                   "employment_type", "address", "replacement", "signature", 
-                   "invoice_post_joining", "payment_release"]:
-        val = doc.get(field)
-        if val is not None:
-            if isinstance(val, float) and math.isnan(val):
-                doc[field] = None
-            elif not isinstance(val, str) and val is not None:
-                doc[field] = str(val)
-    
-    comp = doc.get("compensation")
-    if isinstance(comp, dict) and "percentage" not in comp:
-        doc["compensation"] = {"percentage": 0.0}
-    elif comp is None:
-        doc["compensation"] = {"percentage": 0.0}
-    
-    return doc
+        return f"{int(email)}@imported.local"
+    return email or "unknown@imported.local"
+
+def _agreement_compensation(comp):
+    if isinstance(comp, dict) and "percentage" in comp:
+        return {"percentage": comp["percentage"]}
+    return {"percentage": 0.0}
+
+company_serializer = DocumentSerializer(
+    CompanyResponse,
+    overrides={"email": _imported_email, "compensation": _agreement_compensation},
+)
 
 # ── Routes ──
 @router.post("/", response_model=CompanyResponse)
@@ -107,16 +101,58 @@ def create_company(company: CompanyCreate, db = Depends(database.get_db)):
         }
     }
     
+    new_doc[search.SEARCH_FIELD] = search.search_keys(new_doc)
     result = db.companies.insert_one(new_doc)
     new_doc["_id"] = result.inserted_id
+    company_counts.invalidate()
     
     return fix_id(new_doc)
 
 @router.get("/", response_model=List[CompanyResponse])
-def read_companies(skip: int = 0, limit: int = 100, db = Depends(database.get_db)):
-    cursor = db.companies.find().skip(skip).limit(limit)
-    companies = [sanitize_doc(fix_id(doc)) for doc in cursor]
-    return companies
+def read_companies(
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[List[str]] = Query(None),
+    department: Optional[str] = None,
+    company: Optional[str] = None,
+    joining_from: Optional[date] = None,
+    joining_to: Optional[date] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    q: Optional[str] = None,
+    sort: Optional[str] = None,
+    db = Depends(database.get_db),
+):
+    """Companies page by page, with the same filters and sorting as GET /employees/."""
+    try:
+        order = search.sort_spec(sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query = search.build_filter(
+        equals={"status": status, "department": department, "name": company},
+        ranges={"joining_date": (joining_from, joining_to), "created_at": (created_from, created_to)},
+        q=q,
+    )
+    cursor = db.companies.find(query, company_serializer.projection).sort(order).skip(skip).limit(limit)
+    return FastJSONResponse(company_serializer.many(cursor))
+
+@router.get("/stats")
+def company_stats(db = Depends(database.get_db)):
+    """Company counts per status for the dashboard counters (cached for a few seconds)."""
+    return company_counts.get(db)
+
+@router.get("/export")
+def export_companies(format: str = "xlsx", db = Depends(database.get_db)):
+    """
+    Download every company as .xlsx or .csv, compensation split into columns. Rows are
+    streamed from the database, so memory use doesn't grow with the collection.
+    """
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use xlsx or csv")
+    cursor = db.companies.find({}, export.projection(export.COMPANY_COLUMNS)).sort("_id", 1).batch_size(export.EXPORT_BATCH_ROWS)
+    chunks, media_type = export.stream(cursor, export.COMPANY_COLUMNS, format, "Companies")
+    filename = f"Companies_{datetime.now(timezone.utc):%Y-%m-%d}.{format}"
+    return StreamingResponse(chunks, media_type=media_type, headers={"Content-Disposition": f"attachment; filename={filename}"})
 
 @router.get("/template")
 def download_template():
@@ -156,6 +192,7 @@ def delete_company(company_id: str, db = Depends(database.get_db)):
     result = db.companies.delete_one({"_id": ObjectId(company_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Company not found")
+    company_counts.invalidate()
     
     db.generated_agreements.delete_many({"employee_id": ObjectId(company_id)})
     return
@@ -182,6 +219,8 @@ def update_company(company_id: str, company_update: CompanyCreate, db = Depends(
             "percentage": new_percentage
         }
     
+    update_data[search.SEARCH_FIELD] = search.search_keys({**existing, **update_data})
+
     db.companies.update_one(
         {"_id": ObjectId(company_id)},
         {"$set": update_data}
@@ -192,6 +231,7 @@ def update_company(company_id: str, company_update: CompanyCreate, db = Depends(
 
 @router.post("/upload")
 async def upload_companies_bulk(file: UploadFile = File(...), db = Depends(database.get_db)):
+    started = time.perf_counter()
     try:
         content = await file.read()
         if file.filename.endswith('.xlsx'):
@@ -264,6 +304,7 @@ async def upload_companies_bulk(file: UploadFile = File(...), db = Depends(datab
                         "percentage": pct
                     }
                 }
+                doc[search.SEARCH_FIELD] = search.search_keys(doc)
                 
                 db.companies.insert_one(doc)
                 success_count += 1
@@ -271,6 +312,9 @@ async def upload_companies_bulk(file: UploadFile = File(...), db = Depends(datab
             except Exception as e:
                 errors.append(f"Row {index+2}: {str(e)}")
         
+        if success_count:
+            company_counts.invalidate()
+        metrics.record_import("companies", success_count, len(errors), time.perf_counter() - started)
         return {"status": "success", "imported_count": success_count, "errors": errors}
 
     except Exception as e:
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, File, Form, UploadFile
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from .. import database
-from ..services.agreement_email_service import agreement_email_client
+from ..services import outbox
+from .email import _decode_pdf, read_pdf_upload
 from bson import ObjectId
 
 router = APIRouter(
@@ -10,7 +12,6 @@ router = APIRouter(
 )
 
 from typing import Optional
-import base64
 
 class AgreementEmailRequest(BaseModel):
     employee_id: str
@@ -20,38 +21,59 @@ class AgreementEmailRequest(BaseModel):
     company_name: Optional[str] = "Arah Infotech Pvt Ltd"
     subject: Optional[str] = None
 
-@router.post("/send")
-def send_agreement_email(request: AgreementEmailRequest, db = Depends(database.get_db)):
-    if not ObjectId.is_valid(request.employee_id):
+async def _queue_agreement(db, company_id, letter_content, custom_message, subject, company_name, pdf_bytes):
+    if not ObjectId.is_valid(company_id):
         raise HTTPException(status_code=400, detail="Invalid ObjectId")
 
     # Fetch from companies collection
-    company = db.companies.find_one({"_id": ObjectId(request.employee_id)})
+    company = await db.companies.find_one({"_id": ObjectId(company_id)})
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    # Decode PDF if present
-    pdf_bytes = None
-    if request.pdf_base64:
-        if "base64," in request.pdf_base64:
-            request.pdf_base64 = request.pdf_base64.split("base64,")[1]
-        pdf_bytes = base64.b64decode(request.pdf_base64)
-
-    result = agreement_email_client.send_agreement(
-        recipient_email=company.get("email"),
-        candidate_name=company.get("name"),
-        letter_content=request.letter_content,
+    # The outbox worker sends it and updates the status to "Agreement Sent"
+    message_id = await outbox.enqueue_async(
+        db,
+        outbox.KIND_AGREEMENT,
+        company_id,
+        {
+            "recipient_email": company.get("email"),
+            "candidate_name": company.get("name"),
+            "letter_content": letter_content,
+            "email_body": custom_message,
+            "subject": subject,
+            "company_name": company_name,
+        },
         pdf_content=pdf_bytes,
-        email_body=request.custom_message,
-        subject=request.subject, 
-        company_name=request.company_name
     )
-    
-    # Update Status to "Agreement Sent"
-    if result.get("status") == "success":
-        db.companies.update_one(
-            {"_id": ObjectId(request.employee_id)},
-            {"$set": {"status": "Agreement Sent"}}
-        )
-    
-    return result
+
+    return {"status": "queued", "message": "Email queued for delivery", "message_id": message_id}
+
+@router.post("/send", status_code=202)
+async def send_agreement_email(request: AgreementEmailRequest, db = Depends(database.get_async_db)):
+    """Queue the agreement email for background delivery and return its outbox message id."""
+    if not ObjectId.is_valid(request.employee_id):
+        raise HTTPException(status_code=400, detail="Invalid ObjectId")
+
+    # Decode PDF if present (off the event loop; it can be several MB)
+    pdf_bytes = await run_in_threadpool(_decode_pdf, request.pdf_base64)
+
+    return await _queue_agreement(
+        db, request.employee_id, request.letter_content, request.custom_message,
+        request.subject, request.company_name, pdf_bytes
+    )
+
+@router.post("/send-file", status_code=202)
+async def send_agreement_email_file(
+    employee_id: str = Form(...),
+    letter_content: str = Form(...),
+    custom_message: Optional[str] = Form(None),
+    company_name: Optional[str] = Form("Arah Infotech Pvt Ltd"),
+    subject: Optional[str] = Form(None),
+    pdf: Optional[UploadFile] = File(None),
+    db = Depends(database.get_async_db)
+):
+    """Multipart variant of /send: the PDF arrives as raw bytes instead of a base64 data URI."""
+    return await _queue_agreement(
+        db, employee_id, letter_content, custom_message,
+        subject, company_name, await read_pdf_upload(pdf)
+    )
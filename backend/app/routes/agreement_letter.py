@@ -7,6 +7,11 @@ from datetime import datetime, date
 from pydantic import BaseModel
 from typing import Optional
 import io
+from ..lazy import lazy_optional
+
+# Optional HTML -> DOCX conversion; python-docx and lxml only load on the first download
+htmldocx = lazy_optional("htmldocx")
+docx = lazy_optional("docx")
 
 router = APIRouter(
     prefix="/agreement-letters",
@@ -65,14 +70,11 @@ def generate_agreement_letter(request: AgreementLetterRequest, db = Depends(data
 
 @router.post("/download-docx")
 def download_agreement_docx(html_content: str = Body(..., embed=True)):
-    try:
-        from htmldocx import HtmlToDocx
-        from docx import Document
-    except ImportError:
+    if htmldocx is None or docx is None:
         raise HTTPException(status_code=500, detail="DOCX conversion libraries not installed")
     
-    document = Document()
-    new_parser = HtmlToDocx()
+    document = docx.Document()
+    new_parser = htmldocx.HtmlToDocx()
     new_parser.add_html_to_document(html_content, document)
     
     doc_io = io.BytesIO()
@@ -0,0 +1,42 @@
+"""
+Analytics Routes
+Offer funnel (sent → accepted / rejected / expired) read from the offer_funnel rollups.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from .. import database
+from ..services import offer_funnel
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"]
+)
+
+
+@router.get("/offers")
+def offer_funnel_summary(
+    group_by: str = "company",
+    company: Optional[str] = None,
+    department: Optional[str] = None,
+    designation: Optional[str] = None,
+    since_week: Optional[str] = None,
+    db = Depends(database.get_db)
+):
+    """
+    Acceptance, rejection and expiry rates. `group_by` is a comma-separated subset of
+    company, department, designation, week; `since_week` is an ISO week like 2026-W07.
+    """
+    dims = tuple(d.strip() for d in group_by.split(",") if d.strip())
+    invalid = [d for d in dims if d not in offer_funnel.DIMENSIONS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Cannot group by: {', '.join(invalid)}")
+
+    filters = {"company": company, "department": department, "designation": designation}
+    return offer_funnel.summarize(db, dims, filters, since_week)
+
+
+@router.post("/offers/backfill")
+def backfill_offer_funnel(db = Depends(database.get_db)):
+    """Rebuild the rollups from the employees collection (one-shot, e.g. after first deploy)."""
+    buckets = offer_funnel.backfill(db)
+    return {"status": "success", "buckets": buckets}
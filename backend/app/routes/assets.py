@@ -0,0 +1,50 @@
+"""
+Asset Routes
+Serves content-addressed template assets. Asset URLs never change meaning, so they are
+sent as immutable with a strong ETag; FileResponse handles Range requests.
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from typing import Optional
+from ..services.asset_store import asset_store, pick, CONTENT_TYPES, ASSET_URL_PREFIX
+
+router = APIRouter(
+    prefix=ASSET_URL_PREFIX,
+    tags=["assets"]
+)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@router.get("/manifest")
+def template_manifest():
+    """Logical template name -> renditions (hash, url, size). Revalidated on every use."""
+    return Response(
+        content=asset_store.manifest_path.read_bytes() if asset_store.manifest_path.exists() else b"{}",
+        media_type="application/json",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/by-name/{name}")
+def template_by_name(name: str, rendition: str = "print", format: Optional[str] = None):
+    """Redirect a logical template name to the current hashed asset."""
+    entry = asset_store.resolve(name)
+    url = pick(entry, rendition, format) if entry else None
+    if not url:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return RedirectResponse(url, status_code=302, headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/{filename}")
+def template_asset(filename: str, request: Request):
+    path = asset_store.path_for(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    etag = f'"{filename.split(".")[0]}"'
+    headers = {"Cache-Control": IMMUTABLE, "ETag": etag}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=CONTENT_TYPES[filename.rsplit(".", 1)[1]], headers=headers)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, File, Form, UploadFile
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from .. import database
 from ..services.email_service import email_client
+from ..services import outbox, offer_funnel, offer_tokens
+from ..services.status_stats import employee_counts
 from bson import ObjectId
 
 router = APIRouter(
@@ -9,8 +12,12 @@ router = APIRouter(
     tags=["email"]
 )
 
-from typing import Optional
+from typing import Optional, List
+from datetime import datetime, timezone
 import base64
+import os
+
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_UPLOAD_BYTES", str(15 * 1024 * 1024)))
 
 class EmailRequest(BaseModel):
     employee_id: str
@@ -20,49 +27,162 @@ class EmailRequest(BaseModel):
     company_name: Optional[str] = "Arah Infotech Pvt Ltd"
     subject: Optional[str] = None
 
-@router.post("/send")
-def send_offer_email(request: EmailRequest, db = Depends(database.get_db)):
-    if not ObjectId.is_valid(request.employee_id):
+class BulkEmailRequest(BaseModel):
+    offers: List[EmailRequest]
+
+def _decode_pdf(b64_str: Optional[str]) -> Optional[bytes]:
+    if not b64_str or not isinstance(b64_str, str):
+        return None
+    # Remove data URI header if present
+    if "base64," in b64_str:
+        b64_str = b64_str.split("base64,")[1]
+    return base64.b64decode(b64_str)
+
+async def read_pdf_upload(pdf: Optional[UploadFile]) -> Optional[bytes]:
+    """Read a multipart PDF part. Starlette has already spooled it to a temp file while parsing,
+    so this is the only copy of the bytes we hold. UploadFile reads a rolled-over file in the
+    threadpool, keeping the up to 15 MB read off the event loop."""
+    if pdf is None:
+        return None
+    if pdf.content_type not in ("application/pdf", "application/octet-stream"):
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+    await pdf.seek(0)
+    data = await pdf.read(MAX_PDF_BYTES + 1)
+    if len(data) > MAX_PDF_BYTES:
+        raise HTTPException(status_code=413, detail="PDF too large")
+    return data or None
+
+async def _queue_offer(db, employee_id, letter_content, custom_message, subject, company_name, pdf_bytes):
+    if not ObjectId.is_valid(employee_id):
         raise HTTPException(status_code=400, detail="Invalid ObjectId")
 
     # 1. Fetch Employee
-    employee = db.employees.find_one({"_id": ObjectId(request.employee_id)})
+    employee = await db.employees.find_one({"_id": ObjectId(employee_id)})
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    # Decode PDF if present
-    pdf_bytes: Optional[bytes] = None
-    b64_str = request.pdf_base64
-    if b64_str and isinstance(b64_str, str):
-        # Remove data URI header if present
-        if "base64," in b64_str:
-            b64_str = b64_str.split("base64,")[1]
-        pdf_bytes = base64.b64decode(b64_str)
-
-    # 2. Send Email (Backend Process)
-    result = email_client.send_offer_letter(
-        recipient_email=employee.get("email"),
-        candidate_name=employee.get("name"),
-        letter_content=request.letter_content,
+    # 2. Enqueue; the outbox worker sends it and marks the employee "Offer Sent"
+    message_id = await outbox.enqueue_async(
+        db,
+        outbox.KIND_OFFER,
+        employee_id,
+        {
+            "recipient_email": employee.get("email"),
+            "candidate_name": employee.get("name"),
+            "letter_content": letter_content,
+            "email_body": custom_message,
+            "subject": subject,
+            "company_name": company_name,
+        },
         pdf_content=pdf_bytes,
-        email_body=request.custom_message,
-        subject=request.subject, 
-        company_name=request.company_name,
-        employee_id=request.employee_id
     )
-    
-    # 3. Update Status and Expiration if Sent
-    if result.get("status") == "success":
-        from datetime import datetime, timedelta, timezone
+
+    return {"status": "queued", "message": "Email queued for delivery", "message_id": message_id}
+
+@router.post("/send", status_code=202)
+async def send_offer_email(request: EmailRequest, db = Depends(database.get_async_db)):
+    """Queue the offer email for background delivery and return its outbox message id."""
+    if not ObjectId.is_valid(request.employee_id):
+        raise HTTPException(status_code=400, detail="Invalid ObjectId")
+
+    return await _queue_offer(
+        db, request.employee_id, request.letter_content, request.custom_message,
+        request.subject, request.company_name, await run_in_threadpool(_decode_pdf, request.pdf_base64)
+    )
+
+@router.post("/send-file", status_code=202)
+async def send_offer_email_file(
+    employee_id: str = Form(...),
+    letter_content: str = Form(...),
+    custom_message: Optional[str] = Form(None),
+    company_name: Optional[str] = Form("Arah Infotech Pvt Ltd"),
+    subject: Optional[str] = Form(None),
+    pdf: Optional[UploadFile] = File(None),
+    db = Depends(database.get_async_db)
+):
+    """Multipart variant of /send: the PDF arrives as raw bytes instead of a base64 data URI."""
+    return await _queue_offer(
+        db, employee_id, letter_content, custom_message,
+        subject, company_name, await read_pdf_upload(pdf)
+    )
+
+@router.get("/outbox/status")
+def get_outbox_status(db = Depends(database.get_db)):
+    return outbox.outbox_status(db)
+
+@router.get("/outbox/{message_id}")
+def get_outbox_message(message_id: str, db = Depends(database.get_db)):
+    doc = outbox.get_message(db, message_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return {
+        "message_id": str(doc["_id"]),
+        "kind": doc.get("kind"),
+        "target_id": doc.get("target_id"),
+        "status": doc.get("status"),
+        "attempts": doc.get("attempts", 0),
+        "last_error": doc.get("last_error"),
+        "created_at": doc.get("created_at"),
+        "delivered_at": doc.get("delivered_at"),
+        "latency_ms": doc.get("latency_ms"),
+    }
+
+@router.post("/send-bulk")
+def send_bulk_offer_emails(request: BulkEmailRequest, db = Depends(database.get_db)):
+    """
+    Send many offers at once. Offers sharing company, subject, body and attachment are
+    delivered through one Brevo messageVersions request. The successful sends of each request
+    are recorded (one update_many per funnel bucket) as soon as it returns, so a candidate
+    from an early request can answer while later ones are still going out, and a crash
+    mid-campaign leaves at most one request unrecorded.
+    """
+    ids = [ObjectId(o.employee_id) for o in request.offers if ObjectId.is_valid(o.employee_id)]
+    employees = {str(e["_id"]): e for e in db.employees.find({"_id": {"$in": ids}})}
+
+    results = {}
+    offers = []
+    for o in request.offers:
+        employee = employees.get(o.employee_id)
+        if not employee:
+            results[o.employee_id] = {"status": "error", "message": "Employee not found"}
+            continue
+        offers.append({
+            "employee_id": o.employee_id,
+            "recipient_email": employee.get("email"),
+            "candidate_name": employee.get("name"),
+            "letter_content": o.letter_content,
+            "pdf_content": _decode_pdf(o.pdf_base64),
+            "email_body": o.custom_message,
+            "subject": o.subject,
+            "company_name": o.company_name,
+        })
+    companies = {o["employee_id"]: o["company_name"] for o in offers}
+
+    def record_sent(sent):
         now = datetime.now(timezone.utc)
-        expires_at = now + timedelta(hours=24)
-        db.employees.update_one(
-            {"_id": ObjectId(request.employee_id)},
-            {"$set": {
-                "status": "Offer Sent",
-                "sent_at": now,
-                "expires_at": expires_at
-            }}
-        )
-    
-    return result
+        expires_at = offer_tokens.offer_expiry(now)
+        by_bucket = {}
+        for emp_id, result in sent.items():
+            if result.get("status") != "success":
+                continue
+            bucket = offer_funnel.bucket_for(
+                {k: employees[emp_id].get(k) for k in ("department", "designation")}, companies[emp_id], now
+            )
+            by_bucket.setdefault(offer_funnel.bucket_id(bucket), (bucket, []))[1].append(ObjectId(emp_id))
+        for bucket, bucket_ids in by_bucket.values():
+            # Every offer in the request gets the same timestamps, so one update_many per funnel bucket covers them
+            db.employees.update_many(
+                {"_id": {"$in": bucket_ids}},
+                {"$set": {"status": "Offer Sent", "sent_at": now, "expires_at": expires_at, "funnel_bucket": bucket}}
+            )
+            employee_counts.invalidate()
+            offer_funnel.record(db, bucket, offer_funnel.SENT, len(bucket_ids))
+
+    results.update(email_client.send_offer_batch(offers, on_sent=record_sent))
+    sent_ids = [emp_id for emp_id, result in results.items() if result.get("status") == "success"]
+
+    return {
+        "sent_count": len(sent_ids),
+        "failed_count": len(results) - len(sent_ids),
+        "results": results
+    }
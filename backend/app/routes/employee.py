@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query
 from fastapi.responses import StreamingResponse
-from typing import List
+from typing import List, Optional
 from app import database, schemas
+from app.services import offer_funnel, metrics, search, export
+from app.services.status_stats import employee_counts
+from app.lazy import lazy_import
+from app.responses import FastJSONResponse
+from app.serializers import DocumentSerializer
 from bson import ObjectId
 from datetime import datetime, date, timezone
-import pandas as pd
+import asyncio
 import io
+import time
+
+pd = lazy_import("pandas")
 
 router = APIRouter(
     prefix="/employees",
@@ -18,6 +26,9 @@ def fix_id(doc):
         doc["id"] = str(doc["_id"])
     return doc
 
+# Documents are written by this router and the import; the list skips re-validating them
+employee_serializer = DocumentSerializer(schemas.Employee)
+
 @router.post("/", response_model=schemas.Employee)
 def create_employee(employee: schemas.EmployeeCreate, db = Depends(database.get_db)):
     # Check if email exists
@@ -98,32 +109,98 @@ def create_employee(employee: schemas.EmployeeCreate, db = Depends(database.get_
         }
     }
     
+    new_employee_doc[search.SEARCH_FIELD] = search.search_keys(new_employee_doc)
+
     # Insert
     result = db.employees.insert_one(new_employee_doc)
     new_employee_doc["_id"] = result.inserted_id
+    employee_counts.invalidate()
     
     return fix_id(new_employee_doc)
 
-@router.get("/", response_model=List[schemas.Employee])
-def read_employees(skip: int = 0, limit: int = 300, db = Depends(database.get_db)):
-    # 1. Bulk Update Expired Offers (Optimized)
-    db.employees.update_many(
+async def expire_overdue_offers(db):
+    """Reject every "Offer Sent" whose expires_at has passed.
+
+    Each offer is expired by its own conditional update and counted only if that update
+    changed it, so overlapping sweeps (two polls, a poll and /stats) never count one twice.
+    """
+    overdue = await db.employees.find(
         {
             "status": "Offer Sent",
             "expires_at": {"$lt": datetime.now(timezone.utc)}
         },
-        {
-            "$set": {
-                "status": "Rejected", 
-                "rejection_reason": "Offer Expired (24h)"
-            }
-        }
+        offer_funnel.BUCKET_FIELDS
+    ).to_list(length=None)
+    if not overdue:
+        return
+    results = await asyncio.gather(*(
+        db.employees.update_one(
+            {"_id": doc["_id"], "status": "Offer Sent"},
+            {"$set": {"status": "Rejected", "rejection_reason": "Offer Expired (24h)"}}
+        )
+        for doc in overdue
+    ))
+    expired = [doc for doc, result in zip(overdue, results) if result.modified_count]
+    if expired:
+        employee_counts.invalidate()
+        await offer_funnel.record_many_async(db, [offer_funnel.bucket_for(doc) for doc in expired], offer_funnel.EXPIRED)
+
+@router.get("/", response_model=List[schemas.Employee])
+async def read_employees(
+    skip: int = 0,
+    limit: int = 300,
+    status: Optional[List[str]] = Query(None),
+    department: Optional[str] = None,
+    offer_company: Optional[str] = None,
+    joining_from: Optional[date] = None,
+    joining_to: Optional[date] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    q: Optional[str] = None,
+    sort: Optional[str] = None,
+    db = Depends(database.get_async_db),
+):
+    """
+    Employees page by page. `status` may be repeated; `q` matches the start of any word of
+    the name, email or designation; `sort` is a field name, prefixed with "-" for descending.
+    `offer_company` is the company an offer was sent under, recorded when it is sent: it never
+    matches Pending employees, nor offers sent before the offer funnel existed.
+    """
+    try:
+        order = search.sort_spec(sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query = search.build_filter(
+        equals={"status": status, "department": department, "funnel_bucket.company": offer_company},
+        ranges={"joining_date": (joining_from, joining_to), "created_at": (created_from, created_to)},
+        q=q,
     )
 
+    # 1. Bulk Update Expired Offers (Optimized)
+    await expire_overdue_offers(db)
+
     # 2. Fetch Employees
-    cursor = db.employees.find().skip(skip).limit(limit)
-    employees = [fix_id(doc) for doc in cursor]
-    return employees
+    cursor = db.employees.find(query, employee_serializer.projection).sort(order).skip(skip).limit(limit)
+    docs = await cursor.to_list(length=None)
+    return FastJSONResponse(employee_serializer.many(docs))
+
+@router.get("/stats")
+async def employee_stats(db = Depends(database.get_async_db)):
+    """Employee counts per status for the dashboard counters (cached for a few seconds)."""
+    return await employee_counts.get_async(db, before=lambda: expire_overdue_offers(db))
+
+@router.get("/export")
+def export_employees(format: str = "xlsx", db = Depends(database.get_db)):
+    """
+    Download every employee as .xlsx or .csv, compensation split into columns. Rows are
+    streamed from the database, so memory use doesn't grow with the collection.
+    """
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use xlsx or csv")
+    cursor = db.employees.find({}, export.projection(export.EMPLOYEE_COLUMNS)).sort("_id", 1).batch_size(export.EXPORT_BATCH_ROWS)
+    chunks, media_type = export.stream(cursor, export.EMPLOYEE_COLUMNS, format, "Employees")
+    filename = f"Employees_{datetime.now(timezone.utc):%Y-%m-%d}.{format}"
+    return StreamingResponse(chunks, media_type=media_type, headers={"Content-Disposition": f"attachment; filename={filename}"})
 
 @router.get("/template")
 def download_template():
@@ -147,11 +224,11 @@ def download_template():
     )
 
 @router.get("/{employee_id}", response_model=schemas.Employee)
-def read_employee(employee_id: str, db = Depends(database.get_db)):
+async def read_employee(employee_id: str, db = Depends(database.get_async_db)):
     if not ObjectId.is_valid(employee_id):
         raise HTTPException(status_code=400, detail="Invalid ObjectId")
         
-    employee = db.employees.find_one({"_id": ObjectId(employee_id)})
+    employee = await db.employees.find_one({"_id": ObjectId(employee_id)})
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
     
@@ -162,10 +239,13 @@ def read_employee(employee_id: str, db = Depends(database.get_db)):
             try: exp = datetime.fromisoformat(exp.replace("Z", "+00:00"))
             except: pass
         if isinstance(exp, datetime) and datetime.now(timezone.utc) > exp:
-            db.employees.update_one(
-                {"_id": employee["_id"]},
+            expired = await db.employees.update_one(
+                {"_id": employee["_id"], "status": "Offer Sent"},
                 {"$set": {"status": "Rejected", "rejection_reason": "Offer Expired (24h)"}}
             )
+            if expired.modified_count:
+                employee_counts.invalidate()
+                await offer_funnel.record_async(db, offer_funnel.bucket_for(employee), offer_funnel.EXPIRED)
             employee["status"] = "Rejected"
             employee["rejection_reason"] = "Offer Expired (24h)"
     
@@ -179,6 +259,7 @@ def delete_employee(employee_id: str, db = Depends(database.get_db)):
     result = db.employees.delete_one({"_id": ObjectId(employee_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Employee not found")
+    employee_counts.invalidate()
     
     # Cascade delete generated letters
     db.generated_letters.delete_many({"employee_id": ObjectId(employee_id)})
@@ -198,6 +279,7 @@ def bulk_delete_employees(request: BulkDeleteRequest, db = Depends(database.get_
         return
         
     db.employees.delete_many({"_id": {"$in": valid_ids}})
+    employee_counts.invalidate()
     db.generated_letters.delete_many({"employee_id": {"$in": valid_ids}})
     return
 
@@ -269,6 +351,8 @@ def update_employee(employee_id: str, employee_update: schemas.EmployeeCreate, d
             "net_salary": round(net_annual, 2)
         }
     
+    update_data[search.SEARCH_FIELD] = search.search_keys({**existing, **update_data})
+
     # Perform Update
     db.employees.update_one(
         {"_id": ObjectId(employee_id)},
@@ -283,6 +367,7 @@ async def upload_employees_bulk(file: UploadFile = File(...), db = Depends(datab
     """
     Bulk Upload Employees to MongoDB.
     """
+    started = time.perf_counter()
     try:
         content = await file.read()
         if file.filename.endswith('.xlsx'):
@@ -408,6 +493,7 @@ async def upload_employees_bulk(file: UploadFile = File(...), db = Depends(datab
                         "net_salary": round(net_annual, 2)
                     }
                 }
+                doc[search.SEARCH_FIELD] = search.search_keys(doc)
                 
                 db.employees.insert_one(doc)
                 success_count += 1
@@ -415,6 +501,9 @@ async def upload_employees_bulk(file: UploadFile = File(...), db = Depends(datab
             except Exception as e:
                 errors.append(f"Row {index+2}: {str(e)}")
         
+        if success_count:
+            employee_counts.invalidate()
+        metrics.record_import("employees", success_count, len(errors), time.perf_counter() - started)
         return {"status": "success", "imported_count": success_count, "errors": errors}
 
     except Exception as e:
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from pydantic import BaseModel
+from typing import List, Optional
 from .. import database, schemas
 from ..services.ai_service import ai_engine
+from ..services import docx_engine
 from bson import ObjectId
 from datetime import datetime, date
 
@@ -10,12 +15,12 @@ router = APIRouter(
 )
 
 @router.post("/generate", response_model=schemas.LetterResponse)
-def generate_letter(request: schemas.LetterRequest, db = Depends(database.get_db)):
+async def generate_letter(request: schemas.LetterRequest, db = Depends(database.get_async_db)):
     if not ObjectId.is_valid(request.employee_id):
         raise HTTPException(status_code=400, detail="Invalid ObjectId")
 
     # 1. Fetch Employee Data
-    employee = db.employees.find_one({"_id": ObjectId(request.employee_id)})
+    employee = await db.employees.find_one({"_id": ObjectId(request.employee_id)})
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
@@ -96,8 +101,8 @@ def generate_letter(request: schemas.LetterRequest, db = Depends(database.get_db
     # Add Current Date for the Letter Header
     data_context["current_date"] = date.today().strftime('%d-%m-%Y')
 
-    # 4. Call AI Service
-    generated_text = ai_engine.generate_letter(data_context, request.letter_type)
+    # 4. Call AI Service (blocking HTTP client, so off the event loop)
+    generated_text = await run_in_threadpool(ai_engine.generate_letter, data_context, request.letter_type)
     
     # 5. Save History
     new_letter = {
@@ -108,6 +113,50 @@ def generate_letter(request: schemas.LetterRequest, db = Depends(database.get_db
         "file_path": None,
         "generated_on": datetime.utcnow()
     }
-    db.generated_letters.insert_one(new_letter)
+    await db.generated_letters.insert_one(new_letter)
 
     return {"content": generated_text, "file_path": None}
+
+
+class OfferDocxRequest(BaseModel):
+    employee_id: str
+    company_name: Optional[str] = "Arah Infotech Pvt Ltd"
+
+class OfferDocxBatchRequest(BaseModel):
+    employee_ids: List[str]
+    company_name: Optional[str] = "Arah Infotech Pvt Ltd"
+
+@router.post("/download-docx")
+def download_offer_docx(request: OfferDocxRequest, db = Depends(database.get_db)):
+    """Offer letter as a native DOCX in the NAVYA.docx layout, salary annexure included."""
+    if not ObjectId.is_valid(request.employee_id):
+        raise HTTPException(status_code=400, detail="Invalid ObjectId")
+
+    employee = db.employees.find_one({"_id": ObjectId(request.employee_id)})
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    return Response(
+        content=docx_engine.render_offer_docx(employee, request.company_name),
+        media_type=docx_engine.DOCX_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={docx_engine.offer_docx_filename(employee)}"}
+    )
+
+@router.post("/download-docx/batch")
+def download_offer_docx_batch(request: OfferDocxBatchRequest, db = Depends(database.get_db)):
+    """Many offer letters in one ZIP, fetched with a single query."""
+    ids = [ObjectId(i) for i in request.employee_ids if ObjectId.is_valid(i)]
+    if not ids:
+        raise HTTPException(status_code=400, detail="No valid employee ids")
+
+    # Keep the order the client asked for
+    by_id = {doc["_id"]: doc for doc in db.employees.find({"_id": {"$in": ids}})}
+    employees = [by_id[i] for i in ids if i in by_id]
+    if not employees:
+        raise HTTPException(status_code=404, detail="Employees not found")
+
+    return Response(
+        content=docx_engine.render_offer_docx_batch(employees, request.company_name),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=Offer_Letters.zip"}
+    )
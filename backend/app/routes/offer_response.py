@@ -2,10 +2,13 @@
 Offer Response Routes
 Handles accept/reject actions from candidates via unique token links in emails.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
 from .. import database
+from ..services import offer_tokens, response_pages, offer_funnel
+from ..services.status_stats import employee_counts
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime, timezone
 
 router = APIRouter(
@@ -14,342 +17,161 @@ router = APIRouter(
 )
 
 
-def _build_response_page(status: str, candidate_name: str, company_name: str):
-    """Build a beautiful HTML response page shown to the candidate after they click accept/reject."""
-    
-    if status == "accepted":
-        icon = "🎉"
-        title = "Offer Accepted!"
-        message = f"Thank you, <strong>{candidate_name}</strong>! Your acceptance has been recorded."
-        subtitle = f"Welcome to <strong>{company_name}</strong>. Our HR team will be in touch shortly with the next steps."
-        gradient = "linear-gradient(135deg, #10b981 0%, #059669 100%)"
-        accent = "#10b981"
-        bg_accent = "rgba(16, 185, 129, 0.1)"
-    else:
-        icon = "📩"
-        title = "Offer Declined"
-        message = f"Thank you, <strong>{candidate_name}</strong>. Your response has been recorded."
-        subtitle = f"We appreciate your time and wish you all the best in your future endeavors."
-        gradient = "linear-gradient(135deg, #f59e0b 0%, #d97706 100%)"
-        accent = "#f59e0b"
-        bg_accent = "rgba(245, 158, 11, 0.1)"
+def _html_page(content: str, status_code: int = 200):
+    # Result pages differ between the first and second click on the same URL
+    return HTMLResponse(content=content, status_code=status_code, headers={"Cache-Control": "no-store"})
 
-    return f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title} - {company_name}</title>
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;800&display=swap" rel="stylesheet">
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{
-                font-family: 'Inter', -apple-system, system-ui, sans-serif;
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                background: #0f172a;
-                color: #f8fafc;
-                overflow: hidden;
-            }}
-            .bg-grid {{
-                position: fixed;
-                inset: 0;
-                background-image: radial-gradient(circle at 1px 1px, rgba(255,255,255,0.03) 1px, transparent 0);
-                background-size: 40px 40px;
-                pointer-events: none;
-            }}
-            .bg-glow {{
-                position: fixed;
-                width: 600px;
-                height: 600px;
-                border-radius: 50%;
-                background: {accent};
-                opacity: 0.06;
-                filter: blur(120px);
-                top: 50%;
-                left: 50%;
-                transform: translate(-50%, -50%);
-                pointer-events: none;
-            }}
-            .card {{
-                position: relative;
-                z-index: 1;
-                background: rgba(15, 23, 42, 0.8);
-                backdrop-filter: blur(20px);
-                border: 1px solid rgba(255,255,255,0.08);
-                border-radius: 32px;
-                padding: 4rem 3rem;
-                max-width: 560px;
-                width: 90%;
-                text-align: center;
-                box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.5);
-                animation: fadeInUp 0.6s ease-out;
-            }}
-            @keyframes fadeInUp {{
-                from {{ opacity: 0; transform: translateY(30px); }}
-                to {{ opacity: 1; transform: translateY(0); }}
-            }}
-            .icon {{
-                font-size: 4rem;
-                margin-bottom: 1.5rem;
-                display: block;
-                animation: bounce 1s ease-in-out;
-            }}
-            @keyframes bounce {{
-                0%, 100% {{ transform: translateY(0); }}
-                50% {{ transform: translateY(-15px); }}
-            }}
-            .badge {{
-                display: inline-block;
-                background: {gradient};
-                color: white;
-                padding: 8px 20px;
-                border-radius: 50px;
-                font-size: 0.8rem;
-                font-weight: 700;
-                text-transform: uppercase;
-                letter-spacing: 1.5px;
-                margin-bottom: 1.5rem;
-            }}
-            h1 {{
-                font-size: 2.2rem;
-                font-weight: 800;
-                margin-bottom: 1rem;
-                letter-spacing: -0.5px;
-            }}
-            .message {{
-                font-size: 1.05rem;
-                color: #94a3b8;
-                line-height: 1.7;
-                margin-bottom: 0.75rem;
-            }}
-            .subtitle {{
-                font-size: 0.95rem;
-                color: #64748b;
-                line-height: 1.6;
-                margin-top: 1rem;
-                padding: 1rem;
-                background: {bg_accent};
-                border-radius: 12px;
-                border: 1px solid rgba(255,255,255,0.05);
-            }}
-            .company {{
-                margin-top: 2.5rem;
-                padding-top: 1.5rem;
-                border-top: 1px solid rgba(255,255,255,0.06);
-                color: #475569;
-                font-size: 0.85rem;
-                font-weight: 600;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="bg-grid"></div>
-        <div class="bg-glow"></div>
-        <div class="card">
-            <span class="icon">{icon}</span>
-            <div class="badge">{"Accepted" if status == "accepted" else "Declined"}</div>
-            <h1>{title}</h1>
-            <p class="message">{message}</p>
-            <div class="subtitle">{subtitle}</div>
-            <div class="company">© {datetime.now().year} {company_name}. All rights reserved.</div>
-        </div>
-    </body>
-    </html>
+
+def _cached_bytes(body: bytes, body_gzip: bytes, etag: str, media_type: str, cache_control: str,
+                  accept_encoding: str = "", if_none_match: str = "", status_code: int = 200):
+    """Serve a pre-rendered byte string, gzipped when the client accepts it."""
+    headers = {"Cache-Control": cache_control, "ETag": f'"{etag}"', "Vary": "Accept-Encoding"}
+    if if_none_match and etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in accept_encoding:
+        headers["Content-Encoding"] = "gzip"
+        body = body_gzip
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
+
+
+def _invalid_page(status_code: int = 404, accept_encoding: str = "", cacheable: bool = False):
     """
+    The invalid-link page. Only a token that fails verification never becomes valid, so only
+    that answer may be cached; an answer read from the employee can change a moment later
+    (the "Offer Sent" status is written just after the email goes out).
+    """
+    return _cached_bytes(
+        response_pages.INVALID_PAGE, response_pages.INVALID_PAGE_GZIP, response_pages.INVALID_PAGE_ETAG,
+        "text/html; charset=utf-8", "public, max-age=3600" if cacheable else "no-store",
+        accept_encoding=accept_encoding, status_code=status_code,
+    )
 
 
-def _build_already_responded_page(current_status: str, candidate_name: str, company_name: str):
-    """Page shown when the candidate has already responded."""
-    status_text = "accepted" if current_status == "Accepted" else "declined"
-    return f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Already Responded - {company_name}</title>
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;800&display=swap" rel="stylesheet">
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{
-                font-family: 'Inter', -apple-system, system-ui, sans-serif;
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                background: #0f172a;
-                color: #f8fafc;
-            }}
-            .card {{
-                background: rgba(15, 23, 42, 0.8);
-                backdrop-filter: blur(20px);
-                border: 1px solid rgba(255,255,255,0.08);
-                border-radius: 32px;
-                padding: 4rem 3rem;
-                max-width: 500px;
-                width: 90%;
-                text-align: center;
-                box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.5);
-            }}
-            .icon {{ font-size: 3rem; margin-bottom: 1rem; }}
-            h1 {{ font-size: 1.8rem; font-weight: 800; margin-bottom: 1rem; }}
-            p {{ color: #94a3b8; line-height: 1.6; }}
-        </style>
-    </head>
-    <body>
-        <div class="card">
-            <span class="icon">ℹ️</span>
-            <h1>Already Responded</h1>
-            <p>Hi <strong>{candidate_name}</strong>, you have already <strong>{status_text}</strong> this offer.</p>
-            <p style="margin-top: 1rem; color: #64748b;">If you believe this is an error, please contact the HR team.</p>
-        </div>
-    </body>
-    </html>
+@router.get("/assets/{filename}")
+def response_page_asset(filename: str, request: Request):
+    """Shared stylesheet for the response pages; the name carries the content hash."""
+    if filename != response_pages.CSS_FILENAME:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return _cached_bytes(
+        response_pages.RESPONSE_CSS, response_pages.CSS_GZIP, response_pages.CSS_ETAG,
+        "text/css; charset=utf-8", "public, max-age=31536000, immutable",
+        accept_encoding=request.headers.get("accept-encoding", ""),
+        if_none_match=request.headers.get("if-none-match", ""),
+    )
+
+
+async def _resolve_token(db, token: str):
+    """Return (employee_id, company_name, token_version) for a token, or None.
+
+    Signed tokens are verified in memory. Bare UUID tokens from emails sent before signed
+    tokens existed are still looked up in offer_tokens; they carry no version (None).
     """
+    if offer_tokens.is_signed(token):
+        claims = offer_tokens.verify(token)
+        if claims is None:
+            return None
+        return claims.employee_id, claims.company_name, claims.version
+
+    token_doc = await db.offer_tokens.find_one({"token": token})
+    if not token_doc:
+        return None
+    return token_doc["employee_id"], token_doc.get("company_name", "The Company"), None
+
+
+def _parse_expiry(expires_at):
+    if isinstance(expires_at, str):
+        try: expires_at = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+        except: return None
+    if isinstance(expires_at, datetime) and expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at if isinstance(expires_at, datetime) else None
 
 
-def _build_invalid_page():
-    """Page shown for invalid or expired tokens."""
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Invalid Link</title>
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;800&display=swap" rel="stylesheet">
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body {
-                font-family: 'Inter', -apple-system, system-ui, sans-serif;
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                background: #0f172a;
-                color: #f8fafc;
-            }
-            .card {
-                background: rgba(15, 23, 42, 0.8);
-                backdrop-filter: blur(20px);
-                border: 1px solid rgba(255,255,255,0.08);
-                border-radius: 32px;
-                padding: 4rem 3rem;
-                max-width: 500px;
-                width: 90%;
-                text-align: center;
-            }
-            .icon { font-size: 3rem; margin-bottom: 1rem; }
-            h1 { font-size: 1.8rem; font-weight: 800; margin-bottom: 1rem; color: #ef4444; }
-            p { color: #94a3b8; line-height: 1.6; }
-        </style>
-    </head>
-    <body>
-        <div class="card">
-            <span class="icon">⚠️</span>
-            <h1>Invalid or Expired Link</h1>
-            <p>This link is no longer valid. Please contact the HR team if you need assistance.</p>
-        </div>
-    </body>
-    </html>
+async def _respond(db, token: str, decision: str, accept_encoding: str = ""):
+    """Record an accept/reject decision for the offer behind `token`.
+
+    The happy path is a single conditional find_one_and_update: it only matches while the
+    offer is still "Offer Sent" and unexpired, so of two simultaneous clicks exactly one wins.
+    Everything else (already answered, expired, revoked) is resolved on the slow path below.
     """
+    resolved = await _resolve_token(db, token)
+    if not resolved:
+        return _invalid_page(404, accept_encoding, cacheable=True)
 
+    employee_id, company_name, token_version = resolved
+    now = datetime.now(timezone.utc)
+    update = {"$set": {
+        "status": "Accepted" if decision == "accepted" else "Rejected",
+        "offer_responded_at": now,
+        "offer_response": decision
+    }}
 
-@router.get("/accept")
-def accept_offer(token: str, db = Depends(database.get_db)):
-    """Handle offer acceptance from email link."""
-    token_doc = db.offer_tokens.find_one({"token": token})
-    if not token_doc:
-        return HTMLResponse(content=_build_invalid_page(), status_code=404)
-    
-    employee_id = token_doc["employee_id"]
-    company_name = token_doc.get("company_name", "The Company")
-    
-    employee = db.employees.find_one({"_id": ObjectId(employee_id)})
+    # Offers sent before expiry tracking have no expires_at; they stay answerable
+    query = {
+        "_id": ObjectId(employee_id),
+        "status": "Offer Sent",
+        "$or": [{"expires_at": {"$gt": now}}, {"expires_at": None}],
+    }
+    # A newer offer bumps the token version, so only the latest link may record a decision
+    if token_version is not None:
+        query["offer_token_version"] = token_version
+
+    event = offer_funnel.ACCEPTED if decision == "accepted" else offer_funnel.REJECTED
+    employee = await db.employees.find_one_and_update(
+        query, update, projection={"name": 1, **offer_funnel.BUCKET_FIELDS}, return_document=ReturnDocument.AFTER
+    )
+    if employee:
+        employee_counts.invalidate()
+        await offer_funnel.record_async(db, offer_funnel.bucket_for(employee), event)
+        return _html_page(response_pages.result_page(decision, employee.get("name", "Candidate"), company_name))
+
+    # Slow path: work out which page to show
+    employee = await db.employees.find_one(
+        {"_id": ObjectId(employee_id)},
+        {"name": 1, "status": 1, "expires_at": 1, "offer_token_version": 1, **offer_funnel.BUCKET_FIELDS}
+    )
     if not employee:
-        return HTMLResponse(content=_build_invalid_page(), status_code=404)
-    
+        return _invalid_page(404, accept_encoding)
+    if token_version is not None and employee.get("offer_token_version") != token_version:
+        return _invalid_page(404, accept_encoding)
+
     candidate_name = employee.get("name", "Candidate")
     current_status = employee.get("status", "")
-    
-    # Check if expired
-    expires_at = employee.get("expires_at")
-    if expires_at:
-        if isinstance(expires_at, str):
-            try: expires_at = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
-            except: expires_at = None
-        
-        if expires_at and hasattr(expires_at, "tzinfo"):
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-            if datetime.now(timezone.utc) > expires_at:
-                db.employees.update_one(
-                    {"_id": ObjectId(employee_id)},
-                    {"$set": {"status": "Rejected", "rejection_reason": "Offer Expired (24h)"}}
-                )
-                return HTMLResponse(content=_build_invalid_page(), status_code=200)
-
     if current_status in ("Accepted", "Rejected"):
-        return HTMLResponse(content=_build_already_responded_page(current_status, candidate_name, company_name), status_code=200)
-    
-    db.employees.update_one(
-        {"_id": ObjectId(employee_id)},
-        {"$set": {
-            "status": "Accepted",
-            "offer_responded_at": datetime.now(timezone.utc),
-            "offer_response": "accepted"
-        }}
+        return _html_page(response_pages.already_responded_page(current_status, candidate_name, company_name))
+    if current_status != "Offer Sent":
+        return _invalid_page(404, accept_encoding)
+
+    expires_at = _parse_expiry(employee.get("expires_at"))
+    if expires_at is None or now <= expires_at:
+        # Legacy string/unparseable expires_at the fast-path filter can't compare; still guarded by status
+        retry_query = {"_id": ObjectId(employee_id), "status": "Offer Sent"}
+        if token_version is not None:
+            retry_query["offer_token_version"] = token_version
+        if await db.employees.find_one_and_update(retry_query, update, projection={"_id": 1}):
+            employee_counts.invalidate()
+            await offer_funnel.record_async(db, offer_funnel.bucket_for(employee), event)
+            return _html_page(response_pages.result_page(decision, candidate_name, company_name))
+        latest = await db.employees.find_one({"_id": ObjectId(employee_id)}, {"status": 1}) or {}
+        return _html_page(response_pages.already_responded_page(latest.get("status", ""), candidate_name, company_name))
+
+    expired = await db.employees.update_one(
+        {"_id": ObjectId(employee_id), "status": "Offer Sent"},
+        {"$set": {"status": "Rejected", "rejection_reason": "Offer Expired (24h)"}}
     )
-    return HTMLResponse(content=_build_response_page("accepted", candidate_name, company_name), status_code=200)
+    if expired.modified_count:
+        employee_counts.invalidate()
+        await offer_funnel.record_async(db, offer_funnel.bucket_for(employee), offer_funnel.EXPIRED)
+    return _invalid_page(200, accept_encoding)
+
+
+@router.get("/accept")
+async def accept_offer(token: str, request: Request, db = Depends(database.get_async_db)):
+    """Handle offer acceptance from email link."""
+    return await _respond(db, token, "accepted", request.headers.get("accept-encoding", ""))
 
 
 @router.get("/reject")
-def reject_offer(token: str, db = Depends(database.get_db)):
+async def reject_offer(token: str, request: Request, db = Depends(database.get_async_db)):
     """Handle offer rejection from email link."""
-    token_doc = db.offer_tokens.find_one({"token": token})
-    if not token_doc:
-        return HTMLResponse(content=_build_invalid_page(), status_code=404)
-    
-    employee_id = token_doc["employee_id"]
-    company_name = token_doc.get("company_name", "The Company")
-    
-    employee = db.employees.find_one({"_id": ObjectId(employee_id)})
-    if not employee:
-        return HTMLResponse(content=_build_invalid_page(), status_code=404)
-    
-    candidate_name = employee.get("name", "Candidate")
-    current_status = employee.get("status", "")
-    
-    # Check if expired
-    expires_at = employee.get("expires_at")
-    if expires_at:
-        if isinstance(expires_at, str):
-            try: expires_at = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
-            except: expires_at = None
-        
-        if expires_at and hasattr(expires_at, "tzinfo"):
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-            if datetime.now(timezone.utc) > expires_at:
-                db.employees.update_one(
-                    {"_id": ObjectId(employee_id)},
-                    {"$set": {"status": "Rejected", "rejection_reason": "Offer Expired (24h)"}}
-                )
-                return HTMLResponse(content=_build_invalid_page(), status_code=200)
-
-    if current_status in ("Accepted", "Rejected"):
-        return HTMLResponse(content=_build_already_responded_page(current_status, candidate_name, company_name), status_code=200)
-    
-    db.employees.update_one(
-        {"_id": ObjectId(employee_id)},
-        {"$set": {
-            "status": "Rejected",
-            "offer_responded_at": datetime.now(timezone.utc),
-            "offer_response": "rejected"
-        }}
-    )
-    return HTMLResponse(content=_build_response_page("rejected", candidate_name, company_name), status_code=200)
+    return await _respond(db, token, "rejected", request.headers.get("accept-encoding", ""))
@@ -0,0 +1,42 @@
+"""
+Profile Routes
+Reports captured by the profiling middleware. Admin only: every call needs the
+X-Profile-Token header, and the routes 404 when PROFILE_ADMIN_TOKEN is not configured.
+"""
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import HTMLResponse
+from typing import Optional
+from ..services import profiling
+
+router = APIRouter(
+    prefix="/debug/profiles",
+    tags=["debug"],
+    include_in_schema=False
+)
+
+
+def _require_admin(token):
+    if not profiling.PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiling.is_admin(token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+@router.get("/")
+def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """Most recent profiles first, with their per-category time breakdown."""
+    _require_admin(x_profile_token)
+    return {"profiles": profiling.profile_store.summaries()}
+
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str, format: str = "html", x_profile_token: Optional[str] = Header(None)):
+    """The pyinstrument HTML report, or the summary with `?format=json`."""
+    _require_admin(x_profile_token)
+    profile = profiling.profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    summary, html = profile
+    if format == "json":
+        return summary
+    return HTMLResponse(html, headers={"Cache-Control": "no-store"})
@@ -1,81 +1,80 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Request
-import shutil
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
 import os
-from pathlib import Path
+from ..services.template_render import template_renderer, RenderBusy, RENDER_DPI
+from ..services.asset_store import asset_store, pick, ASSET_URL_PREFIX
 
 router = APIRouter(
     prefix="/upload",
     tags=["Upload"]
 )
 
-# Relative path to the frontend public folder from this backend file
-# backend/app/routes/upload.py -> backend/app/routes -> backend/app -> backend -> ROOT -> public
-# So it is ../../../public
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
-PUBLIC_DIR = BASE_DIR / "public"
+MAX_TEMPLATE_PDF_BYTES = int(os.getenv("MAX_TEMPLATE_PDF_BYTES", str(25 * 1024 * 1024)))
+MIN_DPI, MAX_DPI = 72, 600
 
-import fitz # PyMuPDF
+def _upload_response(filename, entry):
+    return {
+        "filename": filename, "url": pick(entry), "status": "success",
+        "manifest": f"{ASSET_URL_PREFIX}/manifest", "renditions": entry["renditions"]
+    }
 
 @router.post("/template-image")
 async def upload_template_image(request: Request, file: UploadFile = File(...)):
     """
-    Uploads a JPG/PNG template image directly to the frontend's public folder.
+    Uploads a JPG/PNG template image into the content-addressed asset store as
+    thumbnail/preview/print renditions, registered in the manifest under its filename.
     """
     try:
         # Validate file type
         if not file.content_type.startswith("image/"):
             raise HTTPException(status_code=400, detail="File must be an image (JPG/PNG)")
 
-        # Ensure public directory exists
-        if not os.path.exists(PUBLIC_DIR):
-             raise HTTPException(status_code=500, detail=f"Public directory not found at {PUBLIC_DIR}")
+        image_bytes = await file.read(MAX_TEMPLATE_PDF_BYTES + 1)
+        if len(image_bytes) > MAX_TEMPLATE_PDF_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
 
-        file_path = PUBLIC_DIR / file.filename
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        return {"filename": file.filename, "path": str(file_path), "status": "success", "url": f"/{file.filename}"}
+        renditions = await template_renderer.renditions(image_bytes, "image")
+        entry = await run_in_threadpool(asset_store.register, file.filename, renditions)
+        return _upload_response(file.filename, entry)
 
+    except HTTPException:
+        raise
+    except RenderBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/template-pdf")
-async def upload_template_pdf(request: Request, file: UploadFile = File(...)):
+async def upload_template_pdf(request: Request, file: UploadFile = File(...), dpi: Optional[int] = None):
     """
-    Uploads a PDF, converts the first page to a high-quality JPG, and saves it to public folder.
-    Returns the URL of the generated image.
+    Uploads a PDF, converts the first page to a high-quality JPG plus thumbnail/preview
+    renditions, and stores them in the content-addressed asset store. Returns the URL of the
+    print image. Conversion runs in the template render pool, so a 300-dpi rasterization
+    never blocks other requests.
     """
     try:
         if not file.content_type == "application/pdf":
             raise HTTPException(status_code=400, detail="File must be a PDF")
 
-        if not os.path.exists(PUBLIC_DIR):
-             raise HTTPException(status_code=500, detail=f"Public directory not found at {PUBLIC_DIR}")
+        # 1. Read the upload into memory (no temp PDF on disk)
+        pdf_bytes = await file.read(MAX_TEMPLATE_PDF_BYTES + 1)
+        if len(pdf_bytes) > MAX_TEMPLATE_PDF_BYTES:
+            raise HTTPException(status_code=413, detail="PDF too large")
 
-        # 1. Save PDF Temporarily
-        temp_pdf_path = PUBLIC_DIR / f"temp_{file.filename}"
-        with open(temp_pdf_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # 2. Convert to Image
-        doc = fitz.open(temp_pdf_path)
-        page = doc.load_page(0) # First page
-        pix = page.get_pixmap(dpi=300) # High Quality
-        
-        # 3. Save Image
+        # 2. Render all renditions in the pool
+        render_dpi = min(max(dpi or RENDER_DPI, MIN_DPI), MAX_DPI)
+        renditions = await template_renderer.renditions(pdf_bytes, "pdf", render_dpi)
+
+        # 3. Store under content hashes; the manifest maps "<name>.pdf.jpg" to them
         image_filename = f"{file.filename}.jpg"
-        image_path = PUBLIC_DIR / image_filename
-        pix.save(image_path)
-        
-        doc.close()
-        
-        # 4. Cleanup Temp PDF
-        if os.path.exists(temp_pdf_path):
-            os.remove(temp_pdf_path)
-            
-        return {"filename": image_filename, "url": f"/{image_filename}", "status": "success"}
+        entry = await run_in_threadpool(asset_store.register, image_filename, renditions)
+        return _upload_response(image_filename, entry)
 
+    except HTTPException:
+        raise
+    except RenderBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         print(f"Error converting PDF: {e}")
         raise HTTPException(status_code=500, detail=str(e))
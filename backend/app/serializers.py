@@ -0,0 +1,100 @@
+"""
+Trusted-output serializers for list endpoints.
+
+The dashboard polls GET /employees/ and /agreement-companies/ every few seconds, and running
+every document back through Pydantic (nested compensation included) costs more than the query.
+These documents were written by our own routes and imports, so instead of validating them a
+DocumentSerializer is compiled once from the response model: it knows the model's fields,
+their defaults, which ones are dates or nested models, and the Mongo projection that fetches
+only those fields. Converting a document is then a dict build, and the result goes straight
+to orjson via FastJSONResponse.
+
+The output matches what the response model would produce for valid documents. For the messy
+values pandas imports leave behind it is lenient where Pydantic would fail the whole list:
+non-string values in string fields are stringified and NaN becomes null.
+"""
+import math
+import typing
+from datetime import date, datetime
+
+from pydantic import BaseModel
+
+_MISSING = object()
+
+
+def _unwrap(annotation):
+    """The non-None type of Optional[X]."""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _to_str(value):
+    if type(value) is str or value is None:
+        return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return str(value)
+
+
+def _to_date(value):
+    # Routes store dates as midnight datetimes (BSON has no date type)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class DocumentSerializer:
+    def __init__(self, model, overrides=None, id_field="id"):
+        """
+        `overrides` maps a field name to a function of the stored value (missing values
+        are passed as None) and replaces the default conversion for that field.
+        """
+        overrides = overrides or {}
+        self.model = model
+        self.id_field = id_field
+        self._fields = []
+        for name, field in model.model_fields.items():
+            if name == id_field:
+                continue
+            default = field.get_default(call_default_factory=True) if not field.is_required() else None
+            annotation = _unwrap(field.annotation)
+            if name in overrides:
+                convert = overrides[name]
+                default = _MISSING
+            elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                convert = DocumentSerializer(annotation, id_field=None).nested
+            elif annotation is date:
+                convert = _to_date
+            elif annotation is str:
+                convert = _to_str
+            else:
+                convert = None
+            self._fields.append((name, default, convert))
+        self._fields = tuple(self._fields)
+        # Only what the response needs; _id always comes back
+        self.projection = {name: 1 for name, _, _ in self._fields}
+
+    def one(self, doc):
+        out = {}
+        if self.id_field:
+            out[self.id_field] = str(doc["_id"]) if "_id" in doc else doc.get(self.id_field)
+        get = doc.get
+        for name, default, convert in self._fields:
+            if default is _MISSING:
+                out[name] = convert(get(name))
+                continue
+            value = get(name, default)
+            if convert is not None and value is not None:
+                value = convert(value)
+            out[name] = value
+        return out
+
+    def nested(self, value):
+        return self.one(value) if isinstance(value, dict) else None
+
+    def many(self, docs):
+        one = self.one
+        return [one(doc) for doc in docs]
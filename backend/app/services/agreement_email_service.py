@@ -1,11 +1,13 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 import os
 from dotenv import load_dotenv
-import requests
 import base64
+from .smtp_pool import SMTPNotSent, get_smtp_pool
+from .brevo_client import brevo_client, never_sent
+from .email_templates import render_agreement_email
+from ..lazy import lazy_object
 
 # Load environment variables
 from pathlib import Path
@@ -23,25 +25,19 @@ class AgreementEmailService:
         self.smtp_port = 587
         self.sender_email = os.getenv("MAIL_USERNAME", "").strip()
         self.sender_password = os.getenv("MAIL_PASSWORD", "").strip()
+        self.smtp_pool = get_smtp_pool(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password)
         self.brevo_api_key = os.getenv("BREVO_API_KEY", "").strip()
         self.brevo_sender_email = os.getenv("BREVO_SENDER_EMAIL", self.sender_email).strip()
 
-        print(f"DEBUG: AgreementEmailService Init")
-        print(f"DEBUG: Brevo Key loaded: {'YES' if self.brevo_api_key else 'NO'}")
-
     def send_via_brevo(self, recipient_email, candidate_name, subject, body, pdf_content=None, company_name="Arah Infotech Pvt Ltd"):
-        url = "https://api.brevo.com/v3/smtp/email"
-        headers = {
-            "accept": "application/json",
-            "api-key": self.brevo_api_key,
-            "content-type": "application/json"
-        }
         sender_email = self.brevo_sender_email if self.brevo_sender_email else self.sender_email
+        rendered = render_agreement_email(body)
         payload = {
             "sender": {"name": f"{company_name} HR", "email": sender_email},
             "to": [{"email": recipient_email, "name": candidate_name}],
             "subject": subject,
-            "htmlContent": body.replace('\n', '<br>')
+            "htmlContent": rendered.html,
+            "textContent": rendered.text
         }
         if pdf_content:
             try:
@@ -53,15 +49,15 @@ class AgreementEmailService:
             except Exception as e:
                 print(f"Error encoding PDF for Brevo: {e}")
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = brevo_client.send_email(self.brevo_api_key, payload)
             if response.status_code in (200, 201):
                 return {"status": "success", "message": "Email sent successfully via Brevo"}
             else:
                 print(f"Brevo API Error: {response.text}")
-                return {"status": "error", "message": f"Brevo API Error: {response.text}"}
+                return {"status": "error", "message": f"Brevo API Error: {response.text}", "retryable": response.status_code == 429}
         except Exception as e:
             print(f"Brevo Exception: {str(e)}")
-            return {"status": "error", "message": str(e)}
+            return {"status": "error", "message": str(e), "retryable": never_sent(e)}
 
     def send_agreement(self, recipient_email, candidate_name, pdf_content=None, letter_content=None, email_body=None, subject=None, company_name="Arah Infotech Pvt Ltd"):
         if email_body:
@@ -86,14 +82,13 @@ class AgreementEmailService:
                 msg.attach(pdf_attachment)
             if letter_content and not pdf_content:
                 msg.attach(MIMEText(f"\n\n--- AGREEMENT TEXT ---\n{letter_content}", 'plain'))
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            server.send_message(msg)
-            server.quit()
+            self.smtp_pool.send_message(msg)
             return {"status": "success", "message": "Email sent successfully"}
+        except SMTPNotSent as e:
+            print(f"Error sending email: {e}")
+            return {"status": "error", "message": str(e), "retryable": True}
         except Exception as e:
             print(f"Error sending email: {e}")
             return {"status": "error", "message": str(e)}
 
-agreement_email_client = AgreementEmailService()
+agreement_email_client = lazy_object(AgreementEmailService)
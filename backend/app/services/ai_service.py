@@ -1,6 +1,9 @@
 import requests
 import json
 import os
+import time
+
+from .metrics import LLM_SECONDS, LLM_FALLBACKS
 
 class AIService:
     def __init__(self):
@@ -23,6 +26,7 @@ class AIService:
         """
         prompt = self._build_prompt(employee_data, letter_type)
         
+        start = time.perf_counter()
         try:
             # Try connecting to Local AI (Ollama)
             response = requests.post(
@@ -36,15 +40,29 @@ class AIService:
             )
             
             if response.status_code == 200:
+                LLM_SECONDS.labels("ok").observe(time.perf_counter() - start)
                 return response.json().get("response", "")
             else:
+                LLM_SECONDS.labels("error").observe(time.perf_counter() - start)
+                LLM_FALLBACKS.labels("error_status").inc()
                 print("Local AI returned error, ensuring fallback.")
                 return self._fallback_template(employee_data, letter_type)
                 
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            LLM_SECONDS.labels("unavailable").observe(time.perf_counter() - start)
+            LLM_FALLBACKS.labels("unavailable").inc()
             print("Local AI not responding (is Ollama running?). Using Rule-Based Fallback.")
             return self._fallback_template(employee_data, letter_type)
 
+    def warm_up(self, keep_alive="30m", timeout=120):
+        """Load the model into Ollama's memory; an empty prompt loads it without generating."""
+        response = requests.post(
+            self.local_ai_url,
+            json={"model": self.model, "prompt": "", "keep_alive": keep_alive, "stream": False},
+            timeout=timeout
+        )
+        response.raise_for_status()
+
     def _build_prompt(self, data, letter_type):
         role = data.get('role', '').lower()
         company = data.get('company_name', 'Arah Infotech Pvt Ltd')
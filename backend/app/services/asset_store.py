@@ -0,0 +1,104 @@
+"""
+Asset Store
+Content-addressed storage for uploaded template images. Every blob is saved once under
+the hash of its bytes, so a URL always means the same content and can be cached forever;
+re-uploading a template under the same name just points its manifest entry at new hashes.
+The manifest (logical template name -> renditions) is a JSON file next to the blobs.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+ASSET_DIR = Path(os.getenv("TEMPLATE_ASSET_DIR", str(BASE_DIR / "public" / "template-assets")))
+ASSET_URL_PREFIX = "/assets/templates"
+
+HASH_CHARS = 32  # 128 bits of sha256
+EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp", "pdf": "pdf"}
+CONTENT_TYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp", "pdf": "application/pdf"}
+_ASSET_NAME = re.compile(r"^[0-9a-f]{%d}\.(%s)$" % (HASH_CHARS, "|".join(CONTENT_TYPES)))
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class AssetStore:
+    def __init__(self, root=ASSET_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        return self.root / "manifest.json"
+
+    def put(self, data, fmt):
+        """Store bytes under their content hash; returns the asset filename. Idempotent."""
+        digest = hashlib.sha256(data).hexdigest()[:HASH_CHARS]
+        filename = f"{digest}.{EXTENSIONS[fmt]}"
+        path = self.root / filename
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, data)
+        return filename
+
+    def path_for(self, filename):
+        """Filesystem path of a stored asset, or None for anything that isn't one."""
+        if not _ASSET_NAME.match(filename):
+            return None
+        path = self.root / filename
+        return path if path.is_file() else None
+
+    @staticmethod
+    def url_for(filename):
+        return f"{ASSET_URL_PREFIX}/{filename}"
+
+    def manifest(self):
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def resolve(self, name):
+        return self.manifest().get(name)
+
+    def register(self, name, renditions):
+        """Store renditions for a logical template name and point the manifest at them."""
+        entries = []
+        for r in renditions:
+            filename = self.put(r.data, r.format)
+            entries.append({
+                "name": r.name, "format": r.format, "width": r.width, "height": r.height,
+                "bytes": len(r.data), "hash": filename.split(".")[0], "url": self.url_for(filename),
+            })
+        entry = {"updated_at": datetime.now(timezone.utc).isoformat(), "renditions": entries}
+        with self._lock:
+            manifest = self.manifest()
+            manifest[name] = entry
+            self.root.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.manifest_path, json.dumps(manifest, indent=2).encode())
+        return entry
+
+
+def pick(entry, rendition="print", fmt=None):
+    """The URL of one rendition in a manifest entry; prefers the non-WebP copy unless asked."""
+    for r in entry["renditions"]:
+        if r["name"] == rendition and (r["format"] == fmt if fmt else r["format"] != "webp"):
+            return r["url"]
+    return None
+
+
+asset_store = AssetStore()
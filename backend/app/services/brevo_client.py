@@ -0,0 +1,144 @@
+"""
+Brevo HTTP Client
+Shared keep-alive session for the Brevo transactional API with explicit timeouts,
+bounded retries (jittered backoff, honours Retry-After) and per-send latency tracking.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .metrics import EMAIL_SEND_SECONDS
+
+BREVO_SEND_URL = "https://api.brevo.com/v3/smtp/email"
+# Only rate limiting: Brevo may already have queued the email when it answers 5xx, and
+# re-posting it would send the candidate a second offer
+RETRY_STATUSES = {429}
+
+
+def never_sent(error):
+    """True if a send failed before the request reached Brevo (refused, DNS, connect timeout)."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def _parse_retry_after(value):
+    """Retry-After is either delta-seconds or an HTTP date. Returns seconds or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class BrevoClient:
+    def __init__(self, connect_timeout=None, read_timeout=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, pool_size=None):
+        self.connect_timeout = connect_timeout or float(os.getenv("BREVO_CONNECT_TIMEOUT", "5"))
+        self.read_timeout = read_timeout or float(os.getenv("BREVO_READ_TIMEOUT", "30"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("BREVO_MAX_RETRIES", "3"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("BREVO_BACKOFF_BASE", "0.5"))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv("BREVO_BACKOFF_MAX", "20"))
+        pool_size = pool_size or int(os.getenv("BREVO_POOL_SIZE", "10"))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "accept": "application/json",
+            "content-type": "application/json",
+        })
+
+        self._lock = threading.Lock()
+        self.latencies_ms = deque(maxlen=500)
+        self.stats = {"sent": 0, "failed": 0, "retries": 0}
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter: spreads retries from concurrent workers instead of syncing them
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def send_email(self, api_key, payload):
+        """POST a transactional email. Returns the final requests.Response.
+
+        Retries 429 and connection failures up to `max_retries` times. 5xx responses and
+        read timeouts are not retried because Brevo may already have accepted the message.
+        """
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                response = self.session.post(
+                    BREVO_SEND_URL,
+                    json=payload,
+                    headers={"api-key": api_key},
+                    timeout=(self.connect_timeout, self.read_timeout),
+                )
+            except requests.exceptions.ConnectionError:
+                if attempt >= self.max_retries:
+                    self._record(start, ok=False)
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                self._count_retry()
+                continue
+            except Exception:
+                self._record(start, ok=False)
+                raise
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._backoff(attempt, _parse_retry_after(response.headers.get("Retry-After")))
+                print(f"Brevo returned {response.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                attempt += 1
+                self._count_retry()
+                continue
+
+            self._record(start, ok=response.status_code in (200, 201, 202))
+            return response
+
+    def _count_retry(self):
+        with self._lock:
+            self.stats["retries"] += 1
+
+    def _record(self, start, ok):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        EMAIL_SEND_SECONDS.labels("brevo", "ok" if ok else "error").observe(elapsed_ms / 1000)
+        with self._lock:
+            self.latencies_ms.append(elapsed_ms)
+            self.stats["sent" if ok else "failed"] += 1
+        return elapsed_ms
+
+    def latency_summary(self):
+        with self._lock:
+            samples = sorted(self.latencies_ms)
+            stats = dict(self.stats)
+        if not samples:
+            return {**stats, "count": 0}
+
+        def pct(p):
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 1)
+
+        return {**stats, "count": len(samples), "p50_ms": pct(0.50), "p95_ms": pct(0.95), "max_ms": round(samples[-1], 1)}
+
+
+brevo_client = BrevoClient()
@@ -0,0 +1,243 @@
+"""
+DOCX Engine
+Offer letters as native Word documents built from the reference layout in
+offer_letter/NAVYA.docx. The reference is parsed once with python-docx: the sample
+candidate's values are swapped for `{slots}` (keeping each run's formatting), and the
+resulting document.xml is compiled like the email templates. Company fields are baked in
+once per company; a letter is then a string render plus re-zipping the untouched parts.
+"""
+import io
+import os
+import re
+import threading
+import zipfile
+from copy import deepcopy
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from .email_templates import CompiledTemplate
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+REFERENCE_DOCX = Path(os.getenv("OFFER_DOCX_TEMPLATE", str(BASE_DIR / "offer_letter" / "NAVYA.docx")))
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+DOCUMENT_PART = "word/document.xml"
+
+# (text identifying the paragraph, sample value in the reference, slot), applied in order;
+# `last=True` replaces the last occurrence, e.g. the candidate's name after the signatory's
+_PARAGRAPH_SLOTS = (
+    ("For Arah Infotech Pvt Ltd", "Arah Infotech Pvt Ltd", "company_name", False),
+    ("Arah Infotech", "Arah Infotech", "company_title", False),
+    ("Date : ", "28-02-2026", "letter_date", False),
+    ("Dear ", "Navya", "candidate_name", False),
+    ("pleased to offer you", "Software Developer", "designation", False),
+    ("pleased to offer you", "ARAH INFOTECH PVT LTD", "company_upper", False),
+    ("Your CTC would be", "1.8 Lakh", "ctc_lakh", False),
+    ("required to join us on", "02/03/2026", "joining_date", False),
+    ("return it to us by", "02/03/2026", "joining_date", False),
+    ("Rupees: ", "One Lakh Fifty One Thousand Two Hundred", "net_annual_words", False),
+    ("S Navya\tNavya", "Navya", "candidate_name", True),
+)
+
+# Salary annexure rows in the reference table -> compensation keys
+_SALARY_ROWS = {
+    "Basic Salary": "basic",
+    "HRA": "hra",
+    "Conveyance": "conveyance",
+    "Medical Allowance": "medical",
+    "Special Allowance": "special",
+    "Gross Amount": "gross",
+    "PT": "pt",
+    "PF": "pf",
+    "Net Pay": "net",
+}
+
+
+def _replace_in_paragraph(paragraph, old, new, last=False):
+    """Replace `old` with `new` across runs, keeping the formatting of the first run touched."""
+    runs = paragraph.runs
+    text = "".join(r.text for r in runs)
+    start = text.rfind(old) if last else text.find(old)
+    if start < 0:
+        return False
+    end = start + len(old)
+    pos = 0
+    first = None
+    for run in runs:
+        run_start, run_end = pos, pos + len(run.text)
+        pos = run_end
+        if run_end <= start or run_start >= end:
+            continue
+        if first is None:
+            first = run
+            run.text = run.text[:start - run_start] + new + (run.text[end - run_start:] if run_end >= end else "")
+        else:
+            run.text = run.text[end - run_start:] if run_end > end else ""
+    return True
+
+
+def _fill_cell(cell, text, style_from):
+    paragraph = cell.paragraphs[0]
+    if paragraph.runs:
+        _replace_in_paragraph(paragraph, paragraph.text, text)
+        return
+    run = paragraph.add_run(text)
+    if style_from is not None and style_from._r.rPr is not None:
+        run._r.insert(0, deepcopy(style_from._r.rPr))
+
+
+def _tokenize_reference(path):
+    """Parse the reference once and return (compiled document.xml, other parts)."""
+    from docx import Document  # only needed while compiling the skeleton
+
+    document = Document(str(path))
+    for paragraph in document.paragraphs:
+        text = paragraph.text
+        for marker, sample, slot, last in _PARAGRAPH_SLOTS:
+            if marker in text and sample in text:
+                _replace_in_paragraph(paragraph, sample, "{%s}" % slot, last)
+                text = paragraph.text
+
+    # Salary annexure; empty cells (PT in the reference) borrow the formatting of a filled one
+    table = document.tables[0]
+    template_run = next((r for row in table.rows[1:] for c in row.cells[1:] for r in c.paragraphs[0].runs), None)
+    for row in table.rows:
+        cells = row.cells
+        key = _SALARY_ROWS.get(cells[0].text.strip())
+        if key is None:
+            continue
+        _fill_cell(cells[1], "{%s_monthly}" % key, template_run)
+        _fill_cell(cells[2], "{%s_annual}" % key, template_run)
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as package:
+        parts = [(info, package.read(info.filename)) for info in package.infolist()]
+    xml = next(data for info, data in parts if info.filename == DOCUMENT_PART).decode("utf-8")
+    return CompiledTemplate(xml), [(info, data) for info, data in parts if info.filename != DOCUMENT_PART]
+
+
+_skeleton = None
+_skeleton_lock = threading.Lock()
+
+
+def _get_skeleton():
+    global _skeleton
+    with _skeleton_lock:
+        if _skeleton is None:
+            _skeleton = _tokenize_reference(REFERENCE_DOCX)
+        return _skeleton
+
+
+@lru_cache(maxsize=64)
+def _company_template(company_name):
+    """Document template with the company's name baked in; only candidate slots remain."""
+    template, _ = _get_skeleton()
+    return template.partial(**{k: escape(v) for k, v in company_fields(company_name).items()})
+
+
+def company_fields(company_name):
+    short = re.sub(r"\s+(pvt\.?|private)\s*(ltd\.?|limited)?\s*$", "", company_name, flags=re.I).strip()
+    return {"company_title": short or company_name, "company_name": company_name, "company_upper": company_name.upper()}
+
+
+_ONES = ["", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine", "Ten", "Eleven",
+         "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen", "Seventeen", "Eighteen", "Nineteen"]
+_TENS = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
+
+
+def _two_digits(n):
+    return _ONES[n] if n < 20 else " ".join(w for w in (_TENS[n // 10], _ONES[n % 10]) if w)
+
+
+def rupees_in_words(amount):
+    """Indian numbering: 151200 -> "One Lakh Fifty One Thousand Two Hundred"."""
+    n = int(round(amount))
+    if n == 0:
+        return "Zero"
+    words = []
+    for divisor, label in ((10 ** 7, "Crore"), (10 ** 5, "Lakh"), (1000, "Thousand"), (100, "Hundred")):
+        count, n = divmod(n, divisor)
+        if count:
+            words.append(f"{rupees_in_words(count) if count >= 100 else _two_digits(count)} {label}")
+    if n:
+        words.append(_two_digits(n))
+    return " ".join(words)
+
+
+def _format_date(value, fmt):
+    if isinstance(value, (date, datetime)):
+        return value.strftime(fmt)
+    if value:
+        try:
+            return datetime.fromisoformat(str(value).split(" ")[0]).strftime(fmt)
+        except ValueError:
+            return str(value)
+    return ""
+
+
+def offer_fields(employee):
+    """Candidate-specific slot values for one employee document."""
+    comp = employee.get("compensation") or {}
+
+    def annual(key):
+        try:
+            return float(comp.get(key) or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    amounts = {
+        "basic": annual("basic_salary"), "hra": annual("hra"), "conveyance": annual("conveyance"),
+        "medical": annual("medical_allowance"), "special": annual("special_allowance"),
+        "pt": annual("pt"), "pf": annual("pf"),
+    }
+    amounts["gross"] = annual("gross_salary") or sum(amounts[k] for k in ("basic", "hra", "conveyance", "medical", "special"))
+    amounts["net"] = annual("net_salary") or amounts["gross"] - amounts["pt"] - amounts["pf"]
+    ctc = annual("ctc") or amounts["gross"]
+
+    fields = {
+        "candidate_name": employee.get("name") or "Candidate",
+        "designation": employee.get("designation") or "",
+        "letter_date": date.today().strftime("%d-%m-%Y"),
+        "joining_date": _format_date(employee.get("joining_date"), "%d/%m/%Y"),
+        "ctc_lakh": f"{round(ctc / 100000, 2):g} Lakh",
+        "net_annual_words": rupees_in_words(amounts["net"]),
+    }
+    for key, value in amounts.items():
+        fields[f"{key}_monthly"] = f"{value / 12:.2f}" if value else ""
+        fields[f"{key}_annual"] = f"{value:.2f}" if value else ""
+    return fields
+
+
+def render_offer_docx(employee, company_name="Arah Infotech Pvt Ltd"):
+    """Offer letter DOCX bytes for one employee."""
+    _, parts = _get_skeleton()
+    xml = _company_template(company_name).render(**{k: escape(str(v)) for k, v in offer_fields(employee).items()})
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as package:
+        for info, data in parts:
+            package.writestr(info, data)
+        package.writestr(DOCUMENT_PART, xml.encode("utf-8"))
+    return out.getvalue()
+
+
+def offer_docx_filename(employee):
+    name = re.sub(r"[^\w\-]+", "_", employee.get("name") or "Candidate").strip("_") or "Candidate"
+    return f"{name}_Offer_Letter.docx"
+
+
+def render_offer_docx_batch(employees, company_name="Arah Infotech Pvt Ltd"):
+    """A ZIP with one offer letter per employee; duplicate names get a numeric suffix."""
+    out = io.BytesIO()
+    seen = {}
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as archive:  # DOCX parts are already deflated
+        for employee in employees:
+            filename = offer_docx_filename(employee)
+            seen[filename] = seen.get(filename, 0) + 1
+            if seen[filename] > 1:
+                filename = filename.replace(".docx", f"_{seen[filename]}.docx")
+            archive.writestr(filename, render_offer_docx(employee, company_name))
+    return out.getvalue()
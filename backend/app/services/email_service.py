@@ -1,13 +1,11 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 import os
 from dotenv import load_dotenv
-import requests
 import base64
-import uuid
-from datetime import datetime
+import hashlib
+import re
 
 # Load environment variables from .env file
 from pathlib import Path
@@ -22,6 +20,28 @@ else:
 
 # MongoDB connection for token storage
 from ..database import db as mongo_db
+from ..lazy import lazy_object
+from .smtp_pool import SMTPNotSent, get_smtp_pool
+from .brevo_client import brevo_client, never_sent
+from .email_templates import render_offer_email, default_offer_body
+from . import offer_tokens
+
+# Brevo accepts up to 1000 messageVersions per request; keep payloads well under the API body limit
+BREVO_BATCH_MAX_VERSIONS = int(os.getenv("BREVO_BATCH_MAX_VERSIONS", "1000"))
+BREVO_BATCH_MAX_BYTES = int(os.getenv("BREVO_BATCH_MAX_BYTES", str(4 * 1024 * 1024)))
+
+# Brevo renders batch subjects and content as templates, so "{{", "{%" and "{#" in HR-written
+# text would be evaluated; a zero-width space after the brace keeps them literal
+_BREVO_TEMPLATE_SYNTAX = re.compile(r"\{(?=[{%#])")
+
+
+def _brevo_template(text, params):
+    """Escape template syntax in `text`, then turn the `params` sentinels into Brevo placeholders."""
+    text = _BREVO_TEMPLATE_SYNTAX.sub("{\u200b", text)
+    for name, sentinel in params.items():
+        text = text.replace(sentinel, "{{ params.%s }}" % name)
+    return text
+
 
 class EmailService:
     def __init__(self):
@@ -30,6 +50,7 @@ class EmailService:
         self.smtp_port = 587
         self.sender_email = os.getenv("MAIL_USERNAME", "").strip()
         self.sender_password = os.getenv("MAIL_PASSWORD", "").strip()
+        self.smtp_pool = get_smtp_pool(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password)
         
         # Brevo API Config
         self.brevo_api_key = os.getenv("BREVO_API_KEY", "").strip()
@@ -37,87 +58,38 @@ class EmailService:
 
         # Backend URL for offer response links
         self.backend_url = os.getenv("BACKEND_URL", os.getenv("RENDER_EXTERNAL_URL", "https://automated-offer-letter-generator.onrender.com")).strip().rstrip('/')
-
-        # Debug Logging
-        print(f"DEBUG: EmailService Init")
-        print(f"DEBUG: DOTENV Path checked: {dotenv_path}")
-        print(f"DEBUG: Brevo Key loaded: {'YES' if self.brevo_api_key else 'NO'} (Length: {len(self.brevo_api_key)})")
-        print(f"DEBUG: Brevo Sender: {self.brevo_sender_email}")
-        print(f"DEBUG: Backend URL: {self.backend_url}")
         
     def _generate_offer_token(self, employee_id, company_name):
-        """Generate a unique token and store it in MongoDB for offer response tracking."""
-        token = str(uuid.uuid4())
-        
-        # Remove any existing token for this employee (one active token per employee)
-        mongo_db.offer_tokens.delete_many({"employee_id": employee_id})
-        
-        # Store new token
-        mongo_db.offer_tokens.insert_one({
-            "token": token,
-            "employee_id": employee_id,
-            "company_name": company_name,
-            "created_at": datetime.utcnow()
-        })
-        
-        return token
+        """Issue a signed offer token. Bumping the employee's token version revokes older links."""
+        version = offer_tokens.next_token_version(mongo_db, employee_id)
+        return offer_tokens.issue(employee_id, company_name, version)
 
-    def _build_email_html(self, body_html, accept_url, reject_url, company_name):
-        """Build a premium HTML email with Accept/Reject buttons."""
-        return f'''
-        <div style="font-family: 'Segoe UI', Arial, Helvetica, sans-serif; max-width: 600px; margin: 0 auto; background: #ffffff; border-radius: 12px; overflow: hidden; border: 1px solid #e2e8f0;">
-            
-            <!-- Header -->
-            <div style="background: linear-gradient(135deg, #1e293b 0%, #334155 100%); padding: 30px 40px; text-align: center;">
-                <h2 style="color: #ffffff; margin: 0; font-size: 22px; font-weight: 700; letter-spacing: -0.3px;">{company_name}</h2>
-                <p style="color: #94a3b8; margin: 8px 0 0; font-size: 13px; text-transform: uppercase; letter-spacing: 1.5px;">Official Communication</p>
-            </div>
-            
-            <!-- Body -->
-            <div style="padding: 40px;">
-                <div style="font-size: 15px; line-height: 1.7; color: #334155;">
-                    {body_html}
-                </div>
-            </div>
-            
-            <!-- Action Buttons -->
-            <div style="padding: 0 40px 40px; text-align: center;">
-                <p style="color: #64748b; font-size: 13px; margin-bottom: 20px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">
-                    Please respond to this offer:
-                </p>
-                <div style="display: inline-block;">
-                    <a href="{accept_url}" 
-                       style="display: inline-block; background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 14px 40px; text-decoration: none; border-radius: 8px; font-weight: 700; font-size: 15px; margin-right: 12px; box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3);">
-                        ✅ I Accept the Offer
-                    </a>
-                    <a href="{reject_url}" 
-                       style="display: inline-block; background: #ffffff; color: #475569; padding: 14px 40px; text-decoration: none; border-radius: 8px; font-weight: 700; font-size: 15px; border: 2px solid #cbd5e1;">
-                        Decline Offer
-                    </a>
-                </div>
-            </div>
-            
-            <!-- Footer -->
-            <div style="background: #f8fafc; padding: 24px 40px; border-top: 1px solid #e2e8f0; text-align: center;">
-                <p style="color: #94a3b8; font-size: 12px; margin: 0;">
-                    This is an automated email from {company_name}. Please do not reply directly.
-                </p>
-                <p style="color: #cbd5e1; font-size: 11px; margin: 8px 0 0;">
-                    © {datetime.now().year} {company_name}. All rights reserved.
-                </p>
-            </div>
-        </div>
-        '''
-
-    def send_via_brevo(self, recipient_email, candidate_name, subject, body, pdf_content=None, company_name="Arah Infotech Pvt Ltd"):
-        url = "https://api.brevo.com/v3/smtp/email"
-        
-        headers = {
-            "accept": "application/json",
-            "api-key": self.brevo_api_key,
-            "content-type": "application/json"
-        }
-        
+    def _build_body(self, email_body, candidate_name, company_name):
+        """Personalised message as (html, text)."""
+        if email_body:
+            return email_body.replace('\n', '<br>'), email_body
+        return default_offer_body(candidate_name, company_name)
+
+    def _build_response_urls(self, employee_id, company_name, token_version=None):
+        if employee_id:
+            if token_version is None:
+                token = self._generate_offer_token(employee_id, company_name)
+            else:
+                # Resends reuse the version already issued, so links in an earlier copy stay valid
+                token = offer_tokens.issue(employee_id, company_name, token_version)
+            return (f"{self.backend_url}/offer/accept?token={token}",
+                    f"{self.backend_url}/offer/reject?token={token}")
+        # Fallback to mailto: if no employee_id (shouldn't normally happen)
+        sender_email = self.brevo_sender_email if self.brevo_sender_email else self.sender_email
+        return (f"mailto:{sender_email}?subject=I%20Accept%20Offer&body=I%20Accept%20Offer",
+                f"mailto:{sender_email}?subject=Not%20Interested&body=Not%20Interested")
+
+    def _build_email(self, body, accept_url, reject_url, company_name):
+        """Build the premium offer email (HTML + text/plain) with Accept/Reject buttons."""
+        body_html, body_text = body
+        return render_offer_email(company_name, body_html, body_text, accept_url, reject_url)
+
+    def send_via_brevo(self, recipient_email, candidate_name, subject, body, pdf_content=None, company_name="Arah Infotech Pvt Ltd", text_body=None):
         sender_email = self.brevo_sender_email if self.brevo_sender_email else self.sender_email
         
         payload = {
@@ -126,6 +98,8 @@ class EmailService:
             "subject": subject,
             "htmlContent": body
         }
+        if text_body:
+            payload["textContent"] = text_body
         
         if pdf_content:
             try:
@@ -144,47 +118,42 @@ class EmailService:
                 print(f"Error encoding PDF for Brevo: {e}")
                 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            # Shared keep-alive session with timeouts and retries on 429 and connection errors
+            response = brevo_client.send_email(self.brevo_api_key, payload)
             if response.status_code == 201 or response.status_code == 200:
                 return {"status": "success", "message": "Email sent successfully via Brevo"}
             else:
                  print(f"Brevo API Error: {response.text}")
-                 return {"status": "error", "message": f"Brevo API Error: {response.text}"}
+                 # Only a rate limit is known to have been refused before Brevo queued anything
+                 return {"status": "error", "message": f"Brevo API Error: {response.text}", "retryable": response.status_code == 429}
         except Exception as e:
              print(f"Brevo Exception: {str(e)}")
-             return {"status": "error", "message": str(e)}
+             return {"status": "error", "message": str(e), "retryable": never_sent(e)}
 
-    def send_offer_letter(self, recipient_email, candidate_name, pdf_content=None, letter_content=None, email_body=None, subject=None, company_name="Arah Infotech Pvt Ltd", employee_id=None):
+    def send_offer_letter(self, recipient_email, candidate_name, pdf_content=None, letter_content=None, email_body=None, subject=None, company_name="Arah Infotech Pvt Ltd", employee_id=None, token_version=None):
         """
         Sends an email with the offer letter and Accept/Reject action buttons.
+
+        The result has "retryable": True when the email certainly wasn't handed over (rate
+        limited, connection refused), so sending it again can't deliver a second copy.
+        `token_version` reuses an already issued link version instead of revoking older links.
         """
         # Use provided subject or default
         if not subject:
             subject = f"Offer of Employment - {candidate_name}"
             
-        # Build body HTML from the email message
-        if email_body:
-            base_html = email_body.replace('\n', '<br>')
-        else:
-            base_html = f"Dear {candidate_name},<br><br>Congratulations! We are pleased to offer you a position at {company_name}.<br><br>Please find the offer letter attached.<br><br>Regards,<br>HR Team"
+        # Build body from the email message
+        body = self._build_body(email_body, candidate_name, company_name)
         
         # Generate token and build Accept/Reject URLs
-        if employee_id:
-            token = self._generate_offer_token(employee_id, company_name)
-            accept_url = f"{self.backend_url}/offer/accept?token={token}"
-            reject_url = f"{self.backend_url}/offer/reject?token={token}"
-        else:
-            # Fallback to mailto: if no employee_id (shouldn't normally happen)
-            sender_email = self.brevo_sender_email if self.brevo_sender_email else self.sender_email
-            accept_url = f"mailto:{sender_email}?subject=I%20Accept%20Offer&body=I%20Accept%20Offer"
-            reject_url = f"mailto:{sender_email}?subject=Not%20Interested&body=Not%20Interested"
+        accept_url, reject_url = self._build_response_urls(employee_id, company_name, token_version)
         
-        # Build the final premium email HTML
-        final_body = self._build_email_html(base_html, accept_url, reject_url, company_name)
+        # Render the final premium email from the precompiled company template
+        rendered = self._build_email(body, accept_url, reject_url, company_name)
 
         # PRIORITY: Use Brevo API if Key exists
         if self.brevo_api_key:
-            return self.send_via_brevo(recipient_email=recipient_email, candidate_name=candidate_name, subject=subject, body=final_body, pdf_content=pdf_content, company_name=company_name)
+            return self.send_via_brevo(recipient_email=recipient_email, candidate_name=candidate_name, subject=subject, body=rendered.html, pdf_content=pdf_content, company_name=company_name, text_body=rendered.text)
 
         # FALLBACK: Use Gmail SMTP
         try:
@@ -193,7 +162,10 @@ class EmailService:
             msg['To'] = recipient_email
             msg['Subject'] = subject
 
-            msg.attach(MIMEText(final_body, 'html'))
+            alternative = MIMEMultipart('alternative')
+            alternative.attach(MIMEText(rendered.text, 'plain'))
+            alternative.attach(MIMEText(rendered.html, 'html'))
+            msg.attach(alternative)
             
             # Attach PDF if provided
             if pdf_content:
@@ -205,17 +177,133 @@ class EmailService:
             if letter_content and not pdf_content:
                  msg.attach(MIMEText(f"\n\n--- OFFER LETTER TEXT ---\n{letter_content}", 'plain'))
 
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            server.send_message(msg)
-            server.quit()
+            # Reuses an authenticated connection from the shared pool
+            self.smtp_pool.send_message(msg)
             
             return {"status": "success", "message": "Email sent successfully"}
 
+        except SMTPNotSent as e:
+            print(f"Error sending email: {e}")
+            return {"status": "error", "message": str(e), "retryable": True}
         except Exception as e:
             print(f"Error sending email: {e}")
             return {"status": "error", "message": str(e)}
 
-email_client = EmailService()
+    def send_offer_batch(self, offers, on_sent=None):
+        """
+        Sends many offer emails using Brevo messageVersions.
+
+        `offers` is a list of dicts with employee_id, recipient_email, candidate_name and the
+        optional pdf_content, email_body, subject and company_name keys of send_offer_letter.
+        Offers with the same company, subject, body and attachment share one request; each
+        recipient gets its own name and Accept/Reject links through Brevo params. Brevo only
+        allows request-level attachments, so offers with a personalised PDF end up in a group
+        of one and go through the single-send path. Without a PDF, each recipient's
+        letter_content is added to the text part, as on the SMTP path.
+
+        `on_sent`, if given, is called with the {employee_id: result} of each request as soon
+        as it returns, so callers can record sends before the rest of the batch goes out.
+
+        Returns {employee_id: {"status": ..., "message": ...}}.
+        """
+        results = {}
+        groups = {}
+        for offer in offers:
+            company_name = offer.get("company_name") or "Arah Infotech Pvt Ltd"
+            pdf_content = offer.get("pdf_content")
+            pdf_key = hashlib.sha1(pdf_content).hexdigest() if pdf_content else None
+            key = (company_name, offer.get("subject"), offer.get("email_body"), pdf_key)
+            groups.setdefault(key, []).append(offer)
+
+        def done(sent):
+            results.update(sent)
+            if on_sent is not None:
+                on_sent(sent)
+
+        for (company_name, subject, email_body, _), group in groups.items():
+            if len(group) == 1 or not self.brevo_api_key:
+                for offer in group:
+                    done({offer["employee_id"]: self.send_offer_letter(
+                        recipient_email=offer["recipient_email"],
+                        candidate_name=offer["candidate_name"],
+                        pdf_content=offer.get("pdf_content"),
+                        letter_content=offer.get("letter_content"),
+                        email_body=email_body,
+                        subject=subject,
+                        company_name=company_name,
+                        employee_id=offer["employee_id"],
+                    )})
+                continue
+
+            for chunk in self._chunk_batch(group):
+                chunk_result = self._send_brevo_batch(chunk, company_name, subject, email_body)
+                done({offer["employee_id"]: chunk_result for offer in chunk})
+        return results
+
+    def _chunk_batch(self, group):
+        """Split a group to stay under Brevo's per-request version count and payload size."""
+        # The shared attachment counts once per request; versions only carry addresses and links
+        attachment_bytes = len(group[0].get("pdf_content") or b"") * 4 // 3
+        chunk, chunk_bytes = [], attachment_bytes
+        for offer in group:
+            version_bytes = 512 + len(offer["recipient_email"]) + len(offer["candidate_name"] or "")
+            if not offer.get("pdf_content"):
+                version_bytes += len((offer.get("letter_content") or "").encode("utf-8"))
+            if chunk and (len(chunk) >= BREVO_BATCH_MAX_VERSIONS or chunk_bytes + version_bytes > BREVO_BATCH_MAX_BYTES):
+                yield chunk
+                chunk, chunk_bytes = [], attachment_bytes
+            chunk.append(offer)
+            chunk_bytes += version_bytes
+        if chunk:
+            yield chunk
+
+    def _send_brevo_batch(self, chunk, company_name, subject, email_body):
+        sender_email = self.brevo_sender_email if self.brevo_sender_email else self.sender_email
+        pdf_content = chunk[0].get("pdf_content")
+        # Rendered with sentinels so the HR-written text can be escaped before the placeholders go in
+        params = {name: f"__brevo_param_{name}__" for name in ("candidate_name", "accept_url", "reject_url")}
+        body_html, body_text = self._build_body(email_body, params["candidate_name"], company_name)
+        if not pdf_content:
+            params["letter_content"] = "__brevo_param_letter_content__"
+            body_text += f"\n\n--- OFFER LETTER TEXT ---\n{params['letter_content']}"
+        rendered = self._build_email((body_html, body_text), params["accept_url"], params["reject_url"], company_name)
+
+        versions = []
+        for offer in chunk:
+            accept_url, reject_url = self._build_response_urls(offer["employee_id"], company_name)
+            version_params = {
+                "candidate_name": offer["candidate_name"],
+                "accept_url": accept_url,
+                "reject_url": reject_url,
+            }
+            if not pdf_content:
+                version_params["letter_content"] = offer.get("letter_content") or ""
+            versions.append({
+                "to": [{"email": offer["recipient_email"], "name": offer["candidate_name"]}],
+                "params": version_params,
+                "subject": _brevo_template(subject or f"Offer of Employment - {offer['candidate_name']}", {}),
+            })
+
+        payload = {
+            "sender": {"name": f"{company_name} HR", "email": sender_email},
+            "subject": _brevo_template(subject or "Offer of Employment", {}),
+            "htmlContent": _brevo_template(rendered.html, params),
+            "textContent": _brevo_template(rendered.text, params),
+            "messageVersions": versions,
+        }
+        if pdf_content:
+            payload["attachment"] = [{"content": base64.b64encode(pdf_content).decode('utf-8'), "name": "Offer_Letter.pdf"}]
+
+        try:
+            response = brevo_client.send_email(self.brevo_api_key, payload)
+            if response.status_code in (200, 201, 202):
+                return {"status": "success", "message": "Email sent successfully via Brevo batch"}
+            print(f"Brevo Batch API Error: {response.text}")
+            return {"status": "error", "message": f"Brevo API Error: {response.text}"}
+        except Exception as e:
+            print(f"Brevo Batch Exception: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+# Built on first use: construction reads config and sets up the SMTP pool, which cold start doesn't need
+email_client = lazy_object(EmailService)
 
@@ -0,0 +1,141 @@
+"""
+Email Templates
+Precompiled offer/agreement email layouts. The static shell is split into literal
+segments once at import, the per-company header/footer are cached, and only the
+personalised body and the Accept/Reject URLs are interpolated per message.
+"""
+import re
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+RenderedEmail = namedtuple("RenderedEmail", ["html", "text"])
+
+_FIELD = re.compile(r"\{(\w+)\}")
+
+
+class CompiledTemplate:
+    """A template with `{name}` slots, pre-split so rendering is a single join."""
+
+    def __init__(self, source):
+        parts = _FIELD.split(source)
+        self._literals = parts[0::2]
+        self._fields = parts[1::2]
+
+    @property
+    def fields(self):
+        return tuple(self._fields)
+
+    def render(self, **values):
+        out = [self._literals[0]]
+        for name, literal in zip(self._fields, self._literals[1:]):
+            out.append(str(values[name]))
+            out.append(literal)
+        return "".join(out)
+
+    def partial(self, **values):
+        """Bake some slots in and return a template with only the remaining ones."""
+        literals, fields = [self._literals[0]], []
+        for name, literal in zip(self._fields, self._literals[1:]):
+            if name in values:
+                literals[-1] += str(values[name]) + literal
+            else:
+                fields.append(name)
+                literals.append(literal)
+        compiled = CompiledTemplate.__new__(CompiledTemplate)
+        compiled._literals = literals
+        compiled._fields = fields
+        return compiled
+
+
+OFFER_HTML = CompiledTemplate('''
+        <div style="font-family: 'Segoe UI', Arial, Helvetica, sans-serif; max-width: 600px; margin: 0 auto; background: #ffffff; border-radius: 12px; overflow: hidden; border: 1px solid #e2e8f0;">
+            
+            <!-- Header -->
+            <div style="background: linear-gradient(135deg, #1e293b 0%, #334155 100%); padding: 30px 40px; text-align: center;">
+                <h2 style="color: #ffffff; margin: 0; font-size: 22px; font-weight: 700; letter-spacing: -0.3px;">{company_name}</h2>
+                <p style="color: #94a3b8; margin: 8px 0 0; font-size: 13px; text-transform: uppercase; letter-spacing: 1.5px;">Official Communication</p>
+            </div>
+            
+            <!-- Body -->
+            <div style="padding: 40px;">
+                <div style="font-size: 15px; line-height: 1.7; color: #334155;">
+                    {body_html}
+                </div>
+            </div>
+            
+            <!-- Action Buttons -->
+            <div style="padding: 0 40px 40px; text-align: center;">
+                <p style="color: #64748b; font-size: 13px; margin-bottom: 20px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">
+                    Please respond to this offer:
+                </p>
+                <div style="display: inline-block;">
+                    <a href="{accept_url}" 
+                       style="display: inline-block; background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 14px 40px; text-decoration: none; border-radius: 8px; font-weight: 700; font-size: 15px; margin-right: 12px; box-shadow: 0 4px 12px rgba(16, 185, 129, 0.3);">
+                        ✅ I Accept the Offer
+                    </a>
+                    <a href="{reject_url}" 
+                       style="display: inline-block; background: #ffffff; color: #475569; padding: 14px 40px; text-decoration: none; border-radius: 8px; font-weight: 700; font-size: 15px; border: 2px solid #cbd5e1;">
+                        Decline Offer
+                    </a>
+                </div>
+            </div>
+            
+            <!-- Footer -->
+            <div style="background: #f8fafc; padding: 24px 40px; border-top: 1px solid #e2e8f0; text-align: center;">
+                <p style="color: #94a3b8; font-size: 12px; margin: 0;">
+                    This is an automated email from {company_name}. Please do not reply directly.
+                </p>
+                <p style="color: #cbd5e1; font-size: 11px; margin: 8px 0 0;">
+                    © {year} {company_name}. All rights reserved.
+                </p>
+            </div>
+        </div>
+        ''')
+
+# text/plain alternative of the same layout
+OFFER_TEXT = CompiledTemplate(
+    "{company_name}\n"
+    "Official Communication\n\n"
+    "{body_text}\n\n"
+    "Please respond to this offer:\n"
+    "  Accept: {accept_url}\n"
+    "  Decline: {reject_url}\n\n"
+    "--\n"
+    "This is an automated email from {company_name}. Please do not reply directly.\n"
+    "© {year} {company_name}. All rights reserved.\n"
+)
+
+
+@lru_cache(maxsize=128)
+def _offer_templates(company_name, year):
+    """Header/footer baked in once per (company, year); leaves body and URL slots."""
+    return (
+        OFFER_HTML.partial(company_name=company_name, year=year),
+        OFFER_TEXT.partial(company_name=company_name, year=year),
+    )
+
+
+def company_templates(company_name):
+    return _offer_templates(company_name, datetime.now().year)
+
+
+def render_offer_email(company_name, body_html, body_text, accept_url, reject_url):
+    """Render the offer email; only body and action URLs are interpolated per message."""
+    html_template, text_template = company_templates(company_name)
+    return RenderedEmail(
+        html_template.render(body_html=body_html, accept_url=accept_url, reject_url=reject_url),
+        text_template.render(body_text=body_text, accept_url=accept_url, reject_url=reject_url),
+    )
+
+
+def render_agreement_email(body_text):
+    """Agreement emails are plain messages; the HTML part is the same text with line breaks."""
+    return RenderedEmail(body_text.replace('\n', '<br>'), body_text)
+
+
+def default_offer_body(candidate_name, company_name):
+    """Default offer message as (html, text)."""
+    text = (f"Dear {candidate_name},\n\nCongratulations! We are pleased to offer you a position at {company_name}.\n\n"
+            f"Please find the offer letter attached.\n\nRegards,\nHR Team")
+    return text.replace('\n', '<br>'), text
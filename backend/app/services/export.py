@@ -0,0 +1,141 @@
+"""
+Spreadsheet Export
+Employees and agreement companies as CSV or Excel, read from a Mongo cursor in batches so
+memory stays flat however large the collection is. Nested compensation is flattened into
+one column per component.
+
+CSV is written and sent a batch of rows at a time. An .xlsx is a zip whose directory comes
+last, so it can't be sent before every row is read: openpyxl's write_only workbook streams the
+rows into a temporary file and the finished file is then sent in chunks, without ever being
+held in memory.
+"""
+import csv
+import io
+import math
+import os
+import tempfile
+from datetime import date, datetime
+
+from ..lazy import lazy_import
+
+openpyxl = lazy_import("openpyxl")
+
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "1000"))
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FORMATS = ("xlsx", "csv")
+# Leading characters spreadsheet apps treat as the start of a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# (header, dotted field path); compensation amounts are stored annually
+EMPLOYEE_COLUMNS = (
+    ("Employee ID", "emp_id"),
+    ("Full Name", "name"),
+    ("Email Address", "email"),
+    ("Joining Date", "joining_date"),
+    ("Designation", "designation"),
+    ("Department", "department"),
+    ("Employment Type", "employment_type"),
+    ("Location", "location"),
+    ("Status", "status"),
+    ("Annual CTC (₹)", "compensation.ctc"),
+    ("Basic Salary (Annual) (₹)", "compensation.basic_salary"),
+    ("HRA (Annual) (₹)", "compensation.hra"),
+    ("Conveyance (Annual) (₹)", "compensation.conveyance"),
+    ("Medical Allowance (Annual) (₹)", "compensation.medical_allowance"),
+    ("Special Allowance (Annual) (₹)", "compensation.special_allowance"),
+    ("Gross Salary (Annual) (₹)", "compensation.gross_salary"),
+    ("PF (Annual) (₹)", "compensation.pf"),
+    ("PT (Annual) (₹)", "compensation.pt"),
+    ("Deductions (Annual) (₹)", "compensation.deductions"),
+    ("Net Salary (Annual) (₹)", "compensation.net_salary"),
+)
+
+COMPANY_COLUMNS = (
+    ("Company Name", "name"),
+    ("Email Contact", "email"),
+    ("Date of Agreement", "joining_date"),
+    ("Compensation %", "compensation.percentage"),
+    ("Registered Office Address", "address"),
+    ("Replacement Period (Days)", "replacement"),
+    ("Invoice Post Joining (Days)", "invoice_post_joining"),
+    ("Payment Release (Days)", "payment_release"),
+    ("Signatory Name", "signature"),
+    ("Designation", "designation"),
+    ("Status", "status"),
+)
+
+
+def projection(columns):
+    return {path: 1 for _, path in columns}
+
+
+def _text(value):
+    # Names and addresses come from HR forms and imported sheets; a leading quote keeps
+    # Excel/Sheets from running "=HYPERLINK(...)" and the like as a formula
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, datetime):
+        # Dates are stored as midnight datetimes; Excel has no time zones
+        return value.date() if value.time() == datetime.min.time() else value.replace(tzinfo=None)
+    if isinstance(value, str):
+        return _text(value)
+    if isinstance(value, (int, float, date)):
+        return value
+    return _text(str(value))
+
+
+def rows(docs, columns):
+    paths = [path.split(".") for _, path in columns]
+    for doc in docs:
+        row = []
+        for path in paths:
+            value = doc
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            row.append(_cell(value))
+        yield row
+
+
+def stream_csv(docs, columns, batch_rows=EXPORT_BATCH_ROWS):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens the file as UTF-8 (₹ in the headers)
+    buffer.write("\ufeff")
+    writer.writerow([header for header, _ in columns])
+    for i, row in enumerate(rows(docs, columns), 1):
+        writer.writerow(["" if v is None else v.isoformat() if isinstance(v, date) else v for v in row])
+        if i % batch_rows == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_xlsx(docs, columns, title):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append([header for header, _ in columns])
+    for row in rows(docs, columns):
+        sheet.append(row)
+    with tempfile.TemporaryFile() as out:
+        workbook.save(out)
+        out.seek(0)
+        while True:
+            chunk = out.read(EXPORT_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream(docs, columns, fmt, title):
+    """(byte chunks, media type) for `fmt`, one of FORMATS."""
+    if fmt == "csv":
+        return stream_csv(docs, columns), CSV_MEDIA_TYPE
+    return stream_xlsx(docs, columns, title), XLSX_MEDIA_TYPE
@@ -0,0 +1,157 @@
+"""
+Health Monitor
+Dependency health (MongoDB, the local LLM, the mail provider) checked on a background
+thread every HEALTH_CHECK_INTERVAL seconds. Probes read the last snapshot instead of
+touching the network, so /readyz and /health answer in microseconds however slow Atlas is.
+
+Only critical checks (MongoDB) decide readiness: letters fall back to templates without
+the LLM and queued emails wait in the outbox, so those are reported as degraded instead.
+A snapshot older than HEALTH_STALE_AFTER seconds counts as not ready, and so does an
+instance whose startup warm-up (the `gate`) has not finished. With the monitor disabled
+(HEALTH_MONITOR=0) there are no checks to wait for, so readiness follows the warm-up alone.
+"""
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from .warmup import warmup
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+HEALTH_STALE_AFTER = float(os.getenv("HEALTH_STALE_AFTER", str(HEALTH_CHECK_INTERVAL * 4)))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "3"))
+
+BREVO_ACCOUNT_URL = "https://api.brevo.com/v3/account"
+
+OK = "ok"
+DOWN = "down"
+
+
+def check_mongo():
+    from .. import database
+    database.client.admin.command("ping")
+
+
+def check_llm():
+    from .ai_service import ai_engine
+    base = ai_engine.local_ai_url.rsplit("/api/", 1)[0]
+    requests.get(f"{base}/api/tags", timeout=HEALTH_CHECK_TIMEOUT).raise_for_status()
+
+
+def check_mail():
+    from .email_service import email_client
+    if email_client.brevo_api_key:
+        from .brevo_client import brevo_client
+        res = brevo_client.session.get(
+            BREVO_ACCOUNT_URL, headers={"api-key": email_client.brevo_api_key}, timeout=HEALTH_CHECK_TIMEOUT
+        )
+        res.raise_for_status()
+    else:
+        socket.create_connection((email_client.smtp_server, email_client.smtp_port), HEALTH_CHECK_TIMEOUT).close()
+
+
+# name -> (check function, critical for readiness)
+DEFAULT_CHECKS = {
+    "mongo": (check_mongo, True),
+    "llm": (check_llm, False),
+    "mail": (check_mail, False),
+}
+
+
+class HealthMonitor:
+    def __init__(self, checks=None, interval=HEALTH_CHECK_INTERVAL, stale_after=HEALTH_STALE_AFTER, gate=None):
+        self.checks = checks if checks is not None else DEFAULT_CHECKS
+        self.gate = gate  # anything with .done and .report(), e.g. the startup warm-up
+        self.interval = interval
+        self.stale_after = stale_after
+        self.started_at = time.time()
+        # Replaced wholesale by refresh(); readers never see a half-updated snapshot
+        self._results = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.enabled = True
+
+    # ── Lifecycle ──
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        """Run no checks; readiness stops waiting for a snapshot that will never come."""
+        self.enabled = False
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    # ── Checks ──
+    def refresh(self):
+        """Run every check once and publish the results."""
+        results = {}
+        for name, (check, critical) in self.checks.items():
+            start = time.perf_counter()
+            try:
+                check()
+                status, error = OK, None
+            except Exception as e:
+                status, error = DOWN, str(e)[:200]
+            results[name] = {
+                "status": status,
+                "critical": critical,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                "checked_at": time.time(),
+                "error": error,
+            }
+        self._results = results
+        return results
+
+    # ── Probes (no I/O) ──
+    def status_of(self, name):
+        result = self._results.get(name)
+        return result["status"] if result else "unknown"
+
+    def readiness(self):
+        """(ready, report) from the last snapshot, with each check's age in seconds."""
+        now = time.time()
+        checks = {}
+        ready = bool(self._results) or not self.enabled
+        for name, result in self._results.items():
+            age = now - result["checked_at"]
+            stale = age > self.stale_after
+            checks[name] = {
+                **result,
+                "checked_at": datetime.fromtimestamp(result["checked_at"], timezone.utc).isoformat(),
+                "age_seconds": round(age, 3),
+                "stale": stale,
+            }
+            if result["critical"] and (stale or result["status"] != OK):
+                ready = False
+
+        warming = self.gate is not None and not self.gate.done
+        if ready and not warming:
+            status = "degraded" if any(c["status"] != OK for c in checks.values()) else "ready"
+        elif not checks:
+            status = "starting"
+        else:
+            status = "warming_up" if ready else "not_ready"
+        report = {"status": status, "uptime_seconds": round(now - self.started_at, 3), "checks": checks}
+        if not self.enabled:
+            report["monitored"] = False
+        if self.gate is not None:
+            report["warmup"] = self.gate.report()
+        return ready and not warming, report
+
+
+health_monitor = HealthMonitor(gate=warmup)
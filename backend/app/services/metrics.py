@@ -0,0 +1,111 @@
+"""
+Metrics
+Prometheus instruments for the API, exposed at /metrics. Request timing is a plain ASGI
+middleware (no BaseHTTPMiddleware task hop) labelled by route template rather than raw
+path, so /employees/{employee_id} is one series no matter how many ids are requested.
+MongoDB timings come from a PyMongo command listener attached to both clients.
+"""
+import threading
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+MONGO_SECONDS = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency",
+    ["command", "collection", "outcome"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+LLM_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Local LLM generate call latency", ["outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+LLM_FALLBACKS = Counter("llm_fallbacks_total", "Letters generated from the rule-based template instead of the LLM", ["reason"])
+
+EMAIL_SEND_SECONDS = Histogram(
+    "email_send_duration_seconds", "Email send latency by transport, retries included",
+    ["transport", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+IMPORT_ROWS = Counter("import_rows_total", "Spreadsheet rows processed by bulk imports", ["kind", "outcome"])
+IMPORT_SECONDS = Histogram(
+    "import_duration_seconds", "Bulk import request duration", ["kind"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # The router records the matched route on the scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Times every command; the collection is taken from the started event."""
+
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ""
+
+    def _finish(self, event, outcome):
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_SECONDS.labels(event.command_name, collection, outcome).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+def record_import(kind, imported, failed, seconds):
+    IMPORT_ROWS.labels(kind, "imported").inc(imported)
+    IMPORT_ROWS.labels(kind, "failed").inc(failed)
+    IMPORT_SECONDS.labels(kind).observe(seconds)
+
+
+def render():
+    """(body, content type) of the Prometheus text exposition."""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+mongo_command_timer = MongoCommandTimer()
@@ -0,0 +1,192 @@
+"""
+Offer Funnel
+Acceptance/rejection/expiry rollups by company, department, designation and send week.
+Every offer transition bumps one counter in `offer_funnel` with an atomic $inc, so the
+analytics endpoint reads O(buckets) documents instead of scanning employees.
+
+An employee's bucket is fixed when the offer is sent (stored as `funnel_bucket`), so a
+later accept/reject/expiry lands in the same cohort as its send.
+"""
+import uuid
+from collections import Counter
+from datetime import date, datetime
+
+SENT = "sent"
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+EXPIRED = "expired"
+EVENTS = (SENT, ACCEPTED, REJECTED, EXPIRED)
+
+DIMENSIONS = ("company", "department", "designation", "week")
+UNKNOWN = "Unspecified"
+
+# Projection callers add to their employee reads so bucket_for() has what it needs
+BUCKET_FIELDS = {"funnel_bucket": 1, "department": 1, "designation": 1, "sent_at": 1}
+
+
+def week_of(when):
+    """ISO week label, e.g. "2026-W07"."""
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _label(value):
+    if value is None or value != value:  # NaN from spreadsheet imports
+        return UNKNOWN
+    return str(value).strip() or UNKNOWN
+
+
+def bucket_for(employee, company_name=None, sent_at=None):
+    """The funnel bucket for an employee's current offer.
+
+    Offers sent after rollups existed carry `funnel_bucket`; older ones are derived from the
+    employee document the same way the backfill does, with the company unknown.
+    """
+    if employee.get("funnel_bucket"):
+        return employee["funnel_bucket"]
+    sent_at = sent_at or employee.get("sent_at")
+    return {
+        "company": _label(company_name),
+        "department": _label(employee.get("department")),
+        "designation": _label(employee.get("designation")),
+        "week": week_of(sent_at) if isinstance(sent_at, (date, datetime)) else UNKNOWN,
+    }
+
+
+def bucket_id(bucket):
+    return "|".join(bucket[d] for d in DIMENSIONS)
+
+
+def _increment(bucket, event, count):
+    return (
+        {"_id": bucket_id(bucket)},
+        {"$inc": {event: count}, "$setOnInsert": {d: bucket[d] for d in DIMENSIONS}},
+    )
+
+
+def record(db, bucket, event, count=1):
+    """Atomically add `count` to one counter of a bucket, creating the bucket if needed."""
+    if not bucket or count <= 0:
+        return
+    try:
+        db.offer_funnel.update_one(*_increment(bucket, event, count), upsert=True)
+    except Exception as e:
+        # Analytics must never fail an offer transition
+        print(f"Offer funnel update failed ({event}): {e}")
+
+
+async def record_async(db, bucket, event, count=1):
+    """record() for the async database handle."""
+    if not bucket or count <= 0:
+        return
+    try:
+        await db.offer_funnel.update_one(*_increment(bucket, event, count), upsert=True)
+    except Exception as e:
+        print(f"Offer funnel update failed ({event}): {e}")
+
+
+def _group(buckets):
+    counts = Counter(bucket_id(b) for b in buckets)
+    by_id = {bucket_id(b): b for b in buckets}
+    return [(by_id[key], count) for key, count in counts.items()]
+
+
+def record_many(db, buckets, event):
+    """Record one event per bucket in `buckets`, one $inc per distinct bucket."""
+    for bucket, count in _group(buckets):
+        record(db, bucket, event, count)
+
+
+async def record_many_async(db, buckets, event):
+    for bucket, count in _group(buckets):
+        await record_async(db, bucket, event, count)
+
+
+def backfill(db):
+    """Rebuild every rollup from the employees collection in one aggregation.
+
+    Mongo groups by (company, department, designation, send day); the days are folded into
+    ISO weeks here, which keeps the pipeline to operators every server version supports.
+    The rollups are written to a scratch collection that then replaces `offer_funnel` in one
+    rename, so readers never see it empty or half-built and a live $inc can't collide with
+    the insert.
+    """
+    def dim(name, fallback):
+        return {"$ifNull": [f"$funnel_bucket.{name}", {"$ifNull": [fallback, UNKNOWN]}]}
+
+    def count_if(condition):
+        return {"$sum": {"$cond": [condition, 1, 0]}}
+
+    reason = {"$ifNull": ["$rejection_reason", ""]}
+    expired = {"$eq": [reason, "Offer Expired (24h)"]}
+    declined = {"$ne": [reason, "Offer Expired (24h)"]}
+    pipeline = [
+        {"$match": {"sent_at": {"$type": "date"}}},
+        {"$group": {
+            "_id": {
+                "company": dim("company", None),
+                "department": dim("department", "$department"),
+                "designation": dim("designation", "$designation"),
+                "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$sent_at"}},
+            },
+            SENT: {"$sum": 1},
+            ACCEPTED: count_if({"$eq": ["$status", "Accepted"]}),
+            REJECTED: count_if({"$and": [{"$eq": ["$status", "Rejected"]}, declined]}),
+            EXPIRED: count_if({"$and": [{"$eq": ["$status", "Rejected"]}, expired]}),
+        }},
+    ]
+
+    rollups = {}
+    for row in db.employees.aggregate(pipeline):
+        key = row["_id"]
+        bucket = {
+            "company": _label(key["company"]),
+            "department": _label(key["department"]),
+            "designation": _label(key["designation"]),
+            "week": week_of(datetime.strptime(key["day"], "%Y-%m-%d")),
+        }
+        doc = rollups.setdefault(bucket_id(bucket), {"_id": bucket_id(bucket), **bucket, **{e: 0 for e in EVENTS}})
+        for event in EVENTS:
+            doc[event] += row[event]
+
+    if not rollups:
+        db.offer_funnel.drop()
+        return 0
+    scratch = db[f"offer_funnel_rebuild_{uuid.uuid4().hex}"]
+    try:
+        scratch.insert_many(list(rollups.values()))
+        scratch.rename("offer_funnel", dropTarget=True)
+    except Exception:
+        scratch.drop()
+        raise
+    return len(rollups)
+
+
+def _rates(counts):
+    sent = counts[SENT]
+    return {
+        **counts,
+        "pending": max(0, sent - counts[ACCEPTED] - counts[REJECTED] - counts[EXPIRED]),
+        "acceptance_rate": round(counts[ACCEPTED] / sent, 4) if sent else None,
+        "rejection_rate": round(counts[REJECTED] / sent, 4) if sent else None,
+        "expiry_rate": round(counts[EXPIRED] / sent, 4) if sent else None,
+    }
+
+
+def summarize(db, group_by=("company",), filters=None, since_week=None):
+    """Funnel counts and rates grouped by any subset of DIMENSIONS."""
+    query = {k: v for k, v in (filters or {}).items() if v}
+    if since_week:
+        query["week"] = {"$gte": since_week}
+
+    groups = {}
+    totals = Counter({e: 0 for e in EVENTS})
+    for doc in db.offer_funnel.find(query):
+        key = tuple(doc.get(d, UNKNOWN) for d in group_by)
+        counts = groups.setdefault(key, Counter({e: 0 for e in EVENTS}))
+        for event in EVENTS:
+            counts[event] += doc.get(event, 0)
+            totals[event] += doc.get(event, 0)
+
+    rows = [{**dict(zip(group_by, key)), **_rates(dict(counts))} for key, counts in sorted(groups.items())]
+    return {"group_by": list(group_by), "totals": _rates(dict(totals)), "rows": rows}
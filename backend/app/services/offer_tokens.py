@@ -0,0 +1,93 @@
+"""
+Offer Tokens
+Stateless HMAC-signed tokens for the Accept/Reject links. A token carries the employee id,
+company name, expiry and a per-employee token version, so it can be verified in memory
+without reading the database. Sending a new offer bumps the version, which revokes older links.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+OfferClaims = namedtuple("OfferClaims", ["employee_id", "company_name", "expires_at", "version"])
+
+TOKEN_TTL_HOURS = float(os.getenv("OFFER_TOKEN_TTL_HOURS", "24"))
+_SIGNATURE_BYTES = 16
+
+_secret = None
+
+
+def _get_secret():
+    global _secret
+    if _secret is None:
+        configured = os.getenv("OFFER_TOKEN_SECRET", "").strip()
+        if configured:
+            _secret = configured.encode()
+        else:
+            print("WARNING: OFFER_TOKEN_SECRET not set; using a random per-process secret (links die on restart)")
+            _secret = secrets.token_bytes(32)
+    return _secret
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload):
+    return hmac.new(_get_secret(), payload.encode(), hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def is_signed(token):
+    """Signed tokens are `<payload>.<signature>`; legacy tokens are bare UUIDs."""
+    return token.count(".") == 1
+
+
+def offer_expiry(sent_at):
+    """When an offer sent at `sent_at` lapses; its links are signed with the same TTL."""
+    return sent_at + timedelta(hours=TOKEN_TTL_HOURS)
+
+
+def issue(employee_id, company_name, version, ttl_hours=None):
+    expires_at = int(time.time() + (ttl_hours if ttl_hours is not None else TOKEN_TTL_HOURS) * 3600)
+    body = json.dumps({"e": str(employee_id), "c": company_name, "x": expires_at, "v": version},
+                      separators=(",", ":"))
+    payload = _b64encode(body.encode())
+    return f"{payload}.{_b64encode(_sign(payload))}"
+
+
+def verify(token):
+    """Return OfferClaims for a valid, unexpired token, otherwise None. No database access."""
+    try:
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(_b64decode(signature), _sign(payload)):
+            return None
+        data = json.loads(_b64decode(payload))
+        if data["x"] < time.time() or not ObjectId.is_valid(data["e"]):
+            return None
+        return OfferClaims(data["e"], data.get("c") or "The Company",
+                           datetime.fromtimestamp(data["x"], tz=timezone.utc), int(data["v"]))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def next_token_version(db, employee_id):
+    """Bump and return the employee's token version, revoking previously issued links."""
+    doc = db.employees.find_one_and_update(
+        {"_id": ObjectId(employee_id)},
+        {"$inc": {"offer_token_version": 1}},
+        projection={"offer_token_version": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc.get("offer_token_version", 1) if doc else 1
@@ -0,0 +1,323 @@
+"""
+Email Outbox
+Durable queue for outgoing offer/agreement emails. Routes enqueue a message and return
+immediately; a background worker delivers it with bounded concurrency, a token-bucket
+rate limit and retries with backoff, then updates the employee/company status.
+
+Only failures where the email certainly wasn't handed over (rate limited, connection refused)
+are retried. Anything else, a 5xx or a timeout after the request went out, may already have
+reached the candidate, so the message is marked failed instead of sending a second offer.
+An offer's link version is issued once and stored on the message, so a resend never revokes
+the links in a copy that was delivered.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from bson import Binary, ObjectId
+from pymongo import ReturnDocument
+
+from ..database import db as mongo_db
+from .email_service import email_client
+from .agreement_email_service import agreement_email_client
+from . import offer_funnel, offer_tokens
+from .status_stats import company_counts, employee_counts
+
+OUTBOX_CONCURRENCY = int(os.getenv("EMAIL_OUTBOX_CONCURRENCY", "4"))
+OUTBOX_RATE_PER_SEC = float(os.getenv("EMAIL_OUTBOX_RATE_PER_SEC", "5"))
+OUTBOX_RATE_BURST = int(os.getenv("EMAIL_OUTBOX_RATE_BURST", "10"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE", "15"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX", "900"))
+OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", "1"))
+
+KIND_OFFER = "offer"
+KIND_AGREEMENT = "agreement"
+
+
+def _new_message(kind, target_id, message, pdf_content):
+    now = datetime.now(timezone.utc)
+    return {
+        "kind": kind,
+        "target_id": target_id,
+        "message": message,
+        "pdf": Binary(pdf_content) if pdf_content else None,
+        "status": "queued",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def enqueue(db, kind, target_id, message, pdf_content=None):
+    """Store a message in the outbox and return its id."""
+    doc = _new_message(kind, target_id, message, pdf_content)
+    return str(db.email_outbox.insert_one(doc).inserted_id)
+
+
+async def enqueue_async(db, kind, target_id, message, pdf_content=None):
+    """enqueue() for the async database handle used by `async def` routes."""
+    doc = _new_message(kind, target_id, message, pdf_content)
+    return str((await db.email_outbox.insert_one(doc)).inserted_id)
+
+
+def get_message(db, message_id):
+    if not ObjectId.is_valid(message_id):
+        return None
+    return db.email_outbox.find_one({"_id": ObjectId(message_id)}, {"pdf": 0})
+
+
+def outbox_status(db, latency_sample=200):
+    """Queue depth by status plus delivery latency (enqueue -> delivered) of recent sends."""
+    counts = {row["_id"]: row["count"] for row in db.email_outbox.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ])}
+
+    now = datetime.now(timezone.utc)
+    oldest = db.email_outbox.find_one({"status": "queued"}, {"created_at": 1}, sort=[("created_at", 1)])
+    oldest_age = None
+    if oldest:
+        created = oldest["created_at"]
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        oldest_age = round((now - created).total_seconds(), 1)
+
+    recent = db.email_outbox.find(
+        {"status": "sent"}, {"latency_ms": 1}
+    ).sort("delivered_at", -1).limit(latency_sample)
+    samples = sorted(d["latency_ms"] for d in recent if d.get("latency_ms") is not None)
+
+    def pct(p):
+        return round(samples[min(len(samples) - 1, int(p * len(samples)))], 1) if samples else None
+
+    return {
+        "queue_depth": counts.get("queued", 0) + counts.get("sending", 0),
+        "by_status": {s: counts.get(s, 0) for s in ("queued", "sending", "sent", "failed")},
+        "oldest_queued_age_seconds": oldest_age,
+        "delivery_latency_ms": {"count": len(samples), "p50": pct(0.50), "p95": pct(0.95)},
+    }
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop_event=None):
+        """Block until a token is available. Returns False if stop_event was set while waiting."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if stop_event is not None:
+                if stop_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+class OutboxWorker:
+    def __init__(self, db, concurrency=OUTBOX_CONCURRENCY, rate_per_sec=OUTBOX_RATE_PER_SEC,
+                 burst=OUTBOX_RATE_BURST, max_attempts=OUTBOX_MAX_ATTEMPTS):
+        self.db = db
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._last_recovery = 0.0
+
+    # ── Lifecycle ──
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        try:
+            self.db.email_outbox.create_index([("status", 1), ("next_attempt_at", 1)])
+        except Exception as e:
+            print(f"Outbox index creation skipped: {e}")
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="outbox")
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if not self._slots.acquire(timeout=0.5):
+                    continue
+                doc = self._claim()
+                if doc is None:
+                    self._slots.release()
+                    self._recover_stale()
+                    self._stop.wait(OUTBOX_POLL_INTERVAL)
+                    continue
+                if not self.bucket.acquire(self._stop):
+                    self._release_claim(doc)
+                    self._slots.release()
+                    break
+                self._executor.submit(self._deliver_and_release, doc)
+            except Exception as e:
+                print(f"Outbox worker error: {e}")
+                self._stop.wait(OUTBOX_POLL_INTERVAL)
+
+    def _deliver_and_release(self, doc):
+        try:
+            self.deliver(doc)
+        finally:
+            self._slots.release()
+
+    # ── Queue operations ──
+    def _claim(self):
+        now = datetime.now(timezone.utc)
+        return self.db.email_outbox.find_one_and_update(
+            {"status": "queued", "next_attempt_at": {"$lte": now}},
+            {"$set": {"status": "sending", "locked_at": now, "updated_at": now}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _release_claim(self, doc):
+        self.db.email_outbox.update_one(
+            {"_id": doc["_id"], "status": "sending"},
+            {"$set": {"status": "queued", "updated_at": datetime.now(timezone.utc)}},
+        )
+
+    def _recover_stale(self):
+        """Requeue messages whose worker died mid-delivery (lease expired).
+
+        An expired lease counts as an attempt, so a message that kills or hangs the worker
+        is given up after max_attempts instead of being requeued (and possibly re-sent) forever.
+        """
+        if time.monotonic() - self._last_recovery < OUTBOX_LEASE_SECONDS / 4:
+            return
+        self._last_recovery = time.monotonic()
+        now = datetime.now(timezone.utc)
+        stale = {"status": "sending", "locked_at": {"$lt": now - timedelta(seconds=OUTBOX_LEASE_SECONDS)}}
+        error = f"Delivery lease expired after {OUTBOX_LEASE_SECONDS:g}s"
+        given_up = self.db.email_outbox.update_many(
+            {**stale, "attempts": {"$gte": self.max_attempts - 1}},
+            {"$set": {"status": "failed", "updated_at": now, "last_error": error}, "$inc": {"attempts": 1}},
+        )
+        if given_up.modified_count:
+            print(f"Outbox: {given_up.modified_count} message(s) failed permanently: {error}")
+        self.db.email_outbox.update_many(
+            stale,
+            {"$set": {"status": "queued", "next_attempt_at": now, "updated_at": now, "last_error": error},
+             "$inc": {"attempts": 1}},
+        )
+
+    def process_once(self):
+        """Claim and deliver a single due message synchronously. Returns False if none was due."""
+        doc = self._claim()
+        if doc is None:
+            return False
+        self.deliver(doc)
+        return True
+
+    # ── Delivery ──
+    def _token_version(self, doc):
+        """Link version for an offer: issued on the first attempt, reused by every retry."""
+        version = doc.get("token_version")
+        if version is None:
+            version = offer_tokens.next_token_version(self.db, doc["target_id"])
+            self.db.email_outbox.update_one({"_id": doc["_id"]}, {"$set": {"token_version": version}})
+        return version
+
+    def _send(self, doc):
+        message = doc["message"]
+        pdf_content = bytes(doc["pdf"]) if doc.get("pdf") else None
+        if doc["kind"] == KIND_AGREEMENT:
+            return agreement_email_client.send_agreement(pdf_content=pdf_content, **message)
+        try:
+            token_version = self._token_version(doc)
+        except Exception as e:
+            return {"status": "error", "message": f"Could not issue offer links: {e}", "retryable": True}
+        return email_client.send_offer_letter(
+            pdf_content=pdf_content, employee_id=doc["target_id"], token_version=token_version, **message
+        )
+
+    def deliver(self, doc):
+        try:
+            result = self._send(doc)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+
+        now = datetime.now(timezone.utc)
+        if result.get("status") == "success":
+            created = doc["created_at"]
+            if created.tzinfo is None:
+                created = created.replace(tzinfo=timezone.utc)
+            self.db.email_outbox.update_one(
+                {"_id": doc["_id"]},
+                {"$set": {
+                    "status": "sent",
+                    "delivered_at": now,
+                    "updated_at": now,
+                    "latency_ms": round((now - created).total_seconds() * 1000, 1),
+                    "pdf": None,
+                    "last_error": None,
+                }, "$inc": {"attempts": 1}}
+            )
+            self._mark_target_sent(doc, now)
+            return result
+
+        attempts = doc.get("attempts", 0) + 1
+        update = {"status": "failed", "updated_at": now, "last_error": result.get("message")}
+        if result.get("retryable") and attempts < self.max_attempts:
+            delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * (2 ** (attempts - 1)))
+            update.update({
+                "status": "queued",
+                "next_attempt_at": now + timedelta(seconds=delay * random.uniform(0.5, 1.0)),
+            })
+        elif result.get("retryable"):
+            print(f"Outbox message {doc['_id']} failed permanently: {result.get('message')}")
+        else:
+            # May have been delivered; a resend could give the candidate a second offer
+            print(f"Outbox message {doc['_id']} failed and needs review, not retried: {result.get('message')}")
+        self.db.email_outbox.update_one({"_id": doc["_id"]}, {"$set": update, "$inc": {"attempts": 1}})
+        return result
+
+    def _mark_target_sent(self, doc, now):
+        target = ObjectId(doc["target_id"])
+        if doc["kind"] == KIND_AGREEMENT:
+            self.db.companies.update_one({"_id": target}, {"$set": {"status": "Agreement Sent"}})
+            company_counts.invalidate()
+        else:
+            employee = self.db.employees.find_one({"_id": target}, {"department": 1, "designation": 1}) or {}
+            bucket = offer_funnel.bucket_for(employee, doc["message"].get("company_name"), now)
+            self.db.employees.update_one(
+                {"_id": target},
+                {"$set": {
+                    "status": "Offer Sent",
+                    "sent_at": now,
+                    "expires_at": offer_tokens.offer_expiry(now),
+                    "funnel_bucket": bucket
+                }}
+            )
+            employee_counts.invalidate()
+            offer_funnel.record(self.db, bucket, offer_funnel.SENT)
+
+
+outbox_worker = OutboxWorker(mongo_db)
@@ -0,0 +1,171 @@
+"""
+Request Profiling
+Opt-in sampling profiler for chasing slow requests in production. A request is profiled
+when it carries `X-Profile-Token: $PROFILE_ADMIN_TOKEN`, or at random with probability
+PROFILE_SAMPLE_RATE. The middleware is only installed when one of the two is configured,
+so with profiling off requests don't pass through it at all.
+
+Each profile is kept in memory under its request id (returned as X-Profile-Id) and can
+be fetched as a pyinstrument HTML report from /debug/profiles/{id}, along with a breakdown
+of where the time went: MongoDB, pandas, PyMuPDF, template rendering, network, awaiting
+(threadpool work and sleeps, which the profiler sees only as the await) and other code.
+"""
+import hmac
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from ..lazy import lazy_optional
+
+pyinstrument = lazy_optional("pyinstrument")  # optional: profiling is disabled without it
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")  # also write HTML reports here when set
+
+TOKEN_HEADER = "x-profile-token"
+ID_HEADER = "X-Profile-Id"
+
+# (category, substrings of "function file_path"); the outermost matching frame wins, so a
+# socket read inside pymongo counts as MongoDB and one inside requests as network
+CATEGORIES = (
+    ("mongo", ("/pymongo/", "/mongomock/", "/bson/")),
+    ("pandas", ("/pandas/", "/openpyxl/", "/numpy/")),
+    ("pymupdf", ("/fitz/", "/pymupdf/")),
+    ("templates", ("/email_templates.py", "/docx_engine.py", "/response_pages.py", "_fallback_template ", "/jinja2/", "/docx/")),
+    ("network", ("/requests/", "/urllib3/", "/http/client.py", "/smtplib.py", "/ssl.py", "/socket.py", "/httpx/")),
+)
+AWAIT = "await"
+OTHER = "other"
+
+
+def enabled():
+    return pyinstrument is not None and bool(PROFILE_ADMIN_TOKEN or PROFILE_SAMPLE_RATE > 0)
+
+
+def is_admin(token):
+    return bool(PROFILE_ADMIN_TOKEN) and bool(token) and hmac.compare_digest(token, PROFILE_ADMIN_TOKEN)
+
+
+def _category_of(frame):
+    key = f"{frame.function} {frame.file_path or ''}"
+    for name, needles in CATEGORIES:
+        if any(n in key for n in needles):
+            return name
+    return None
+
+
+def breakdown(root):
+    """Seconds per category for a pyinstrument frame tree; leaves carry the sampled time."""
+    totals = {name: 0.0 for name, _ in CATEGORIES}
+    totals[AWAIT] = totals[OTHER] = 0.0
+    stack = [(root, None)]
+    while stack:
+        frame, category = stack.pop()
+        category = category or _category_of(frame)
+        if frame.children:
+            stack.extend((child, category) for child in frame.children)
+        elif frame.function == "[await]" and category is None:
+            totals[AWAIT] += frame.time
+        else:
+            totals[category or OTHER] += frame.time
+    return {name: round(seconds * 1000, 2) for name, seconds in totals.items()}
+
+
+class ProfileStore:
+    """The most recent PROFILE_KEEP profiles, oldest evicted first."""
+
+    def __init__(self, keep=PROFILE_KEEP, directory=PROFILE_DIR):
+        self.keep = keep
+        self.directory = Path(directory) if directory else None
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile_id, summary, html):
+        with self._lock:
+            self._profiles[profile_id] = (summary, html)
+            while len(self._profiles) > self.keep:
+                self._profiles.popitem(last=False)
+        if self.directory is not None:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                (self.directory / f"{profile_id}.html").write_text(html)
+            except OSError as e:
+                print(f"Profile {profile_id} not written to disk: {e}")
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def summaries(self):
+        with self._lock:
+            return [summary for summary, _ in reversed(self._profiles.values())]
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, store=None, sample_rate=None):
+        self.app = app
+        self.store = store if store is not None else profile_store
+        self.sample_rate = PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+        # pyinstrument profiles one request at a time per thread; overlapping requests run unprofiled
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope):
+        if scope["type"] != "http" or scope["path"].startswith("/debug/profiles"):
+            return False
+        for name, value in scope["headers"]:
+            if name == TOKEN_HEADER.encode():
+                return is_admin(value.decode("latin-1"))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(ID_HEADER.lower().encode(), profile_id.encode())]
+            await send(message)
+
+        profiler = pyinstrument.Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+        started = time.time()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            self._busy.release()
+            self._save(profiler, profile_id, scope, status, started)
+
+    def _save(self, profiler, profile_id, scope, status, started):
+        try:
+            session = profiler.last_session
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status,
+                "started_at": started,
+                "duration_ms": round(session.duration * 1000, 2),
+                "breakdown_ms": breakdown(session.root_frame()) if session.root_frame() else {},
+            }
+            self.store.add(profile_id, summary, profiler.output_html())
+        except Exception as e:
+            # A broken report must never affect the request it describes
+            print(f"Profile {profile_id} could not be saved: {e}")
+
+
+profile_store = ProfileStore()
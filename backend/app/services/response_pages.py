@@ -0,0 +1,207 @@
+"""
+Response Pages
+Precompiled pages shown to candidates after they click Accept/Reject in the offer email.
+The shell and the shared stylesheet are built once at import; only the candidate and
+company names are interpolated per click. The invalid-link page has no variables at all,
+so it is pre-rendered to bytes (plain and gzip) and served as-is.
+"""
+import gzip
+import hashlib
+from datetime import datetime
+from html import escape
+
+from .email_templates import CompiledTemplate
+
+# Shared by every response page; served from CSS_PATH with a long-lived cache header.
+# System font stack only - no third-party font request on a candidate's click.
+RESPONSE_CSS = """
+* { margin: 0; padding: 0; box-sizing: border-box; }
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Inter, Roboto, Helvetica, Arial, sans-serif;
+    min-height: 100vh;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    background: #0f172a;
+    color: #f8fafc;
+    overflow: hidden;
+}
+.bg-grid {
+    position: fixed;
+    inset: 0;
+    background-image: radial-gradient(circle at 1px 1px, rgba(255,255,255,0.03) 1px, transparent 0);
+    background-size: 40px 40px;
+    pointer-events: none;
+}
+.bg-glow {
+    position: fixed;
+    width: 600px;
+    height: 600px;
+    border-radius: 50%;
+    background: var(--accent);
+    opacity: 0.06;
+    filter: blur(120px);
+    top: 50%;
+    left: 50%;
+    transform: translate(-50%, -50%);
+    pointer-events: none;
+}
+.accepted { --accent: #10b981; --gradient: linear-gradient(135deg, #10b981 0%, #059669 100%); --bg-accent: rgba(16, 185, 129, 0.1); }
+.declined { --accent: #f59e0b; --gradient: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); --bg-accent: rgba(245, 158, 11, 0.1); }
+.card {
+    position: relative;
+    z-index: 1;
+    background: rgba(15, 23, 42, 0.8);
+    backdrop-filter: blur(20px);
+    border: 1px solid rgba(255,255,255,0.08);
+    border-radius: 32px;
+    padding: 4rem 3rem;
+    max-width: 500px;
+    width: 90%;
+    text-align: center;
+    box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.5);
+}
+.card.result { max-width: 560px; animation: fadeInUp 0.6s ease-out; }
+@keyframes fadeInUp {
+    from { opacity: 0; transform: translateY(30px); }
+    to { opacity: 1; transform: translateY(0); }
+}
+.icon { font-size: 3rem; margin-bottom: 1rem; display: block; }
+.result .icon { font-size: 4rem; margin-bottom: 1.5rem; animation: bounce 1s ease-in-out; }
+@keyframes bounce {
+    0%, 100% { transform: translateY(0); }
+    50% { transform: translateY(-15px); }
+}
+.badge {
+    display: inline-block;
+    background: var(--gradient);
+    color: white;
+    padding: 8px 20px;
+    border-radius: 50px;
+    font-size: 0.8rem;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 1.5px;
+    margin-bottom: 1.5rem;
+}
+h1 { font-size: 1.8rem; font-weight: 800; margin-bottom: 1rem; }
+.result h1 { font-size: 2.2rem; letter-spacing: -0.5px; }
+.invalid h1 { color: #ef4444; }
+p { color: #94a3b8; line-height: 1.6; }
+.note { margin-top: 1rem; color: #64748b; }
+.message {
+    font-size: 1.05rem;
+    line-height: 1.7;
+    margin-bottom: 0.75rem;
+}
+.subtitle {
+    font-size: 0.95rem;
+    color: #64748b;
+    line-height: 1.6;
+    margin-top: 1rem;
+    padding: 1rem;
+    background: var(--bg-accent);
+    border-radius: 12px;
+    border: 1px solid rgba(255,255,255,0.05);
+}
+.company {
+    margin-top: 2.5rem;
+    padding-top: 1.5rem;
+    border-top: 1px solid rgba(255,255,255,0.06);
+    color: #475569;
+    font-size: 0.85rem;
+    font-weight: 600;
+}
+""".strip().encode()
+
+CSS_ETAG = hashlib.sha1(RESPONSE_CSS).hexdigest()[:12]
+CSS_FILENAME = f"response-{CSS_ETAG}.css"
+CSS_PATH = f"/offer/assets/{CSS_FILENAME}"
+CSS_GZIP = gzip.compress(RESPONSE_CSS, mtime=0)
+
+
+def _page(title, theme, content):
+    """Page source around `content`; any `{name}` slots in the arguments stay open."""
+    return (
+        '<!DOCTYPE html>\n'
+        '<html lang="en">\n'
+        '<head>\n'
+        '    <meta charset="UTF-8">\n'
+        '    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        f'    <title>{title}</title>\n'
+        f'    <link rel="stylesheet" href="{CSS_PATH}">\n'
+        '</head>\n'
+        f'<body class="{theme}">\n'
+        f'{content}\n'
+        '</body>\n'
+        '</html>\n'
+    )
+
+
+def _result_template(theme, icon, badge, heading, message, subtitle):
+    return CompiledTemplate(_page(f"{heading} - {{company_name}}", theme, (
+        '    <div class="bg-grid"></div>\n'
+        '    <div class="bg-glow"></div>\n'
+        '    <div class="card result">\n'
+        f'        <span class="icon">{icon}</span>\n'
+        f'        <div class="badge">{badge}</div>\n'
+        f'        <h1>{heading}</h1>\n'
+        f'        <p class="message">{message}</p>\n'
+        f'        <div class="subtitle">{subtitle}</div>\n'
+        '        <div class="company">© {year} {company_name}. All rights reserved.</div>\n'
+        '    </div>'
+    )))
+
+
+RESULT_PAGES = {
+    "accepted": _result_template(
+        "accepted", "🎉", "Accepted", "Offer Accepted!",
+        "Thank you, <strong>{candidate_name}</strong>! Your acceptance has been recorded.",
+        "Welcome to <strong>{company_name}</strong>. Our HR team will be in touch shortly with the next steps.",
+    ),
+    "rejected": _result_template(
+        "declined", "📩", "Declined", "Offer Declined",
+        "Thank you, <strong>{candidate_name}</strong>. Your response has been recorded.",
+        "We appreciate your time and wish you all the best in your future endeavors.",
+    ),
+}
+
+ALREADY_RESPONDED_PAGE = CompiledTemplate(_page("Already Responded - {company_name}", "notice", (
+    '    <div class="card">\n'
+    '        <span class="icon">ℹ️</span>\n'
+    '        <h1>Already Responded</h1>\n'
+    '        <p>Hi <strong>{candidate_name}</strong>, you have already <strong>{status_text}</strong> this offer.</p>\n'
+    '        <p class="note">If you believe this is an error, please contact the HR team.</p>\n'
+    '    </div>'
+)))
+
+INVALID_PAGE = _page("Invalid Link", "invalid", (
+    '    <div class="card">\n'
+    '        <span class="icon">⚠️</span>\n'
+    '        <h1>Invalid or Expired Link</h1>\n'
+    '        <p>This link is no longer valid. Please contact the HR team if you need assistance.</p>\n'
+    '    </div>'
+)).encode()
+INVALID_PAGE_GZIP = gzip.compress(INVALID_PAGE, mtime=0)
+INVALID_PAGE_ETAG = hashlib.sha1(INVALID_PAGE).hexdigest()[:12]
+
+
+def _display_name(name):
+    # Imported or form-created employees can have a null or NaN name
+    if name is None or name != name or not str(name).strip():
+        return "Candidate"
+    return str(name)
+
+
+def result_page(decision, candidate_name, company_name):
+    """Page shown after a recorded accept/reject; `decision` is "accepted" or "rejected"."""
+    return RESULT_PAGES[decision].render(
+        candidate_name=escape(_display_name(candidate_name), quote=False), company_name=escape(company_name, quote=False), year=datetime.now().year
+    )
+
+
+def already_responded_page(current_status, candidate_name, company_name):
+    return ALREADY_RESPONDED_PAGE.render(
+        status_text="accepted" if current_status == "Accepted" else "declined",
+        candidate_name=escape(_display_name(candidate_name), quote=False), company_name=escape(company_name, quote=False),
+    )
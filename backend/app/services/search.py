@@ -0,0 +1,155 @@
+"""
+List Search
+Server-side filtering, prefix search and sorting for GET /employees/ and
+/agreement-companies/, so the dashboard can search the whole collection instead of the
+page it downloaded.
+
+Prefix search runs on `search_keys`, a small array stored on every document: the
+lowercased name, email and designation plus their individual words. A multikey index on it
+turns "asha", "kum" or "engin" into an index range scan; a case-insensitive regex over the
+raw fields could not use an index at all. Routes set the keys on every write that touches
+those fields, and ensure_indexes() backfills documents written before they existed.
+
+Joining dates are stored as datetimes by the forms and as "YYYY-MM-DD" strings by the
+spreadsheet imports, so date ranges match both.
+"""
+import math
+import re
+from datetime import datetime, time, timedelta
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+SEARCH_FIELD = "search_keys"
+SEARCH_SOURCES = ("name", "email", "designation")
+BACKFILL_BATCH = 1000
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Each list starts with the equality fields the dashboard filters on, per the ESR rule
+INDEXES = {
+    "employees": [
+        [(SEARCH_FIELD, ASCENDING)],
+        [("status", ASCENDING), ("_id", ASCENDING)],
+        [("status", ASCENDING), ("name", ASCENDING)],  # status tabs sorted by name merge-sort off this
+        [("status", ASCENDING), ("expires_at", ASCENDING)],  # the expiry sweep on every list read
+        [("department", ASCENDING), ("status", ASCENDING)],
+        [("funnel_bucket.company", ASCENDING), ("status", ASCENDING)],
+        [("joining_date", ASCENDING)],
+        [("created_at", ASCENDING)],
+        [("name", ASCENDING)],
+    ],
+    "companies": [
+        [(SEARCH_FIELD, ASCENDING)],
+        [("status", ASCENDING), ("_id", ASCENDING)],
+        [("department", ASCENDING), ("status", ASCENDING)],
+        [("joining_date", ASCENDING)],
+        [("created_at", ASCENDING)],
+        [("name", ASCENDING)],
+    ],
+}
+
+SORTABLE = ("name", "email", "emp_id", "designation", "department", "status", "joining_date", "created_at")
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value).strip().lower()
+
+
+def search_keys(doc):
+    """Lowercased full values and words of the searchable fields of a document."""
+    keys = set()
+    for field in SEARCH_SOURCES:
+        value = _text(doc.get(field))
+        if value:
+            keys.add(value)
+            keys.update(_WORD.findall(value))
+    return sorted(keys)
+
+
+def _prefix_terms(q):
+    return [{SEARCH_FIELD: {"$regex": "^" + re.escape(word)}} for word in _WORD.findall(_text(q))]
+
+
+def _as_datetime(value, end=False):
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value + timedelta(days=1) if end else value, time.min)
+
+
+def date_range(field, start=None, end=None):
+    """Inclusive range on a date field stored as datetime or as an ISO date string."""
+    stored, text = {}, {}
+    if start is not None:
+        stored["$gte"] = _as_datetime(start)
+        text["$gte"] = start.isoformat()[:10]
+    if end is not None:
+        stored["$lt"] = _as_datetime(end, end=True)
+        text["$lte"] = end.isoformat()[:10]
+    if not stored:
+        return None
+    return {"$or": [{field: stored}, {field: text}]}
+
+
+def build_filter(equals=None, ranges=None, q=None):
+    """
+    A Mongo filter from the list parameters. `equals` maps fields to a value or a list of
+    accepted values (None and empty lists are ignored), `ranges` maps date fields to
+    (start, end) and `q` is matched word by word as prefixes of the search keys.
+    """
+    clauses = []
+    for field, value in (equals or {}).items():
+        if isinstance(value, (list, tuple)):
+            value = [v for v in value if v]
+            if len(value) == 1:
+                clauses.append({field: value[0]})
+            elif value:
+                clauses.append({field: {"$in": value}})
+        elif value:
+            clauses.append({field: value})
+    for field, (start, end) in (ranges or {}).items():
+        clause = date_range(field, start, end)
+        if clause:
+            clauses.append(clause)
+    if q:
+        clauses.extend(_prefix_terms(q))
+    if not clauses:
+        return {}
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def sort_spec(sort):
+    """`name` or `-joining_date` to a sort list; _id breaks ties so pages never overlap."""
+    if not sort:
+        return [("_id", ASCENDING)]
+    field = sort.lstrip("-")
+    if field not in SORTABLE:
+        raise ValueError(f"Cannot sort by '{field}'. Choose one of: {', '.join(SORTABLE)}")
+    direction = DESCENDING if sort.startswith("-") else ASCENDING
+    return [(field, direction), ("_id", direction)]
+
+
+def backfill_search_keys(collection):
+    """Set search keys on documents written before they existed. Returns the count."""
+    pending = collection.find({SEARCH_FIELD: {"$exists": False}}, {field: 1 for field in SEARCH_SOURCES})
+    updated = 0
+    batch = []
+    for doc in pending:
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {SEARCH_FIELD: search_keys(doc)}}))
+        if len(batch) >= BACKFILL_BATCH:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
+
+
+def ensure_indexes(db):
+    for name, indexes in INDEXES.items():
+        collection = db[name]
+        for keys in indexes:
+            collection.create_index(keys)
+        updated = backfill_search_keys(collection)
+        if updated:
+            print(f"Search keys backfilled on {updated} {name}")
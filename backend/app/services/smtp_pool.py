@@ -0,0 +1,198 @@
+"""
+SMTP Connection Pool
+Keeps authenticated SMTP connections open and reuses them across messages, so the
+Gmail fallback path does not pay for connect + STARTTLS + LOGIN on every email.
+"""
+import os
+import smtplib
+import threading
+import time
+
+from .metrics import EMAIL_SEND_SECONDS
+
+
+class SMTPNotSent(smtplib.SMTPException):
+    """The message was never handed to the server (connect or login failed); safe to send again."""
+
+
+class _PooledConnection:
+    def __init__(self, server):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+        # Set once smtplib starts DATA: from then on the server may have accepted the message
+        self.submitted = False
+        data = getattr(server, "data", None)
+        if data is not None:
+            def tracked_data(msg):
+                self.submitted = True
+                return data(msg)
+            server.data = tracked_data
+
+
+class SMTPConnectionPool:
+    def __init__(self, host, port, username="", password="", use_starttls=True,
+                 max_connections=None, idle_timeout=None, probe_after=None,
+                 max_messages_per_connection=None, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_starttls = use_starttls
+        self.timeout = timeout
+
+        # Pool tuning (env overridable). Gmail drops idle sessions after a few minutes
+        # and limits concurrent sessions per account, so keep both conservative.
+        self.max_connections = max_connections or int(os.getenv("SMTP_POOL_SIZE", "3"))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv("SMTP_POOL_IDLE_TIMEOUT", "120"))
+        self.probe_after = probe_after if probe_after is not None else float(os.getenv("SMTP_POOL_PROBE_AFTER", "10"))
+        self.max_messages_per_connection = max_messages_per_connection or int(os.getenv("SMTP_POOL_MAX_MESSAGES", "90"))
+
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+        self.stats = {"connects": 0, "reuses": 0, "reconnects": 0, "sent": 0}
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close_server(server)
+            raise
+        with self._lock:
+            self.stats["connects"] += 1
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _close_server(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_alive(conn):
+        try:
+            return conn.server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self):
+        """Return a live connection, reusing an idle one when possible."""
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise SMTPNotSent("SMTP connection pool is closed")
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+
+            idle_for = time.monotonic() - conn.last_used
+            if idle_for > self.idle_timeout:
+                # Server has most likely dropped it already; don't bother probing
+                self._close_server(conn.server)
+                continue
+            if idle_for > self.probe_after and not self._is_alive(conn):
+                self._close_server(conn.server)
+                with self._lock:
+                    self.stats["reconnects"] += 1
+                continue
+
+            with self._lock:
+                self.stats["reuses"] += 1
+            return conn
+
+    def _checkin(self, conn):
+        conn.last_used = time.monotonic()
+        with self._lock:
+            keep = not self._closed and conn.messages_sent < self.max_messages_per_connection
+            if keep:
+                self._idle.append(conn)
+        if not keep:
+            self._close_server(conn.server)
+
+    def send_message(self, msg):
+        """Send an email.message.Message over a pooled connection.
+
+        At most `max_connections` sends run concurrently; extra callers wait for a slot.
+        A connection found dead before the message went out is replaced once and the send
+        retried; a disconnect after DATA started is raised, as the server may have the message.
+        """
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            self._send(msg)
+            outcome = "ok"
+        finally:
+            EMAIL_SEND_SECONDS.labels("smtp", outcome).observe(time.perf_counter() - start)
+
+    def _connect_for_send(self, checkout=False):
+        try:
+            return self._checkout() if checkout else self._connect()
+        except SMTPNotSent:
+            raise
+        except (OSError, smtplib.SMTPException) as e:
+            raise SMTPNotSent(f"Could not connect to {self.host}:{self.port}: {e}") from e
+
+    def _submit(self, conn, msg):
+        conn.submitted = False
+        try:
+            conn.server.send_message(msg)
+        except Exception:
+            self._close_server(conn.server)
+            raise
+
+    def _send(self, msg):
+        with self._slots:
+            conn = self._connect_for_send(checkout=True)
+            try:
+                self._submit(conn, msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if conn.submitted:
+                    raise
+                # Dropped while idle, before anything was handed over: one fresh connection
+                with self._lock:
+                    self.stats["reconnects"] += 1
+                conn = self._connect_for_send()
+                try:
+                    self._submit(conn, msg)
+                except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                    if conn.submitted:
+                        raise
+                    raise SMTPNotSent(f"Disconnected before sending: {e}") from e
+
+            conn.messages_sent += 1
+            with self._lock:
+                self.stats["sent"] += 1
+            self._checkin(conn)
+
+    def close(self):
+        """Close all idle connections; in-flight ones are closed when returned, not pooled."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close_server(conn.server)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(host, port, username="", password=""):
+    """Shared pool per SMTP account so offer and agreement emails reuse the same connections."""
+    key = (host, port, username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.password != password:
+            pool = SMTPConnectionPool(host, port, username=username, password=password)
+            _pools[key] = pool
+        return pool
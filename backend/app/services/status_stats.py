@@ -0,0 +1,80 @@
+"""
+Status Counts
+Dashboard counters (Pending / Offer Sent / Accepted / Rejected) from one $group over the
+indexed status field, instead of the browser counting the full employee list.
+
+Results are cached in process for STATS_CACHE_TTL seconds, and every write that changes a
+status (create, delete, import, send, accept/reject, expiry) invalidates the cache, so a
+refresh right after an action is exact and repeated refreshes cost a dict lookup. Writes from
+another worker process are picked up when the TTL runs out.
+"""
+import os
+import threading
+import time
+
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "10"))
+
+EMPLOYEE_STATUSES = ("Pending", "Offer Sent", "Accepted", "Rejected")
+COMPANY_STATUSES = ("Pending", "Agreement Sent")
+
+# Sorting on status first lets the planner answer the $group from the status index alone
+PIPELINE = [
+    {"$sort": {"status": 1}},
+    {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+]
+
+
+class StatusCounts:
+    def __init__(self, collection, statuses, ttl=STATS_CACHE_TTL):
+        self.collection = collection
+        self.statuses = statuses
+        self.ttl = ttl
+        self._cached = None  # (counts, expires_at)
+        # Bumped by invalidate(); an aggregation that started before a write must not be cached
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._cached = None
+
+    def _fresh(self):
+        cached = self._cached
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    def _store(self, generation, rows):
+        counts = {status: 0 for status in self.statuses}
+        for row in rows:
+            # Documents without a status are shown as Pending by the list endpoints
+            status = row["_id"] or "Pending"
+            counts[status] = counts.get(status, 0) + row["count"]
+        result = {"total": sum(counts.values()), "by_status": counts}
+        with self._lock:
+            if generation == self._generation:
+                self._cached = (result, time.monotonic() + self.ttl)
+        return result
+
+    def get(self, db):
+        cached = self._fresh()
+        if cached is not None:
+            return cached
+        generation = self._generation
+        return self._store(generation, list(db[self.collection].aggregate(PIPELINE)))
+
+    async def get_async(self, db, before=None):
+        """Like get(); `before` is awaited on a cache miss, ahead of the aggregation."""
+        cached = self._fresh()
+        if cached is not None:
+            return cached
+        if before is not None:
+            await before()
+        generation = self._generation
+        cursor = await db[self.collection].aggregate(PIPELINE)
+        return self._store(generation, await cursor.to_list(length=None))
+
+
+employee_counts = StatusCounts("employees", EMPLOYEE_STATUSES)
+company_counts = StatusCounts("companies", COMPANY_STATUSES)
@@ -0,0 +1,143 @@
+"""
+Template Render
+Rasterizes uploaded template PDFs and images off the event loop. PyMuPDF holds the GIL
+while it renders, so conversions run in a small process pool (TEMPLATE_RENDER_MODE=thread
+for a thread pool instead). A bounded number of conversions may be running or waiting at
+once; beyond that uploads are refused rather than queued behind each other.
+
+Each upload yields a set of renditions (thumbnail, screen preview, print) so clients can
+fetch the smallest image that is good enough for what they are drawing.
+"""
+import asyncio
+import io
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..lazy import lazy_import, lazy_optional
+
+fitz = lazy_import("fitz")  # PyMuPDF
+Image = lazy_optional("PIL.Image")  # optional: enables WebP renditions
+
+RENDER_DPI = int(os.getenv("TEMPLATE_RENDER_DPI", "300"))
+RENDER_JPEG_QUALITY = int(os.getenv("TEMPLATE_RENDER_JPEG_QUALITY", "95"))
+RENDER_WORKERS = max(1, int(os.getenv("TEMPLATE_RENDER_WORKERS", "2")))
+RENDER_MAX_PENDING = max(RENDER_WORKERS, int(os.getenv("TEMPLATE_RENDER_MAX_PENDING", str(RENDER_WORKERS * 2))))
+RENDER_MODE = os.getenv("TEMPLATE_RENDER_MODE", "process")
+
+
+# (name, max width in px or None for full print resolution, JPEG quality, WebP quality)
+RENDITIONS = (
+    ("thumb", int(os.getenv("TEMPLATE_THUMB_WIDTH", "320")), 70, 70),
+    ("preview", int(os.getenv("TEMPLATE_PREVIEW_WIDTH", "1240")), 82, 80),
+    ("print", None, RENDER_JPEG_QUALITY, 90),
+)
+# A4 at 300 dpi; larger image uploads are scaled down for the print rendition
+PRINT_MAX_WIDTH = int(os.getenv("TEMPLATE_PRINT_MAX_WIDTH", "2480"))
+
+Rendition = namedtuple("Rendition", ["name", "width", "height", "format", "data"])
+
+
+class RenderBusy(Exception):
+    """Raised when the conversion pool already has RENDER_MAX_PENDING jobs."""
+
+
+def _to_rgb(pix):
+    if pix.colorspace and pix.colorspace.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    return pix
+
+
+def _encode(pix, fmt, quality):
+    if fmt == "webp":
+        mode = {1: "L", 3: "RGB"}[pix.n - pix.alpha] + ("A" if pix.alpha else "")
+        img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        out = io.BytesIO()
+        img.save(out, "WEBP", quality=quality, method=4)
+        return out.getvalue()
+    if fmt == "png":
+        return pix.tobytes("png")
+    return pix.tobytes("jpeg", jpg_quality=quality)
+
+
+def build_renditions(data, filetype="pdf", dpi=RENDER_DPI):
+    """Thumbnail, preview and print renditions of a template (first page for PDFs).
+
+    The source is rasterized once; smaller renditions are downscaled from that pixmap.
+    Sources with transparency are encoded as PNG instead of JPEG. WebP copies are added
+    when Pillow is installed.
+    """
+    if filetype == "pdf":
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            if doc.page_count == 0:
+                raise ValueError("PDF has no pages")
+            source = doc.load_page(0).get_pixmap(dpi=dpi)
+    else:
+        source = fitz.Pixmap(data)
+        if source.width > PRINT_MAX_WIDTH:
+            source = fitz.Pixmap(source, PRINT_MAX_WIDTH, round(source.height * PRINT_MAX_WIDTH / source.width), None)
+    source = _to_rgb(source)
+    base_format = "png" if source.alpha else "jpeg"
+
+    renditions = []
+    for name, max_width, jpeg_quality, webp_quality in RENDITIONS:
+        pix = source
+        if max_width and source.width > max_width:
+            pix = fitz.Pixmap(source, max_width, round(source.height * max_width / source.width), None)
+        renditions.append(Rendition(name, pix.width, pix.height, base_format, _encode(pix, base_format, jpeg_quality)))
+        if Image is not None:
+            renditions.append(Rendition(name, pix.width, pix.height, "webp", _encode(pix, "webp", webp_quality)))
+    return renditions
+
+
+def _warm_worker():
+    # Importing PyMuPDF is most of a worker's first-job cost
+    fitz.Pixmap
+    return os.getpid()
+
+
+class TemplateRenderer:
+    def __init__(self, workers=RENDER_WORKERS, max_pending=RENDER_MAX_PENDING, mode=RENDER_MODE):
+        self.workers = workers
+        self.mode = mode
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use so importing the app doesn't fork worker processes
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "thread":
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="template-render")
+                else:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    async def render(self, fn, *args):
+        """Run fn(*args) in the pool without blocking the event loop."""
+        if not self._slots.acquire(blocking=False):
+            raise RenderBusy("Template conversion is busy, try again shortly")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._slots.release()
+
+    async def renditions(self, data, filetype="pdf", dpi=RENDER_DPI):
+        return await self.render(build_renditions, data, filetype, dpi)
+
+    def warm(self):
+        """Start every worker and load PyMuPDF in it, so the first upload isn't a cold one."""
+        executor = self._get_executor()
+        return sorted({f.result() for f in [executor.submit(_warm_worker) for _ in range(self.workers)]})
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+template_renderer = TemplateRenderer()
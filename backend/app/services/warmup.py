@@ -0,0 +1,136 @@
+"""
+Warm-up
+Pays the first-request costs at startup instead of on a user's request: MongoDB connection
+pools (sync and async, TLS included), compiled email/letter templates, template background
+files, the template render workers, the lazily imported spreadsheet stack, and the Ollama
+model load. Render worker processes are only forked at startup with WARMUP_RENDERER=1; by
+default they start with the first template upload. Steps run concurrently in the
+background; /readyz stays not-ready until every step has finished or timed out, so the
+instance only takes traffic once it is warm. List indexes and search keys are not warm-up:
+they are a migration the app runs before serving (see main.lifespan).
+
+A failed step is recorded and does not block readiness: the LLM has a template fallback,
+and MongoDB reachability is judged separately by the health monitor.
+"""
+import asyncio
+import inspect
+import os
+import time
+from datetime import datetime, timezone
+
+WARMUP_STEP_TIMEOUT = float(os.getenv("WARMUP_STEP_TIMEOUT", "120"))
+WARMUP_COMPANIES = [c.strip() for c in os.getenv("WARMUP_COMPANIES", "Arah Infotech Pvt Ltd").split(",") if c.strip()]
+WARMUP_LLM_KEEP_ALIVE = os.getenv("WARMUP_LLM_KEEP_ALIVE", "30m")
+WARMUP_ASSET_BYTES = int(os.getenv("WARMUP_ASSET_BYTES", str(64 * 1024 * 1024)))
+WARMUP_RENDERER = os.getenv("WARMUP_RENDERER", "0") != "0"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+
+
+def warm_mongo():
+    from .. import database
+    database.client.admin.command("ping")
+
+
+async def warm_mongo_async():
+    from .. import database
+    await database.async_db.command("ping")
+
+
+def warm_templates():
+    from . import docx_engine, email_templates
+    for company in WARMUP_COMPANIES:
+        email_templates.company_templates(company)
+        docx_engine._company_template(company)
+
+
+def warm_assets():
+    """Read current template renditions once so they are in the page cache."""
+    from .asset_store import asset_store
+    budget = WARMUP_ASSET_BYTES
+    for entry in asset_store.manifest().values():
+        for rendition in entry.get("renditions", []):
+            path = asset_store.path_for(rendition["url"].rsplit("/", 1)[-1])
+            if path is None or rendition.get("bytes", 0) > budget:
+                continue
+            budget -= len(path.read_bytes())
+
+
+def warm_renderer(force=WARMUP_RENDERER):
+    """Thread workers are cheap to start; worker processes (the default) only with force."""
+    from .template_render import template_renderer
+    if template_renderer.mode == "thread" or force:
+        template_renderer.warm()
+
+
+def warm_imports():
+    from ..lazy import lazy_import
+    lazy_import("pandas").DataFrame
+    lazy_import("openpyxl").Workbook
+
+
+def warm_llm():
+    from .ai_service import ai_engine
+    ai_engine.warm_up(keep_alive=WARMUP_LLM_KEEP_ALIVE, timeout=WARMUP_STEP_TIMEOUT)
+
+
+DEFAULT_STEPS = (
+    ("mongo", warm_mongo),
+    ("mongo_async", warm_mongo_async),
+    ("templates", warm_templates),
+    ("assets", warm_assets),
+    ("renderer", warm_renderer),
+    ("imports", warm_imports),
+    ("llm", warm_llm),
+)
+
+
+class Warmup:
+    def __init__(self, steps=DEFAULT_STEPS, step_timeout=WARMUP_STEP_TIMEOUT):
+        self.steps = steps
+        self.step_timeout = step_timeout
+        self.state = PENDING
+        self.results = {}
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.state == DONE
+
+    async def run(self):
+        """Run every step concurrently; sync steps go to the threadpool."""
+        self.state = RUNNING
+        self.started_at = time.time()
+        await asyncio.gather(*(self._step(name, fn) for name, fn in self.steps))
+        self.finished_at = time.time()
+        self.state = DONE
+        failed = [name for name, r in self.results.items() if r["status"] != "ok"]
+        print(f"Warm-up finished in {self.finished_at - self.started_at:.1f}s" + (f" (failed: {', '.join(failed)})" if failed else ""))
+
+    async def _step(self, name, fn):
+        start = time.perf_counter()
+        try:
+            call = fn() if inspect.iscoroutinefunction(fn) else asyncio.to_thread(fn)
+            await asyncio.wait_for(call, self.step_timeout)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            # The thread itself can't be cancelled; it finishes in the background
+            status, error = "timeout", f"not finished after {self.step_timeout:g}s"
+        except Exception as e:
+            status, error = "failed", str(e)[:200]
+        self.results[name] = {"status": status, "duration_ms": round((time.perf_counter() - start) * 1000, 1), "error": error}
+
+    def skip(self):
+        """Mark warm-up as done without running it (WARMUP=0)."""
+        self.state = DONE
+
+    def report(self):
+        def iso(ts):
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+        return {"state": self.state, "started_at": iso(self.started_at), "finished_at": iso(self.finished_at), "steps": dict(self.results)}
+
+
+warmup = Warmup()
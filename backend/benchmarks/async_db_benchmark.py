@@ -0,0 +1,101 @@
+"""
+Throughput benchmark: async Mongo routes vs. sync routes on the threadpool.
+
+GET /employees/{id} (async def, awaits the database) and GET /agreement-companies/{id}
+(def, runs in Starlette's threadpool) both do a single find_one. Each database call is
+delayed by --latency-ms to stand in for a network round trip to Atlas: time.sleep for the
+sync route, asyncio.sleep for the async one. With enough concurrent requests the sync
+route is capped by the threadpool size (40 by default) while the async one is not.
+
+Runs in-process against mongomock over ASGITransport, so no server or network is needed.
+
+Usage (from backend/):
+    python -m benchmarks.async_db_benchmark --requests 2000 --concurrency 200 --latency-ms 50
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from mongomock import MongoClient
+
+from app.main import app
+from app.database import get_db, get_async_db
+from tests.async_mongomock import AsyncDatabase
+
+db = MongoClient().BenchAsyncDB
+
+
+class _SlowCollection:
+    def __init__(self, collection, delay):
+        self._collection = collection
+        self._delay = delay
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        def call(*args, **kwargs):
+            time.sleep(self._delay)
+            return method(*args, **kwargs)
+        return call
+
+
+class _SlowDatabase:
+    def __init__(self, delay):
+        self._delay = delay
+
+    def __getattr__(self, name):
+        return _SlowCollection(db[name], self._delay)
+
+
+async def _run(client, url, total, concurrency):
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(url)
+    latencies = []
+
+    async def worker():
+        while not queue.empty():
+            target = queue.get_nowait()
+            start = time.perf_counter()
+            res = await client.get(target)
+            res.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    delay = args.latency_ms / 1000
+    app.dependency_overrides[get_db] = lambda: _SlowDatabase(delay)
+    app.dependency_overrides[get_async_db] = lambda: AsyncDatabase(db, delay=delay)
+
+    emp_id = db.employees.insert_one({
+        "name": "Bench", "email": "bench@test.com", "status": "Pending", "emp_id": "EMP001",
+    }).inserted_id
+    company_id = db.companies.insert_one({"name": "Bench Corp", "email": "corp@test.com"}).inserted_id
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, url in (
+            ("sync  /agreement-companies/{id}", f"/agreement-companies/{company_id}"),
+            ("async /employees/{id}          ", f"/employees/{emp_id}"),
+        ):
+            rps, p50, p99 = await _run(client, url, args.requests, args.concurrency)
+            print(f"{label}  {rps:8.1f} req/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
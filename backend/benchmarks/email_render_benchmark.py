@@ -0,0 +1,57 @@
+"""
+Micro-benchmark for offer email rendering in a bulk campaign.
+
+Compares rendering the full layout per message (header/footer, year and shell
+re-interpolated every time, as the old f-string did) with the precompiled
+per-company templates used by EmailService.
+
+Usage (from backend/):
+    python -m benchmarks.email_render_benchmark --messages 10000
+"""
+import argparse
+import time
+from datetime import datetime
+
+from app.services.email_templates import OFFER_HTML, OFFER_TEXT, default_offer_body, render_offer_email
+
+COMPANY = "Arah Infotech Pvt Ltd"
+
+
+def _full_render(i):
+    body_html, body_text = default_offer_body(f"Candidate {i}", COMPANY)
+    year = datetime.now().year
+    urls = {"accept_url": f"https://api.example.com/offer/accept?token=t{i}",
+            "reject_url": f"https://api.example.com/offer/reject?token=t{i}"}
+    return (OFFER_HTML.render(company_name=COMPANY, year=year, body_html=body_html, **urls),
+            OFFER_TEXT.render(company_name=COMPANY, year=year, body_text=body_text, **urls))
+
+
+def _precompiled_render(i):
+    body_html, body_text = default_offer_body(f"Candidate {i}", COMPANY)
+    return render_offer_email(COMPANY, body_html, body_text,
+                              f"https://api.example.com/offer/accept?token=t{i}",
+                              f"https://api.example.com/offer/reject?token=t{i}")
+
+
+def _time(label, fn, messages):
+    start = time.perf_counter()
+    for i in range(messages):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {messages} emails in {elapsed * 1000:.1f} ms  ({elapsed / messages * 1e6:.2f} us/email)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+
+    assert _full_render(1)[0] == _precompiled_render(1).html
+    full = _time("full", _full_render, args.messages)
+    pre = _time("precompiled", _precompiled_render, args.messages)
+    print(f"speedup: {full / pre:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Memory/throughput benchmark: streaming employee export.
+
+Feeds --rows synthetic employee documents (a generator, like a Mongo cursor) through the
+CSV and xlsx exporters and reports time, output size and peak Python heap (tracemalloc).
+Peak memory should stay flat as --rows grows.
+
+Usage (from backend/):
+    python -m benchmarks.export_benchmark --rows 10000 100000 500000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.services import export
+
+
+def _docs(n):
+    for i in range(n):
+        yield {
+            "emp_id": f"EMP{i:06d}",
+            "name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "joining_date": datetime(2026, 1, 15),
+            "designation": "Software Engineer",
+            "department": "Engineering",
+            "employment_type": "Full Time",
+            "location": "Hyderabad",
+            "status": "Pending",
+            "compensation": {
+                "ctc": 600000 + i, "basic_salary": 240000.0, "hra": 96000.0, "conveyance": 19200.0,
+                "medical_allowance": 15000.0, "special_allowance": 229800.0, "gross_salary": 600000.0,
+                "pf": 28800.0, "pt": 2400.0, "deductions": 31200.0, "net_salary": 568800.0,
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    export.openpyxl.Workbook  # import outside the measurement
+
+    for n in args.rows:
+        for fmt in export.FORMATS:
+            tracemalloc.start()
+            start = time.perf_counter()
+            chunks, _ = export.stream(_docs(n), export.EMPLOYEE_COLUMNS, fmt, "Employees")
+            size = sum(len(chunk) for chunk in chunks)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{n:>7} rows {fmt:<4}  {elapsed:7.2f} s  {size / 1e6:8.1f} MB out  peak heap {peak / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Burst benchmark for the candidate Accept/Reject links.
+
+Fires concurrent clicks at a batch of offers (several clicks per offer, mixed
+accept/reject) and reports latency percentiles plus a consistency check: every
+offer must end with exactly one recorded decision that matches the page shown.
+
+Runs in-process against mongomock, so it measures handler cost, not Atlas latency.
+
+Usage (from backend/):
+    python -m benchmarks.offer_response_benchmark --offers 200 --clicks 5 --threads 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from mongomock import MongoClient
+
+from app.main import app
+from app.database import get_db, get_async_db
+from app.services import offer_tokens
+from bson import ObjectId
+from tests.async_mongomock import AsyncDatabase
+
+db = MongoClient().BenchOfferDB
+app.dependency_overrides[get_db] = lambda: db
+app.dependency_overrides[get_async_db] = lambda: AsyncDatabase(db)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--offers", type=int, default=200)
+    parser.add_argument("--clicks", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    expires = datetime.now(timezone.utc) + timedelta(hours=20)
+    clicks = []
+    for i in range(args.offers):
+        emp_id = str(db.employees.insert_one({"name": f"Bench {i}", "status": "Offer Sent", "expires_at": expires}).inserted_id)
+        token = offer_tokens.issue(emp_id, "Bench Corp", offer_tokens.next_token_version(db, emp_id))
+        clicks += [(emp_id, "accept" if c % 2 else "reject", token) for c in range(args.clicks)]
+
+    def click(item):
+        emp_id, action, token = item
+        start = time.perf_counter()
+        res = client.get(f"/offer/{action}?token={token}")
+        return emp_id, res.text, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(click, clicks))
+
+    latencies = sorted(r[2] for r in results)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+    print(f"{len(results)} clicks: p50 {pct(0.50):.2f} ms  p95 {pct(0.95):.2f} ms  p99 {pct(0.99):.2f} ms")
+
+    winners = {}
+    for emp_id, text, _ in results:
+        if "Already Responded" not in text:
+            winners.setdefault(emp_id, []).append("Accepted" if "Offer Accepted!" in text else "Rejected")
+    inconsistent = [
+        emp_id for emp_id, wins in winners.items()
+        if len(wins) != 1 or db.employees.find_one({"_id": ObjectId(emp_id)})["status"] != wins[0]
+    ]
+    print(f"offers with a single consistent winner: {len(winners) - len(inconsistent)}/{args.offers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Payload benchmark: JSON serialization and compression of large employee lists.
+
+For 1k and 10k employee documents shaped like an imported spreadsheet, times:
+  - stdlib json.dumps
+  - orjson (app.responses.dumps, what FastJSONResponse uses)
+  - Pydantic validate + dump_json (what a response_model route does)
+  - the list routes' trusted-output path (DocumentSerializer + orjson)
+and the wire size raw, gzipped and brotli-compressed (app.services.compression), with the
+time each encoding takes. Finally GET /employees/ end to end, with and without
+Accept-Encoding, over ASGITransport against mongomock.
+
+Usage (from backend/):
+    python -m benchmarks.payload_benchmark --sizes 1000 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import List
+
+import httpx
+from mongomock import MongoClient
+from pydantic import TypeAdapter
+
+from app import schemas
+from app.database import get_db, get_async_db
+from app.main import app
+from app.responses import dumps
+from app.routes.employee import employee_serializer
+from app.services.compression import brotli, compress
+from tests.async_mongomock import AsyncDatabase
+
+
+def _docs(n):
+    return [{
+        "name": f"Employee {i}",
+        "email": f"employee{i}@arahinfotech.net",
+        "emp_id": f"EMP{i:05d}",
+        "designation": "Software Engineer" if i % 3 else "QA Analyst",
+        "department": "Engineering",
+        "location": "Hyderabad",
+        "status": "Pending" if i % 4 else "Offer Sent",
+        "company_name": "Arah Infotech Pvt Ltd",
+        "joining_date": datetime(2026, 1, 15),
+        "compensation": {"ctc": 600000 + i, "basic_salary": 25000, "hra": 10000, "pf": 1800, "pt": 200},
+        "created_at": datetime(2026, 1, 1, 9, 30),
+    } for i in range(n)]
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+async def _wire(client, n, accept):
+    res = await client.get(f"/employees/?limit={n}", headers={"Accept-Encoding": accept})
+    res.raise_for_status()
+    return res.num_bytes_downloaded
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    adapter = TypeAdapter(List[schemas.Employee])
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+
+    for n in args.sizes:
+        db = MongoClient().BenchPayloadDB
+        db.employees.insert_many(_docs(n))
+        stored = list(db.employees.find({}, employee_serializer.projection))
+        docs = employee_serializer.many(stored)
+        print(f"── {n} employees ──")
+
+        ms, _ = _best(lambda: json.dumps(docs, default=str).encode(), args.repeat)
+        print(f"  stdlib json            {ms:8.2f} ms")
+        ms, body = _best(lambda: dumps(docs), args.repeat)
+        print(f"  orjson                 {ms:8.2f} ms")
+        validated = [{**d, "id": str(d["_id"])} for d in stored]
+        ms, _ = _best(lambda: adapter.dump_json(adapter.validate_python(validated)), args.repeat)
+        print(f"  pydantic validate+dump {ms:8.2f} ms  {ms * 1000 / n:6.2f} us/doc")
+        ms, _ = _best(lambda: dumps(employee_serializer.many(stored)), args.repeat)
+        print(f"  serializer+orjson      {ms:8.2f} ms  {ms * 1000 / n:6.2f} us/doc")
+
+        print(f"  raw                    {len(body):8d} bytes")
+        for encoding in encodings:
+            ms, packed = _best(lambda: compress(body, encoding), args.repeat)
+            print(f"  {encoding:<4}                   {len(packed):8d} bytes  {ms:8.2f} ms  ({len(body) / len(packed):.1f}x)")
+
+        app.dependency_overrides[get_db] = lambda: db
+        app.dependency_overrides[get_async_db] = lambda: AsyncDatabase(db)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for accept in ["identity"] + encodings:
+                start = time.perf_counter()
+                size = await _wire(client, n, accept)
+                print(f"  GET /employees/ {accept:<8} {size:8d} bytes  {(time.perf_counter() - start) * 1000:8.2f} ms")
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
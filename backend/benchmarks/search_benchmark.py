@@ -0,0 +1,119 @@
+"""
+Latency benchmark: server-side employee search on a large collection.
+
+Seeds --docs synthetic employees (500k by default) into a scratch database on a real
+MongoDB, creates the list indexes with search.ensure_indexes(), then runs each query shape
+the dashboard sends through the same filter/sort/projection code as GET /employees/ and
+reports p50/p95 latency along with the index the planner picked. mongomock has no query
+planner, so this one needs a server:
+
+Usage (from backend/):
+    python -m benchmarks.search_benchmark --url mongodb://localhost:27017 --docs 500000 --runs 50
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from pymongo import MongoClient
+
+from app.routes.employee import employee_serializer
+from app.services import search
+
+STATUSES = ["Pending", "Offer Sent", "Accepted", "Rejected"]
+DEPARTMENTS = ["Engineering", "Quality", "Sales", "Finance", "Operations", "People"]
+DESIGNATIONS = ["Software Engineer", "QA Analyst", "Account Executive", "Analyst", "Engineering Manager", "Recruiter"]
+FIRST = ["Asha", "Ravi", "Meera", "Arjun", "Divya", "Kiran", "Neha", "Vikram", "Pooja", "Rahul"]
+LAST = ["Kumar", "Iyer", "Sharma", "Reddy", "Nair", "Gupta", "Rao", "Singh", "Das", "Menon"]
+COMPANIES = ["Arah Infotech Pvt Ltd", "Acme Corp", "Beta Labs"]
+
+QUERIES = [
+    ("first page", {}, None),
+    ("status", {"status": ["Offer Sent"]}, None),
+    ("status + sort name", {"status": ["Pending", "Accepted"]}, "name"),
+    ("department + status", {"department": "Quality", "status": ["Accepted"]}, None),
+    ("company", {"funnel_bucket.company": "Beta Labs"}, None),
+    ("joining range", {"ranges": (date(2026, 3, 1), date(2026, 3, 31))}, "-joining_date"),
+    ("prefix q=mee", {"q": "mee"}, None),
+    ("prefix q=ravi red", {"q": "ravi red"}, "name"),
+    ("status + q=engin", {"status": ["Pending"], "q": "engin"}, None),
+]
+
+
+def _seed(collection, n, batch=10000):
+    rng = random.Random(7)
+    start = datetime(2025, 1, 1)
+    for offset in range(0, n, batch):
+        docs = []
+        for i in range(offset, min(n, offset + batch)):
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+            joined = start + timedelta(days=rng.randrange(540))
+            doc = {
+                "emp_id": f"EMP{i:06d}",
+                "name": name,
+                "email": f"{name.split()[0].lower()}.{i}@example.com",
+                "designation": rng.choice(DESIGNATIONS),
+                "department": rng.choice(DEPARTMENTS),
+                "status": rng.choice(STATUSES),
+                # Half as the forms store them, half as the imports do
+                "joining_date": joined if i % 2 else joined.strftime("%Y-%m-%d"),
+                "created_at": joined - timedelta(days=30),
+                "funnel_bucket": {"company": rng.choice(COMPANIES)},
+                "compensation": {"ctc": 600000 + i, "basic_salary": 240000},
+            }
+            doc[search.SEARCH_FIELD] = search.search_keys(doc)
+            docs.append(doc)
+        collection.insert_many(docs, ordered=False)
+
+
+def _query(params):
+    params = dict(params)
+    ranges = params.pop("ranges", None)
+    q = params.pop("q", None)
+    return search.build_filter(equals=params, ranges={"joining_date": ranges} if ranges else None, q=q)
+
+
+def _plan(collection, query, order):
+    stages = []
+    plan = collection.find(query).sort(order).limit(300).explain()["queryPlanner"]["winningPlan"]
+    while plan:
+        if plan.get("indexName"):
+            stages.append(plan["indexName"])
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return ",".join(stages) or "COLLSCAN"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--docs", type=int, default=500000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--keep", action="store_true", help="reuse a previously seeded collection")
+    args = parser.parse_args()
+
+    db = MongoClient(args.url).SearchBenchDB
+    if not args.keep or db.employees.estimated_document_count() != args.docs:
+        db.employees.drop()
+        start = time.perf_counter()
+        _seed(db.employees, args.docs)
+        print(f"Seeded {args.docs} employees in {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    search.ensure_indexes(db)
+    print(f"Indexes ready in {time.perf_counter() - start:.1f}s")
+
+    for label, params, sort in QUERIES:
+        query, order = _query(params), search.sort_spec(sort)
+        latencies = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            cursor = db.employees.find(query, employee_serializer.projection).sort(order).limit(args.limit)
+            employee_serializer.many(cursor)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        p50, p95 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{label:<22} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  {_plan(db.employees, query, order)}")
+
+
+if __name__ == "__main__":
+    main()
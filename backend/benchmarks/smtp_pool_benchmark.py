@@ -0,0 +1,80 @@
+"""
+SMTP throughput benchmark: one connection per email vs the pooled transport.
+
+Runs against a local aiosmtpd server (no TLS/auth), so the numbers only show the
+connection setup overhead we save; against Gmail the gap is larger because every
+new connection also pays STARTTLS + LOGIN.
+
+Usage (from backend/):
+    pip install aiosmtpd
+    python -m benchmarks.smtp_pool_benchmark --messages 500 --threads 4
+"""
+import argparse
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+from aiosmtpd.controller import Controller
+
+from app.services.smtp_pool import SMTPConnectionPool
+
+
+class _SinkHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def _build_message(i):
+    msg = MIMEText(f"Offer letter body #{i}")
+    msg["From"] = "hr@bench.local"
+    msg["To"] = f"candidate{i}@bench.local"
+    msg["Subject"] = f"Offer of Employment - Candidate {i}"
+    return msg
+
+
+def _send_unpooled(host, port, msg):
+    server = smtplib.SMTP(host, port)
+    server.send_message(msg)
+    server.quit()
+
+
+def _run(label, send, messages, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(send, (_build_message(i) for i in range(messages))))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {messages} msgs in {elapsed:.3f}s  ->  {messages / elapsed:,.0f} msgs/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    handler = _SinkHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=8025)
+    controller.start()
+    try:
+        host, port = controller.hostname, controller.port
+
+        unpooled = _run("unpooled", lambda m: _send_unpooled(host, port, m), args.messages, args.threads)
+
+        pool = SMTPConnectionPool(host, port, use_starttls=False, max_connections=args.threads)
+        pooled = _run("pooled", pool.send_message, args.messages, args.threads)
+        pool.close()
+
+        print(f"speedup: {unpooled / pooled:.1f}x  (connections opened by pool: {pool.stats['connects']})")
+        print(f"server received {handler.received} messages")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
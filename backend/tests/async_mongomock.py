@@ -0,0 +1,78 @@
+"""
+Minimal asyncio facade over a mongomock database, shaped like pymongo's AsyncMongoClient
+API as used by the `async def` routes: collection methods are coroutines, find() returns a
+cursor with skip/limit/sort and an awaitable to_list(), aggregate() is awaited for a cursor.
+
+`delay` adds an asyncio.sleep before every database call to stand in for network latency.
+"""
+import asyncio
+
+
+class AsyncCursor:
+    def __init__(self, cursor, delay=0):
+        self._cursor = cursor
+        self._delay = delay
+
+    def skip(self, n):
+        self._cursor = self._cursor.skip(n)
+        return self
+
+    def limit(self, n):
+        self._cursor = self._cursor.limit(n)
+        return self
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    async def to_list(self, length=None):
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        docs = list(self._cursor)
+        return docs if length is None else docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self.to_list():
+            yield doc
+
+
+class AsyncCollection:
+    def __init__(self, collection, delay=0):
+        self._collection = collection
+        self._delay = delay
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs), self._delay)
+
+    async def aggregate(self, *args, **kwargs):
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return AsyncCursor(iter(list(self._collection.aggregate(*args, **kwargs))))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+        if not callable(method):
+            return method
+
+        async def call(*args, **kwargs):
+            if self._delay:
+                await asyncio.sleep(self._delay)
+            return method(*args, **kwargs)
+        return call
+
+
+class AsyncDatabase:
+    def __init__(self, db, delay=0):
+        self._db = db
+        self._delay = delay
+
+    def __getitem__(self, name):
+        return AsyncCollection(self._db[name], self._delay)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
@@ -3,7 +3,8 @@ from fastapi.testclient import TestClient
 from mongomock import MongoClient
 
 from app.main import app
-from app.database import get_db
+from app.database import get_db, get_async_db
+from tests.async_mongomock import AsyncDatabase
 
 # Create a mongomock client
 mock_client = MongoClient()
@@ -16,7 +17,12 @@ def override_get_db():
     finally:
         pass
 
+# `async def` routes get the same data through an awaitable facade
+async def override_get_async_db():
+    yield AsyncDatabase(mock_db)
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 @pytest.fixture(scope="session")
 def test_app():
@@ -0,0 +1,85 @@
+import asyncio
+import inspect
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from async_mongomock import AsyncDatabase
+
+from app.database import get_async_db
+from app.routes import employee, offer_response, letter, email, agreement_email
+from app.services import outbox, offer_funnel
+
+
+HOT_ROUTES = {
+    ("GET", "/employees/"), ("GET", "/employees/{employee_id}"),
+    ("GET", "/offer/accept"), ("GET", "/offer/reject"),
+    ("POST", "/letters/generate"),
+    ("POST", "/email/send"), ("POST", "/email/send-file"),
+    ("POST", "/agreement-email/send"), ("POST", "/agreement-email/send-file"),
+}
+
+
+def _routes():
+    for module in (employee, offer_response, letter, email, agreement_email):
+        for route in module.router.routes:
+            for method in route.methods:
+                yield (method, route.path), route
+
+
+def test_hot_routes_are_async_on_the_async_client():
+    found = {key: route for key, route in _routes() if key in HOT_ROUTES}
+    assert set(found) == HOT_ROUTES
+    for key, route in found.items():
+        assert inspect.iscoroutinefunction(route.endpoint), key
+        deps = [d.call for d in route.dependant.dependencies]
+        assert get_async_db in deps, key
+
+
+@pytest.fixture(autouse=True)
+def _empty():
+    mock_db.employees.delete_many({})
+    mock_db.offer_funnel.delete_many({})
+
+
+def test_list_expires_overdue_offers_through_async_db(client):
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    mock_db.employees.insert_many([
+        {"name": f"Late {i}", "email": f"late{i}@test.com", "status": "Offer Sent",
+         "expires_at": past, "department": "Eng", "designation": "Dev", "sent_at": past}
+        for i in range(3)
+    ])
+
+    res = client.get("/employees/")
+    assert res.status_code == 200
+    assert {e["status"] for e in res.json()} == {"Rejected"}
+    assert sum(doc["expired"] for doc in mock_db.offer_funnel.find()) == 3
+
+
+def test_list_paginates(client):
+    mock_db.employees.insert_many([{"name": f"E{i}", "email": f"e{i}@test.com", "status": "Pending"} for i in range(5)])
+    res = client.get("/employees/?skip=1&limit=2")
+    assert [e["name"] for e in res.json()] == ["E1", "E2"]
+
+
+def test_enqueue_async_matches_enqueue():
+    db = AsyncDatabase(mock_db)
+    message_id = asyncio.run(outbox.enqueue_async(db, outbox.KIND_OFFER, "abc", {"recipient_email": "a@b.c"}, b"%PDF"))
+    doc = outbox.get_message(mock_db, message_id)
+    assert doc["status"] == "queued"
+    assert doc["target_id"] == "abc"
+
+
+def test_record_async_never_raises():
+    class Broken:
+        class offer_funnel:
+            @staticmethod
+            async def update_one(*args, **kwargs):
+                raise RuntimeError("down")
+
+    bucket = offer_funnel.bucket_for({"department": "Eng"}, "Acme")
+    asyncio.run(offer_funnel.record_async(Broken, bucket, offer_funnel.ACCEPTED))
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from app.services.brevo_client import BrevoClient, _parse_retry_after, never_sent
+
+
+def _response(status, headers=None):
+    res = MagicMock()
+    res.status_code = status
+    res.headers = headers or {}
+    res.text = ""
+    return res
+
+
+@pytest.fixture
+def client():
+    c = BrevoClient(max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    with patch("app.services.brevo_client.time.sleep") as sleep:
+        c.sleep = sleep
+        yield c
+
+
+def test_send_uses_timeouts_and_api_key(client):
+    with patch.object(client.session, "post", return_value=_response(201)) as post:
+        res = client.send_email("key-123", {"subject": "Hi"})
+    assert res.status_code == 201
+    kwargs = post.call_args.kwargs
+    assert kwargs["timeout"] == (client.connect_timeout, client.read_timeout)
+    assert kwargs["headers"]["api-key"] == "key-123"
+    assert client.latency_summary()["count"] == 1
+
+
+def test_retries_on_429_honours_retry_after(client):
+    responses = [_response(429, {"Retry-After": "0.04"}), _response(201)]
+    with patch.object(client.session, "post", side_effect=responses) as post:
+        res = client.send_email("k", {})
+    assert res.status_code == 201
+    assert post.call_count == 2
+    client.sleep.assert_called_once_with(0.04)
+    assert client.stats["retries"] == 1
+
+
+def test_retries_are_bounded(client):
+    with patch.object(client.session, "post", return_value=_response(429)) as post:
+        res = client.send_email("k", {})
+    assert res.status_code == 429
+    assert post.call_count == 4
+    assert client.stats["failed"] == 1
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_server_errors_are_not_retried(client, status):
+    # The email may already be queued; a retry could send the offer twice
+    with patch.object(client.session, "post", return_value=_response(status)) as post:
+        res = client.send_email("k", {})
+    assert res.status_code == status
+    assert post.call_count == 1
+
+
+def test_client_errors_are_not_retried(client):
+    with patch.object(client.session, "post", return_value=_response(400)) as post:
+        client.send_email("k", {})
+    assert post.call_count == 1
+
+
+def test_read_timeout_is_not_retried(client):
+    with patch.object(client.session, "post", side_effect=requests.exceptions.ReadTimeout()) as post:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.send_email("k", {})
+    assert post.call_count == 1
+
+
+def test_connection_errors_are_retried(client):
+    side_effect = [requests.exceptions.ConnectionError(), _response(201)]
+    with patch.object(client.session, "post", side_effect=side_effect) as post:
+        res = client.send_email("k", {})
+    assert res.status_code == 201
+    assert post.call_count == 2
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after("3") == 3.0
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert _parse_retry_after("garbage") is None
+
+
+def test_never_sent_only_for_failures_before_the_request():
+    refused = requests.exceptions.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "refused")))
+    assert never_sent(refused)
+    assert never_sent(requests.exceptions.ConnectTimeout())
+    assert not never_sent(requests.exceptions.ConnectionError(ProtocolError("reset")))
+    assert not never_sent(requests.exceptions.ReadTimeout())
@@ -0,0 +1,117 @@
+import gzip
+import math
+import os
+import sys
+
+import brotli
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.responses import FastJSONResponse, dumps
+from app.services import compression
+from app.services.compression import CompressionMiddleware, choose_encoding
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+BIG = "offer letter " * 500
+
+
+@pytest.fixture(scope="module")
+def raw_client():
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(BIG)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\0" * 5000, media_type="image/png")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BIG.encode()), media_type="text/html", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"row {i}\n".encode() for i in range(2000)), media_type="text/csv")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    # Leave bodies encoded so the test sees the wire format
+    client = TestClient(app)
+    client.headers["Accept-Encoding"] = "identity"
+    return client
+
+
+def _get(client, path, accept):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept}) as res:
+        return res, b"".join(res.iter_raw())
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip, br;q=0") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+
+def test_brotli_preferred(raw_client):
+    res, body = _get(raw_client, "/big", "gzip, br")
+    assert res.headers["content-encoding"] == "br"
+    assert "accept-encoding" in res.headers["vary"].lower()
+    assert brotli.decompress(body).decode() == BIG
+    assert int(res.headers["content-length"]) == len(body) < len(BIG)
+
+
+def test_gzip(raw_client):
+    res, body = _get(raw_client, "/big", "gzip")
+    assert res.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == BIG
+
+
+def test_passthrough_cases(raw_client):
+    for path in ("/small", "/image"):
+        res, _ = _get(raw_client, path, "gzip, br")
+        assert "content-encoding" not in res.headers, path
+    res, body = _get(raw_client, "/big", "identity")
+    assert "content-encoding" not in res.headers and body.decode() == BIG
+    res, body = _get(raw_client, "/encoded", "gzip, br")
+    assert res.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == BIG
+
+
+def test_streaming_is_compressed_incrementally(raw_client):
+    res, body = _get(raw_client, "/stream", "gzip")
+    assert res.headers["content-encoding"] == "gzip"
+    assert "content-length" not in res.headers
+    assert gzip.decompress(body).decode() == "".join(f"row {i}\n" for i in range(2000))
+
+
+def test_large_body_offloaded(raw_client, monkeypatch):
+    monkeypatch.setattr(compression, "COMPRESS_OFFLOAD_BYTES", 1000)
+    res, body = _get(raw_client, "/big", "gzip")
+    assert gzip.decompress(body).decode() == BIG
+
+
+def test_fast_json_handles_mongo_types():
+    oid = ObjectId()
+    assert dumps({"_id": oid, "x": math.nan, "n": 1}) == ('{"_id":"%s","x":null,"n":1}' % oid).encode()
+    res = FastJSONResponse({"ids": [oid]})
+    assert res.body == ('{"ids":["%s"]}' % oid).encode()
+
+
+def test_app_compresses_json(client):
+    mock_db.employees.delete_many({})
+    mock_db.employees.insert_many([{"name": f"E{i}", "email": f"e{i}@z.com", "status": "Pending"} for i in range(50)])
+    with client.stream("GET", "/employees/", headers={"Accept-Encoding": "gzip"}) as res:
+        raw = b"".join(res.iter_raw())
+    assert res.headers["content-encoding"] == "gzip"
+    assert len(gzip.decompress(raw)) > len(raw)
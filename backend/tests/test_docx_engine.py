@@ -0,0 +1,72 @@
+import io
+import sys
+import os
+import zipfile
+
+import docx
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+from app.services import docx_engine
+
+EMPLOYEE = {
+    "name": "Ravi & Co",
+    "designation": "QA Engineer",
+    "joining_date": "2026-11-02",
+    "compensation": {
+        "ctc": 300000, "basic_salary": 120000, "hra": 48000, "conveyance": 19200,
+        "medical_allowance": 15000, "special_allowance": 97800, "gross_salary": 300000,
+        "pt": 2400, "pf": 14400, "net_salary": 283200,
+    },
+}
+
+
+def _open(data):
+    return docx.Document(io.BytesIO(data))
+
+
+def test_rupees_in_words():
+    assert docx_engine.rupees_in_words(151200) == "One Lakh Fifty One Thousand Two Hundred"
+    assert docx_engine.rupees_in_words(12345678) == "One Crore Twenty Three Lakh Forty Five Thousand Six Hundred Seventy Eight"
+
+
+def test_render_fills_placeholders_and_salary_table():
+    document = _open(docx_engine.render_offer_docx(EMPLOYEE, "Zero7 Technologies Pvt Ltd"))
+    text = "\n".join(p.text for p in document.paragraphs)
+    assert "Dear Ravi & Co" in text
+    assert "position of QA Engineer with ZERO7 TECHNOLOGIES PVT LTD." in text
+    assert "INR 3 Lakh per Annum" in text
+    assert "join us on 02/11/2026" in text
+    assert "Rupees: Two Lakh Eighty Three Thousand Two Hundred Rupees Only" in text
+    assert "Navya" not in text.replace("S Navya", "")
+    assert "{" not in text
+
+    rows = {r.cells[0].text: (r.cells[1].text, r.cells[2].text) for r in document.tables[0].rows}
+    assert rows["Basic Salary"] == ("10000.00", "120000.00")
+    assert rows["PT"] == ("200.00", "2400.00")
+    assert rows["Net Pay"] == ("23600.00", "283200.00")
+
+
+def test_company_skeleton_is_cached():
+    docx_engine._company_template.cache_clear()
+    for _ in range(3):
+        docx_engine.render_offer_docx(EMPLOYEE, "Cached Pvt Ltd")
+    info = docx_engine._company_template.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_download_and_batch_endpoints(client):
+    ids = [str(mock_db.employees.insert_one(dict(EMPLOYEE, name=n)).inserted_id) for n in ("Asha", "Asha", "Bo")]
+
+    res = client.post("/letters/download-docx", json={"employee_id": ids[0]})
+    assert res.status_code == 200
+    assert "Asha_Offer_Letter.docx" in res.headers["content-disposition"]
+    assert "Dear Asha" in "\n".join(p.text for p in _open(res.content).paragraphs)
+
+    res = client.post("/letters/download-docx/batch", json={"employee_ids": ids + ["bad"]})
+    assert res.status_code == 200
+    names = zipfile.ZipFile(io.BytesIO(res.content)).namelist()
+    assert names == ["Asha_Offer_Letter.docx", "Asha_Offer_Letter_2.docx", "Bo_Offer_Letter.docx"]
+
+    assert client.post("/letters/download-docx/batch", json={"employee_ids": ["bad"]}).status_code == 400
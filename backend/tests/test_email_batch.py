@@ -0,0 +1,129 @@
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.services import email_service
+from app.services.email_service import email_client
+
+
+def _ok():
+    res = MagicMock()
+    res.status_code = 201
+    return res
+
+
+@pytest.fixture
+def brevo():
+    with patch.object(email_client, "brevo_api_key", "test-key"), \
+         patch.object(email_client, "_generate_offer_token", side_effect=lambda emp_id, company: f"tok-{emp_id}"), \
+         patch.object(email_service.brevo_client, "send_email", return_value=_ok()) as send:
+        yield send
+
+
+@pytest.fixture
+def employees():
+    ids = []
+    for i in range(5):
+        res = mock_db.employees.insert_one({"name": f"Cand {i}", "email": f"c{i}@test.com", "status": "Pending"})
+        ids.append(str(res.inserted_id))
+    return ids
+
+
+def _offer(emp_id, i, **extra):
+    return {"employee_id": emp_id, "recipient_email": f"c{i}@test.com", "candidate_name": f"Cand {i}",
+            "company_name": "Acme", "subject": "Offer", **extra}
+
+
+def test_batch_groups_into_message_versions(brevo):
+    offers = [_offer(f"e{i}", i) for i in range(3)]
+    results = email_client.send_offer_batch(offers)
+
+    assert brevo.call_count == 1
+    payload = brevo.call_args.args[1]
+    assert len(payload["messageVersions"]) == 3
+    version = payload["messageVersions"][1]
+    assert version["to"][0]["email"] == "c1@test.com"
+    assert version["params"]["accept_url"].endswith("/offer/accept?token=tok-e1")
+    assert "{{ params.accept_url }}" in payload["htmlContent"]
+    assert all(r["status"] == "success" for r in results.values())
+    assert set(results) == {"e0", "e1", "e2"}
+
+
+def test_batch_escapes_template_syntax_in_hr_text(brevo):
+    offers = [_offer(f"e{i}", i, email_body="Hi {{ params.accept_url }} {% if x %}", subject="{{ contact.FIRSTNAME }}")
+              for i in range(2)]
+    email_client.send_offer_batch(offers)
+
+    payload = brevo.call_args.args[1]
+    for text in (payload["htmlContent"], payload["textContent"]):
+        assert "{{ params.accept_url }} {% if" not in text
+        assert "Hi {\u200b{ params.accept_url }} {\u200b% if x %}" in text
+        assert "{{ params.reject_url }}" in text
+    assert "{{" not in payload["subject"] and "{{" not in payload["messageVersions"][0]["subject"]
+
+
+def test_batch_without_pdf_carries_letter_text(brevo):
+    offers = [_offer(f"e{i}", i, letter_content=f"Letter for {i}") for i in range(2)]
+    email_client.send_offer_batch(offers)
+
+    payload = brevo.call_args.args[1]
+    assert "--- OFFER LETTER TEXT ---\n{{ params.letter_content }}" in payload["textContent"]
+    assert payload["messageVersions"][1]["params"]["letter_content"] == "Letter for 1"
+
+    email_client.send_offer_batch([_offer(f"e{i}", i, letter_content="x", pdf_content=b"pdf") for i in range(2)])
+    payload = brevo.call_args.args[1]
+    assert "letter_content" not in payload["textContent"]
+    assert "letter_content" not in payload["messageVersions"][0]["params"]
+
+
+def test_batch_splits_on_version_limit(brevo):
+    with patch.object(email_service, "BREVO_BATCH_MAX_VERSIONS", 2):
+        email_client.send_offer_batch([_offer(f"e{i}", i) for i in range(5)])
+    assert [len(c.args[1]["messageVersions"]) for c in brevo.call_args_list] == [2, 2, 1]
+
+
+def test_personalised_pdfs_fall_back_to_single_send(brevo):
+    offers = [_offer("e0", 0, pdf_content=b"pdf-a"), _offer("e1", 1, pdf_content=b"pdf-b")]
+    email_client.send_offer_batch(offers)
+    assert brevo.call_count == 2
+    assert all("messageVersions" not in c.args[1] for c in brevo.call_args_list)
+
+
+def test_send_bulk_endpoint_updates_statuses(client, brevo, employees):
+    missing = str(ObjectId())
+    payload = {"offers": [{"employee_id": e, "letter_content": "x", "company_name": "Acme", "subject": "Offer"}
+                          for e in employees + [missing]]}
+    res = client.post("/email/send-bulk", json=payload)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["sent_count"] == 5
+    assert data["results"][missing]["status"] == "error"
+    assert brevo.call_count == 1
+
+    for e in employees:
+        doc = mock_db.employees.find_one({"_id": ObjectId(e)})
+        assert doc["status"] == "Offer Sent"
+        assert doc["expires_at"] > doc["sent_at"]
+
+
+def test_send_bulk_records_each_request_before_the_next(client, brevo, employees):
+    ids = [ObjectId(e) for e in employees]
+    recorded_before_send = []
+
+    def send(api_key, payload):
+        recorded_before_send.append(mock_db.employees.count_documents({"_id": {"$in": ids}, "status": "Offer Sent"}))
+        return _ok()
+
+    brevo.side_effect = send
+    payload = {"offers": [{"employee_id": e, "letter_content": "x", "company_name": "Acme", "subject": "Offer"}
+                          for e in employees]}
+    with patch.object(email_service, "BREVO_BATCH_MAX_VERSIONS", 2):
+        assert client.post("/email/send-bulk", json=payload).json()["sent_count"] == 5
+
+    assert recorded_before_send == [0, 2, 4]
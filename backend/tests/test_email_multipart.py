@@ -0,0 +1,88 @@
+import base64
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.routes import email
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 64
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox():
+    mock_db.email_outbox.delete_many({})
+
+
+def test_send_file_queues_raw_pdf(client):
+    emp_id = str(mock_db.employees.insert_one({"name": "Multi Part", "email": "mp@test.com"}).inserted_id)
+    res = client.post(
+        "/email/send-file",
+        data={"employee_id": emp_id, "letter_content": "x", "subject": "Offer"},
+        files={"pdf": ("offer.pdf", PDF, "application/pdf")},
+    )
+    assert res.status_code == 202
+    doc = mock_db.email_outbox.find_one({"_id": ObjectId(res.json()["message_id"])})
+    assert bytes(doc["pdf"]) == PDF
+    assert doc["message"]["subject"] == "Offer"
+
+
+def test_agreement_send_file_queues_raw_pdf(client):
+    co_id = str(mock_db.companies.insert_one({"name": "Multi Corp", "email": "mc@test.com"}).inserted_id)
+    res = client.post(
+        "/agreement-email/send-file",
+        data={"employee_id": co_id, "letter_content": "x"},
+        files={"pdf": ("agreement.pdf", PDF, "application/pdf")},
+    )
+    assert res.status_code == 202
+    doc = mock_db.email_outbox.find_one({"_id": ObjectId(res.json()["message_id"])})
+    assert doc["kind"] == "agreement"
+    assert bytes(doc["pdf"]) == PDF
+
+
+def test_send_file_rejects_non_pdf(client):
+    emp_id = str(mock_db.employees.insert_one({"name": "Bad", "email": "bad@test.com"}).inserted_id)
+    res = client.post(
+        "/email/send-file",
+        data={"employee_id": emp_id, "letter_content": "x"},
+        files={"pdf": ("note.txt", b"hello", "text/plain")},
+    )
+    assert res.status_code == 400
+
+
+def test_send_file_unknown_employee(client):
+    res = client.post("/email/send-file", data={"employee_id": str(ObjectId()), "letter_content": "x"})
+    assert res.status_code == 404
+
+
+def test_validation_error_truncates_large_body(client):
+    res = client.post("/email/send", json={"pdf_base64": "A" * 100000})
+    assert res.status_code == 422
+    assert len(res.json()["body"]) < 3000
+    assert all("input" not in err for err in res.json()["detail"])
+
+
+def test_send_file_rejects_oversized_pdf(client, monkeypatch):
+    monkeypatch.setattr(email, "MAX_PDF_BYTES", 1024)
+    emp_id = str(mock_db.employees.insert_one({"name": "Big", "email": "big@test.com"}).inserted_id)
+    res = client.post(
+        "/email/send-file",
+        data={"employee_id": emp_id, "letter_content": "x"},
+        files={"pdf": ("offer.pdf", PDF, "application/pdf")},
+    )
+    assert res.status_code == 413
+
+
+def test_agreement_send_decodes_data_uri(client):
+    co_id = str(mock_db.companies.insert_one({"name": "B64 Corp", "email": "b64@test.com"}).inserted_id)
+    res = client.post("/agreement-email/send", json={
+        "employee_id": co_id, "letter_content": "x",
+        "pdf_base64": "data:application/pdf;base64," + base64.b64encode(PDF).decode(),
+    })
+    assert res.status_code == 202
+    doc = mock_db.email_outbox.find_one({"_id": ObjectId(res.json()["message_id"])})
+    assert bytes(doc["pdf"]) == PDF
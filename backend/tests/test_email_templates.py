@@ -0,0 +1,57 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from app.services import email_templates
+from app.services.email_templates import CompiledTemplate, render_offer_email, render_agreement_email
+from app.services.email_service import email_client
+
+
+def test_compiled_template_render_and_partial():
+    tpl = CompiledTemplate("<h1>{company}</h1><p>{body}</p><a href='{url}'>{company}</a>")
+    assert tpl.fields == ("company", "body", "url", "company")
+
+    partial = tpl.partial(company="Acme")
+    assert partial.fields == ("body", "url")
+    assert partial.render(body="Hi", url="/x") == "<h1>Acme</h1><p>Hi</p><a href='/x'>Acme</a>"
+
+
+def test_render_offer_email_html_and_text():
+    rendered = render_offer_email("Acme Corp", "Dear A,<br>Welcome", "Dear A,\nWelcome", "https://x/accept", "https://x/reject")
+    year = str(datetime.now().year)
+
+    assert "Acme Corp" in rendered.html and year in rendered.html
+    assert 'href="https://x/accept"' in rendered.html
+    assert "Dear A,<br>Welcome" in rendered.html
+
+    assert "<" not in rendered.text
+    assert "Dear A,\nWelcome" in rendered.text
+    assert "Accept: https://x/accept" in rendered.text
+    assert f"© {year} Acme Corp" in rendered.text
+
+
+def test_company_templates_are_cached():
+    email_templates._offer_templates.cache_clear()
+    for i in range(5):
+        render_offer_email("Cached Co", f"b{i}", f"b{i}", "a", "r")
+    info = email_templates._offer_templates.cache_info()
+    assert info.misses == 1
+    assert info.hits == 4
+
+
+def test_render_agreement_email():
+    rendered = render_agreement_email("Line 1\nLine 2")
+    assert rendered.html == "Line 1<br>Line 2"
+    assert rendered.text == "Line 1\nLine 2"
+
+
+def test_smtp_offer_has_text_alternative():
+    with patch.object(email_client, "brevo_api_key", ""), \
+         patch.object(email_client.smtp_pool, "send_message") as send:
+        result = email_client.send_offer_letter("c@test.com", "Cand", pdf_content=b"%PDF", company_name="Acme")
+    assert result["status"] == "success"
+
+    msg = send.call_args.args[0]
+    alternative = msg.get_payload()[0]
+    assert alternative.get_content_type() == "multipart/alternative"
+    assert [p.get_content_type() for p in alternative.get_payload()] == ["text/plain", "text/html"]
+    assert msg.get_payload()[1].get_content_type() == "application/pdf"
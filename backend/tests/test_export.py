@@ -0,0 +1,101 @@
+import csv
+import io
+import math
+import os
+import sys
+from datetime import datetime, timezone
+
+import openpyxl
+import pytest
+
+from app.services import export
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+EMPLOYEES = [
+    {
+        "emp_id": "EMP001", "name": "Asha Kumar", "email": "asha@z.com", "designation": "Engineer",
+        "joining_date": datetime(2026, 1, 15, tzinfo=timezone.utc), "status": "Accepted",
+        "compensation": {"ctc": 600000, "basic_salary": 240000.0, "hra": 96000.0, "pf": 28800.0},
+    },
+    {"emp_id": "EMP002", "name": math.nan, "email": "bare@z.com", "joining_date": "2026-02-01", "status": "Pending"},
+]
+
+
+@pytest.fixture
+def employees():
+    mock_db.employees.delete_many({})
+    mock_db.employees.insert_many([dict(doc) for doc in EMPLOYEES])
+    yield
+    mock_db.employees.delete_many({})
+
+
+def test_rows_flatten_compensation():
+    first, second = export.rows(EMPLOYEES, export.EMPLOYEE_COLUMNS)
+    headers = [h for h, _ in export.EMPLOYEE_COLUMNS]
+    assert first[headers.index("Annual CTC (₹)")] == 600000
+    assert first[headers.index("Joining Date")] == datetime(2026, 1, 15).date()
+    assert second[headers.index("Full Name")] is None
+    assert second[headers.index("HRA (Annual) (₹)")] is None
+
+
+def test_csv_is_sent_in_batches():
+    docs = [{"name": f"E{i}", "email": f"e{i}@z.com"} for i in range(25)]
+    chunks = list(export.stream_csv(docs, export.EMPLOYEE_COLUMNS, batch_rows=10))
+    assert len(chunks) == 3
+    text = b"".join(chunks).decode("utf-8-sig")
+    assert len(list(csv.reader(io.StringIO(text)))) == 26
+
+
+def test_formulas_are_not_exported():
+    formula = '=HYPERLINK("http://evil","x")'
+    docs = [{"name": formula, "email": "@SUM(1+1)", "designation": "+1", "department": "-2", "location": "Pune"}]
+    headers = [h for h, _ in export.EMPLOYEE_COLUMNS]
+    text = b"".join(export.stream_csv(docs, export.EMPLOYEE_COLUMNS)).decode("utf-8-sig")
+    record = next(csv.DictReader(io.StringIO(text)))
+    assert record["Full Name"] == "'" + formula
+    assert record["Email Address"] == "'@SUM(1+1)"
+    assert record["Designation"] == "'+1" and record["Department"] == "'-2"
+    assert record["Location"] == "Pune"
+
+    sheet = openpyxl.load_workbook(io.BytesIO(b"".join(export.stream_xlsx(docs, export.EMPLOYEE_COLUMNS, "E")))).active
+    row = list(sheet.values)[1]
+    assert row[headers.index("Full Name")] == "'" + formula
+    assert sheet.cell(row=2, column=headers.index("Full Name") + 1).data_type == "s"
+
+
+def test_export_csv(client, employees):
+    res = client.get("/employees/export?format=csv")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    assert "attachment; filename=Employees_" in res.headers["content-disposition"]
+    records = list(csv.DictReader(io.StringIO(res.content.decode("utf-8-sig"))))
+    assert records[0]["Full Name"] == "Asha Kumar"
+    assert records[0]["Joining Date"] == "2026-01-15"
+    assert float(records[0]["PF (Annual) (₹)"]) == 28800.0
+    assert records[1]["Full Name"] == "" and records[1]["Joining Date"] == "2026-02-01"
+
+
+def test_export_xlsx(client, employees):
+    res = client.get("/employees/export")
+    assert res.status_code == 200
+    sheet = openpyxl.load_workbook(io.BytesIO(res.content)).active
+    values = list(sheet.values)
+    assert values[0][:3] == ("Employee ID", "Full Name", "Email Address")
+    assert values[1][0] == "EMP001" and values[1][9] == 600000
+    assert len(values) == 3
+
+
+def test_export_companies(client):
+    mock_db.companies.delete_many({})
+    client.post("/agreement-companies/", json={"name": "Acme", "email": "hr@acme.com", "percentage": 8.33})
+    res = client.get("/agreement-companies/export?format=csv")
+    records = list(csv.DictReader(io.StringIO(res.content.decode("utf-8-sig"))))
+    assert len(records) == 1
+    assert records[0]["Company Name"] == "Acme"
+    assert records[0]["Email Contact"] == "hr@acme.com"
+    assert records[0]["Compensation %"] == "8.33"
+    assert records[0]["Status"] == "Pending"
+    assert client.get("/agreement-companies/export?format=pdf").status_code == 400
+    mock_db.companies.delete_many({})
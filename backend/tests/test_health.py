@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from app.services import health
+from app.services.health import HealthMonitor, health_monitor
+
+
+def _fail():
+    raise RuntimeError("connection refused")
+
+
+@pytest.fixture
+def snapshot():
+    saved = health_monitor._results
+    yield
+    health_monitor._results = saved
+
+
+def test_livez(client):
+    res = client.get("/livez")
+    assert res.status_code == 200
+    assert res.json() == {"status": "alive"}
+
+
+def test_readyz_before_first_check(client, snapshot):
+    health_monitor._results = {}
+    res = client.get("/readyz")
+    assert res.status_code == 503
+    assert res.json()["status"] == "starting"
+
+
+def test_readyz_serves_cached_snapshot(client, snapshot, monkeypatch):
+    calls = []
+    monitor = HealthMonitor(checks={"mongo": (lambda: calls.append(1), True), "llm": (_fail, False)})
+    monitor.refresh()
+    monkeypatch.setattr("app.main.health_monitor", monitor)
+
+    for _ in range(5):
+        res = client.get("/readyz")
+    assert len(calls) == 1
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "degraded"
+    assert body["checks"]["mongo"]["status"] == "ok"
+    assert body["checks"]["llm"]["error"] == "connection refused"
+    assert body["checks"]["llm"]["age_seconds"] >= 0
+    assert client.get("/health").json()["database"] == "connected"
+
+
+def test_critical_failure_is_not_ready():
+    monitor = HealthMonitor(checks={"mongo": (_fail, True)})
+    monitor.refresh()
+    ready, report = monitor.readiness()
+    assert not ready
+    assert report["status"] == "not_ready"
+
+
+def test_stale_snapshot_is_not_ready():
+    monitor = HealthMonitor(checks={"mongo": (lambda: None, True)}, stale_after=0.01)
+    monitor.refresh()
+    assert monitor.readiness()[0]
+    time.sleep(0.02)
+    ready, report = monitor.readiness()
+    assert not ready
+    assert report["checks"]["mongo"]["stale"]
+
+
+def test_background_thread_refreshes():
+    calls = []
+    monitor = HealthMonitor(checks={"mongo": (lambda: calls.append(1), True)}, interval=0.01)
+    monitor.start()
+    try:
+        deadline = time.time() + 2
+        while len(calls) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.stop()
+    assert len(calls) >= 3
+
+
+def test_health_does_not_ping_database(client, snapshot, monkeypatch):
+    monkeypatch.setattr(health, "check_mongo", _fail)
+    health_monitor._results = {}
+    res = client.get("/health")
+    assert res.json() == {"status": "running", "message": "API is live", "database": "unknown"}
+
+
+def test_disabled_monitor_does_not_block_readiness(client, monkeypatch):
+    monitor = HealthMonitor(checks={"mongo": (_fail, True)})
+    monitor.disable()
+    monkeypatch.setattr("app.main.health_monitor", monitor)
+
+    res = client.get("/readyz")
+    assert res.status_code == 200
+    assert res.json()["status"] == "ready"
+    assert res.json()["monitored"] is False
+    assert client.get("/health").json()["database"] == "not monitored"
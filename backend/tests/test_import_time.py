@@ -0,0 +1,83 @@
+"""
+Cold-start guard: imports app.main in a fresh interpreter under `-X importtime` and fails
+if a heavy dependency is loaded eagerly again or the whole import blows its budget.
+Run with `-s` to see the slowest imports.
+"""
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = float(os.getenv("APP_IMPORT_BUDGET_MS", "3000"))
+
+# Loaded on first use only (see app/lazy.py)
+DEFERRED = ("pandas", "openpyxl", "fitz", "pymupdf", "PIL", "pyinstrument", "docx")
+
+
+def _importtime(module, extra_path=None):
+    """{module: cumulative microseconds} plus stdout for a fresh `import module`."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    if extra_path:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(extra_path), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            timings[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return timings, proc.stdout
+
+
+_REPORT = None
+
+
+def _report():
+    global _REPORT
+    if _REPORT is None:
+        _REPORT = _importtime("app.main")
+    return _REPORT
+
+
+def test_heavy_dependencies_are_deferred():
+    timings, _ = _report()
+    eager = [name for name in timings if name.split(".")[0] in DEFERRED]
+    assert not eager, f"imported at startup: {sorted(set(n.split('.')[0] for n in eager))}"
+
+
+def test_email_clients_are_not_built_at_import():
+    code = (
+        "import app.main\n"
+        "from app.services.email_service import email_client\n"
+        "from app.services.agreement_email_service import agreement_email_client\n"
+        "print([object.__getattribute__(c, '_target') is None for c in (email_client, agreement_email_client)])"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().splitlines()[-1] == "[True, True]"
+
+
+def test_app_import_within_budget():
+    timings, _ = _report()
+    total_ms = timings["app.main"] / 1000
+    slowest = sorted(((us, name) for name, us in timings.items() if name.startswith("app.")), reverse=True)[:10]
+    print(f"\napp.main imported in {total_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)")
+    for us, name in slowest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    assert total_ms < BUDGET_MS
+
+
+def test_optional_packages_do_not_change_what_loads(tmp_path):
+    # With htmldocx installed, python-docx must still wait for the first DOCX download
+    (tmp_path / "htmldocx").mkdir()
+    (tmp_path / "htmldocx" / "__init__.py").write_text("from docx import Document\n\nclass HtmlToDocx:\n    pass\n")
+    timings, _ = _importtime("app.main", extra_path=tmp_path)
+    assert "htmldocx" not in timings
+    assert not [name for name in timings if name.split(".")[0] == "docx"]
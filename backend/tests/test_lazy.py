@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from app.lazy import lazy_import, lazy_object, lazy_optional
+
+
+class Service:
+    built = 0
+
+    def __init__(self):
+        Service.built += 1
+        self.key = "real"
+
+    def send(self):
+        return "sent"
+
+
+def test_lazy_object_builds_once_on_first_use():
+    Service.built = 0
+    proxy = lazy_object(Service)
+    assert Service.built == 0
+    assert proxy.send() == "sent"
+    assert proxy.key == "real"
+    assert Service.built == 1
+
+
+def test_lazy_object_supports_patch_object():
+    proxy = lazy_object(Service)
+    with patch.object(proxy, "send", return_value="mocked"), patch.object(proxy, "key", "test"):
+        assert proxy.send() == "mocked"
+        assert proxy.key == "test"
+    assert proxy.send() == "sent"
+    assert proxy.key == "real"
+
+
+def test_lazy_import_and_optional():
+    json = lazy_import("json")
+    assert json.dumps([1]) == "[1]"
+    assert lazy_optional("no_such_package_xyz") is None
+    assert lazy_optional("json.decoder").JSONDecodeError
@@ -0,0 +1,78 @@
+import io
+import sys
+import os
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.services import metrics
+from app.services.ai_service import ai_engine
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client):
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds" in res.text
+    assert "http_requests_in_flight" in res.text
+
+
+def test_requests_are_labelled_by_route_template(client):
+    labels = {"method": "GET", "route": "/employees/{employee_id}", "status": "404"}
+    before = _value("http_request_duration_seconds_count", **labels)
+    for _ in range(3):
+        client.get(f"/employees/{ObjectId()}")
+    assert _value("http_request_duration_seconds_count", **labels) == before + 3
+
+
+def test_unmatched_paths_share_one_series(client):
+    labels = {"method": "GET", "route": metrics.UNMATCHED_ROUTE, "status": "404"}
+    before = _value("http_request_duration_seconds_count", **labels)
+    client.get("/no-such-route-a")
+    client.get("/no-such-route-b")
+    assert _value("http_request_duration_seconds_count", **labels) == before + 2
+
+
+def test_in_flight_gauge_returns_to_zero(client):
+    client.get("/livez")
+    assert _value("http_requests_in_flight") == 0
+
+
+def test_llm_fallback_is_counted(monkeypatch):
+    import requests
+
+    def refuse(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr("app.services.ai_service.requests.post", refuse)
+    before = _value("llm_fallbacks_total", reason="unavailable")
+    ai_engine.generate_letter({"name": "A", "company_name": "Acme"}, "offer")
+    assert _value("llm_fallbacks_total", reason="unavailable") == before + 1
+    assert _value("llm_request_duration_seconds_count", outcome="unavailable") >= 1
+
+
+def test_mongo_listener_times_commands():
+    timer = metrics.MongoCommandTimer()
+    before = _value("mongo_command_duration_seconds_count", command="find", collection="employees", outcome="ok")
+    timer.started(SimpleNamespace(command={"find": "employees"}, command_name="find", connection_id=("h", 1), request_id=7))
+    timer.succeeded(SimpleNamespace(command_name="find", connection_id=("h", 1), request_id=7, duration_micros=1500))
+    assert _value("mongo_command_duration_seconds_count", command="find", collection="employees", outcome="ok") == before + 1
+    assert timer._collections == {}
+
+
+def test_import_rows_are_counted(client):
+    mock_db.employees.delete_many({})
+    before = _value("import_rows_total", kind="employees", outcome="imported")
+    csv = "Full Name,Email Address,Annual CTC (₹)\nA,a@metrics.test,600000\nB,b@metrics.test,700000\n"
+    res = client.post("/employees/upload", files={"file": ("staff.csv", io.BytesIO(csv.encode()), "text/csv")})
+    assert res.json()["imported_count"] == 2
+    assert _value("import_rows_total", kind="employees", outcome="imported") == before + 2
+    assert _value("import_duration_seconds_count", kind="employees") >= 1
@@ -0,0 +1,142 @@
+import asyncio
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.services import offer_funnel, offer_tokens, outbox
+from app.services.outbox import OutboxWorker
+from app.routes.employee import expire_overdue_offers
+from tests.async_mongomock import AsyncDatabase
+
+
+@pytest.fixture(autouse=True)
+def empty_rollups():
+    mock_db.offer_funnel.delete_many({})
+    mock_db.email_outbox.delete_many({})
+
+
+def _send_offer(client, department="Funnel QA", designation="Analyst"):
+    emp_id = str(mock_db.employees.insert_one({
+        "name": "Funnel", "email": "funnel@test.com", "status": "Pending",
+        "department": department, "designation": designation,
+    }).inserted_id)
+    client.post("/email/send", json={"employee_id": emp_id, "letter_content": "x", "company_name": "Funnel Corp"})
+    with patch.object(outbox.email_client, "send_offer_letter", return_value={"status": "success"}):
+        assert OutboxWorker(mock_db).process_once() is True
+    return emp_id
+
+
+def _bucket(emp_id):
+    return mock_db.employees.find_one({"_id": ObjectId(emp_id)})["funnel_bucket"]
+
+
+def _counts(emp_id):
+    return mock_db.offer_funnel.find_one({"_id": offer_funnel.bucket_id(_bucket(emp_id))})
+
+
+def test_send_and_accept_increment_the_same_bucket(client):
+    emp_id = _send_offer(client)
+    bucket = _bucket(emp_id)
+    assert bucket["company"] == "Funnel Corp"
+    assert bucket["week"] == offer_funnel.week_of(datetime.now(timezone.utc))
+    assert _counts(emp_id)["sent"] == 1
+
+    token = offer_tokens.issue(emp_id, "Funnel Corp", offer_tokens.next_token_version(mock_db, emp_id))
+    client.get(f"/offer/accept?token={token}")
+    client.get(f"/offer/reject?token={token}")  # already responded; must not count
+
+    counts = _counts(emp_id)
+    assert counts["accepted"] == 1
+    assert counts.get("rejected", 0) == 0
+
+
+def test_expiry_is_counted_once(client):
+    emp_id = _send_offer(client, department="Funnel Expiry")
+    mock_db.employees.update_one(
+        {"_id": ObjectId(emp_id)},
+        {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(hours=1)}}
+    )
+    client.get("/employees/")
+    client.get("/employees/")
+    assert _counts(emp_id)["expired"] == 1
+
+
+def test_concurrent_sweeps_count_expiry_once(client):
+    emp_id = _send_offer(client, department="Funnel Sweep Race")
+    mock_db.employees.update_one(
+        {"_id": ObjectId(emp_id)},
+        {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(hours=1)}}
+    )
+    # The delay makes both sweeps find the offer before either one expires it
+    db = AsyncDatabase(mock_db, delay=0.01)
+
+    async def race():
+        await asyncio.gather(expire_overdue_offers(db), expire_overdue_offers(db))
+
+    asyncio.run(race())
+    assert mock_db.employees.find_one({"_id": ObjectId(emp_id)})["status"] == "Rejected"
+    assert _counts(emp_id)["expired"] == 1
+
+
+def test_backfill_rebuilds_rollups(client):
+    accepted = _send_offer(client, department="Funnel Backfill")
+    declined = _send_offer(client, department="Funnel Backfill")
+    mock_db.employees.update_one({"_id": ObjectId(accepted)}, {"$set": {"status": "Accepted"}})
+    mock_db.employees.update_one({"_id": ObjectId(declined)}, {"$set": {"status": "Rejected"}})
+    mock_db.offer_funnel.delete_many({})
+
+    assert client.post("/analytics/offers/backfill").json()["status"] == "success"
+    counts = _counts(accepted)
+    assert (counts["sent"], counts["accepted"], counts["rejected"], counts["expired"]) == (2, 1, 1, 0)
+
+
+def test_backfill_swaps_in_complete_rollups(client):
+    _send_offer(client, department="Funnel Swap")
+    stale = {"company": "Gone Co", "department": "Gone", "designation": "Dev", "week": "2020-W01"}
+    offer_funnel.record(mock_db, stale, "sent")
+
+    class Watched:
+        # The live rollups must stay readable while the replacement is written
+        def __init__(self, collection):
+            self.collection = collection
+
+        def insert_many(self, docs):
+            assert mock_db.offer_funnel.count_documents({}) > 0
+            return self.collection.insert_many(docs)
+
+        def __getattr__(self, name):
+            return getattr(self.collection, name)
+
+    class WatchedDb:
+        def __getitem__(self, name):
+            return Watched(mock_db[name]) if name.startswith("offer_funnel") else mock_db[name]
+
+        def __getattr__(self, name):
+            return self[name]
+
+    assert offer_funnel.backfill(WatchedDb()) > 0
+    assert mock_db.offer_funnel.find_one({"_id": offer_funnel.bucket_id(stale)}) is None
+    assert mock_db.offer_funnel.find_one({"department": "Funnel Swap"})["sent"] == 1
+    assert not [name for name in mock_db.list_collection_names() if name.startswith("offer_funnel_rebuild_")]
+
+
+def test_summary_endpoint_groups_and_rates(client):
+    for dept, event in (("Eng", "accepted"), ("Eng", "rejected"), ("Ops", "expired")):
+        bucket = {"company": "Rate Co", "department": dept, "designation": "Dev", "week": "2026-W10"}
+        offer_funnel.record(mock_db, bucket, "sent")
+        offer_funnel.record(mock_db, bucket, event)
+
+    data = client.get("/analytics/offers?group_by=department&company=Rate Co").json()
+    assert data["totals"]["sent"] == 3
+    eng = next(r for r in data["rows"] if r["department"] == "Eng")
+    assert eng["acceptance_rate"] == 0.5
+    assert eng["pending"] == 0
+
+    assert client.get("/analytics/offers?group_by=salary").status_code == 400
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.routes import offer_response
+from app.services import offer_tokens
+
+
+def _make_offer(status="Offer Sent", expires_in_hours=20):
+    doc = {"name": "Race Candidate", "email": "race@test.com", "status": status}
+    if expires_in_hours is not None:
+        doc["expires_at"] = datetime.now(timezone.utc) + timedelta(hours=expires_in_hours)
+    emp_id = str(mock_db.employees.insert_one(doc).inserted_id)
+    version = offer_tokens.next_token_version(mock_db, emp_id)
+    return emp_id, offer_tokens.issue(emp_id, "Race Corp", version)
+
+
+def test_happy_path_is_one_round_trip():
+    emp_id = str(ObjectId())
+    token = offer_tokens.issue(emp_id, "Race Corp", 1)
+    db = MagicMock()
+    db.employees.find_one_and_update = AsyncMock(return_value={"_id": ObjectId(emp_id), "name": "Solo"})
+    db.employees.find_one = AsyncMock()
+    db.offer_tokens.find_one = AsyncMock()
+    db.offer_funnel.update_one = AsyncMock()
+
+    res = asyncio.run(offer_response._respond(db, token, "accepted"))
+    assert res.status_code == 200
+    assert db.employees.find_one_and_update.call_count == 1
+    db.employees.find_one.assert_not_called()
+    db.offer_tokens.find_one.assert_not_called()
+
+    query = db.employees.find_one_and_update.call_args.args[0]
+    assert query["status"] == "Offer Sent"
+    assert query["offer_token_version"] == 1
+
+
+def test_concurrent_clicks_have_one_winner(client):
+    emp_id, token = _make_offer()
+    urls = [f"/offer/{'accept' if i % 2 else 'reject'}?token={token}" for i in range(20)]
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        responses = list(pool.map(client.get, urls))
+
+    assert all(r.status_code == 200 for r in responses)
+    winners = [r for r in responses if "Already Responded" not in r.text]
+    assert len(winners) == 1
+
+    final = mock_db.employees.find_one({"_id": ObjectId(emp_id)})
+    expected = "Accepted" if "Offer Accepted!" in winners[0].text else "Rejected"
+    assert final["status"] == expected
+
+
+def test_expired_offer_is_marked_and_shows_invalid(client):
+    emp_id, token = _make_offer(expires_in_hours=-1)
+    res = client.get(f"/offer/accept?token={token}")
+    assert res.status_code == 200
+    assert "Invalid or Expired" in res.text
+    emp = mock_db.employees.find_one({"_id": ObjectId(emp_id)})
+    assert emp["status"] == "Rejected"
+    assert emp["rejection_reason"] == "Offer Expired (24h)"
+
+
+def test_second_click_sees_already_responded(client):
+    emp_id, token = _make_offer()
+    assert "Offer Accepted!" in client.get(f"/offer/accept?token={token}").text
+    res = client.get(f"/offer/reject?token={token}")
+    assert "Already Responded" in res.text
+    assert mock_db.employees.find_one({"_id": ObjectId(emp_id)})["status"] == "Accepted"
+
+
+def test_offer_without_expiry_can_be_answered(client):
+    emp_id, token = _make_offer(expires_in_hours=None)
+    assert "Offer Declined" in client.get(f"/offer/reject?token={token}").text
+
+
+def test_pending_employee_cannot_respond(client):
+    emp_id, token = _make_offer(status="Pending")
+    assert client.get(f"/offer/accept?token={token}").status_code == 404
+    assert mock_db.employees.find_one({"_id": ObjectId(emp_id)})["status"] == "Pending"
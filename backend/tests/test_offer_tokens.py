@@ -0,0 +1,76 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.services import offer_tokens
+
+
+@pytest.fixture
+def offer():
+    res = mock_db.employees.insert_one({
+        "name": "Signed Candidate",
+        "email": "signed@test.com",
+        "status": "Offer Sent",
+        "expires_at": datetime.now(timezone.utc) + timedelta(hours=20),
+    })
+    emp_id = str(res.inserted_id)
+    version = offer_tokens.next_token_version(mock_db, emp_id)
+    return emp_id, offer_tokens.issue(emp_id, "Signed Corp", version)
+
+
+def test_issue_and_verify_roundtrip():
+    emp_id = str(ObjectId())
+    claims = offer_tokens.verify(offer_tokens.issue(emp_id, "Acme", 3))
+    assert claims.employee_id == emp_id
+    assert claims.company_name == "Acme"
+    assert claims.version == 3
+    assert claims.expires_at > datetime.now(timezone.utc)
+
+
+def test_tampered_and_expired_tokens_are_rejected():
+    token = offer_tokens.issue(str(ObjectId()), "Acme", 1)
+    payload, signature = token.split(".")
+    other_payload = offer_tokens.issue(str(ObjectId()), "Acme", 1).split(".")[0]
+
+    assert offer_tokens.verify(f"{other_payload}.{signature}") is None
+    assert offer_tokens.verify(f"{payload}.{signature[:-2]}xx") is None
+    assert offer_tokens.verify("not.valid") is None
+    assert offer_tokens.verify(offer_tokens.issue(str(ObjectId()), "Acme", 1, ttl_hours=-1)) is None
+
+
+def test_next_token_version_increments():
+    emp_id = str(mock_db.employees.insert_one({"name": "V"}).inserted_id)
+    assert offer_tokens.next_token_version(mock_db, emp_id) == 1
+    assert offer_tokens.next_token_version(mock_db, emp_id) == 2
+
+
+def test_accept_with_signed_token_needs_no_token_collection(client, offer):
+    emp_id, token = offer
+    mock_db.offer_tokens.delete_many({})
+    res = client.get(f"/offer/accept?token={token}")
+    assert res.status_code == 200
+    assert "Accepted!" in res.text
+    assert "Signed Corp" in res.text
+    assert mock_db.employees.find_one({"_id": ObjectId(emp_id)})["status"] == "Accepted"
+
+
+def test_reissued_offer_revokes_old_link(client, offer):
+    emp_id, old_token = offer
+    offer_tokens.next_token_version(mock_db, emp_id)
+
+    res = client.get(f"/offer/reject?token={old_token}")
+    assert res.status_code == 404
+    assert mock_db.employees.find_one({"_id": ObjectId(emp_id)})["status"] == "Offer Sent"
+
+
+def test_forged_token_is_invalid(client, offer):
+    _, token = offer
+    res = client.get(f"/offer/accept?token={token[:-3]}abc")
+    assert res.status_code == 404
+    assert "Invalid" in res.text
@@ -0,0 +1,196 @@
+import sys
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+from bson import ObjectId
+
+from app.services import offer_tokens, outbox
+from app.services.brevo_client import brevo_client
+from app.services.outbox import OutboxWorker, TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox():
+    mock_db.email_outbox.delete_many({})
+
+
+@pytest.fixture
+def employee_id():
+    return str(mock_db.employees.insert_one({"name": "Queued", "email": "q@test.com", "status": "Pending"}).inserted_id)
+
+
+@pytest.fixture
+def company_id():
+    return str(mock_db.companies.insert_one({"name": "Queued Corp", "email": "qc@test.com", "status": "Pending"}).inserted_id)
+
+
+def test_send_enqueues_and_returns_202(client, employee_id):
+    res = client.post("/email/send", json={"employee_id": employee_id, "letter_content": "x", "pdf_base64": "data:application/pdf;base64,SGVsbG8="})
+    assert res.status_code == 202
+    data = res.json()
+    assert data["status"] == "queued"
+
+    doc = mock_db.email_outbox.find_one({"_id": ObjectId(data["message_id"])})
+    assert doc["kind"] == "offer"
+    assert bytes(doc["pdf"]) == b"Hello"
+    assert doc["message"]["recipient_email"] == "q@test.com"
+    # Status is only changed once the worker actually delivers
+    assert mock_db.employees.find_one({"_id": ObjectId(employee_id)})["status"] == "Pending"
+
+
+def test_expired_lease_counts_as_attempt(employee_id):
+    outbox.enqueue(mock_db, outbox.KIND_OFFER, employee_id, {"recipient_email": "q@test.com", "candidate_name": "Q"})
+    worker = OutboxWorker(mock_db, max_attempts=2)
+    stale = datetime.now(timezone.utc) - timedelta(seconds=outbox.OUTBOX_LEASE_SECONDS + 1)
+
+    mock_db.email_outbox.update_many({}, {"$set": {"status": "sending", "locked_at": stale}})
+    worker._recover_stale()
+    doc = mock_db.email_outbox.find_one()
+    assert doc["status"] == "queued"
+    assert doc["attempts"] == 1
+
+    # The worker dies on it again: that was the last attempt
+    mock_db.email_outbox.update_many({}, {"$set": {"status": "sending", "locked_at": stale}})
+    worker._last_recovery = 0
+    worker._recover_stale()
+    doc = mock_db.email_outbox.find_one()
+    assert doc["status"] == "failed"
+    assert doc["attempts"] == 2
+    assert "lease expired" in doc["last_error"]
+
+
+def test_worker_delivers_and_updates_employee(client, employee_id):
+    message_id = client.post("/email/send", json={"employee_id": employee_id, "letter_content": "x"}).json()["message_id"]
+
+    with patch.object(outbox.email_client, "send_offer_letter", return_value={"status": "success"}) as send:
+        assert OutboxWorker(mock_db).process_once() is True
+    assert send.call_args.kwargs["employee_id"] == employee_id
+
+    emp = mock_db.employees.find_one({"_id": ObjectId(employee_id)})
+    assert emp["status"] == "Offer Sent"
+    assert emp["expires_at"] > emp["sent_at"]
+
+    msg = client.get(f"/email/outbox/{message_id}").json()
+    assert msg["status"] == "sent"
+    assert msg["attempts"] == 1
+
+
+def test_agreement_worker_updates_company(client, company_id):
+    res = client.post("/agreement-email/send", json={"employee_id": company_id, "letter_content": "x"})
+    assert res.status_code == 202
+
+    with patch.object(outbox.agreement_email_client, "send_agreement", return_value={"status": "success"}):
+        OutboxWorker(mock_db).process_once()
+    assert mock_db.companies.find_one({"_id": ObjectId(company_id)})["status"] == "Agreement Sent"
+
+
+def test_failed_delivery_is_retried_then_given_up(employee_id):
+    outbox.enqueue(mock_db, outbox.KIND_OFFER, employee_id, {"recipient_email": "q@test.com", "candidate_name": "Q"})
+    worker = OutboxWorker(mock_db, max_attempts=2)
+
+    failure = {"status": "error", "message": "boom", "retryable": True}
+    with patch.object(outbox.email_client, "send_offer_letter", return_value=failure):
+        worker.process_once()
+        doc = mock_db.email_outbox.find_one()
+        assert doc["status"] == "queued"
+        assert doc["next_attempt_at"].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        # Not due yet
+        assert worker.process_once() is False
+
+        mock_db.email_outbox.update_one({"_id": doc["_id"]}, {"$set": {"next_attempt_at": datetime.now(timezone.utc) - timedelta(seconds=1)}})
+        worker.process_once()
+
+    doc = mock_db.email_outbox.find_one()
+    assert doc["status"] == "failed"
+    assert doc["attempts"] == 2
+    assert doc["last_error"] == "boom"
+    assert mock_db.employees.find_one({"_id": ObjectId(employee_id)})["status"] == "Pending"
+
+
+def _brevo_response(status):
+    res = MagicMock()
+    res.status_code = status
+    res.text = ""
+    return res
+
+
+def _due(doc):
+    mock_db.email_outbox.update_one({"_id": doc["_id"]}, {"$set": {"next_attempt_at": datetime.now(timezone.utc) - timedelta(seconds=1)}})
+
+
+def test_ambiguous_failure_is_not_resent(employee_id):
+    outbox.enqueue(mock_db, outbox.KIND_OFFER, employee_id, {"recipient_email": "q@test.com", "candidate_name": "Q"})
+    worker = OutboxWorker(mock_db)
+
+    # Brevo may have queued the email before answering 5xx
+    with patch.object(outbox.email_client, "brevo_api_key", "test-key"), \
+         patch.object(brevo_client, "send_email", return_value=_brevo_response(503)) as send:
+        worker.process_once()
+        _due(mock_db.email_outbox.find_one())
+        assert worker.process_once() is False
+
+    assert send.call_count == 1
+    doc = mock_db.email_outbox.find_one()
+    assert doc["status"] == "failed"
+    assert doc["attempts"] == 1
+
+
+def test_retries_reuse_the_token_version(employee_id):
+    outbox.enqueue(mock_db, outbox.KIND_OFFER, employee_id, {"recipient_email": "q@test.com", "candidate_name": "Q"})
+    worker = OutboxWorker(mock_db)
+
+    with patch.object(outbox.email_client, "brevo_api_key", "test-key"), \
+         patch.object(brevo_client, "send_email", side_effect=[_brevo_response(429), _brevo_response(201)]) as send:
+        worker.process_once()
+        _due(mock_db.email_outbox.find_one())
+        worker.process_once()
+
+    assert mock_db.email_outbox.find_one()["status"] == "sent"
+    versions = [
+        offer_tokens.verify(re.search(r"token=([\w.-]+)", call.args[1]["htmlContent"]).group(1)).version
+        for call in send.call_args_list
+    ]
+    assert len(versions) == 2 and versions[0] == versions[1]
+    assert mock_db.employees.find_one({"_id": ObjectId(employee_id)})["offer_token_version"] == versions[0]
+
+
+def test_offer_expiry_follows_the_token_ttl(employee_id):
+    outbox.enqueue(mock_db, outbox.KIND_OFFER, employee_id, {"recipient_email": "q@test.com", "candidate_name": "Q"})
+    with patch.object(offer_tokens, "TOKEN_TTL_HOURS", 48), \
+         patch.object(outbox.email_client, "brevo_api_key", "test-key"), \
+         patch.object(brevo_client, "send_email", return_value=_brevo_response(201)) as send:
+        OutboxWorker(mock_db).process_once()
+
+    emp = mock_db.employees.find_one({"_id": ObjectId(employee_id)})
+    assert emp["expires_at"] - emp["sent_at"] == timedelta(hours=48)
+    token = re.search(r"token=([\w.-]+)", send.call_args.args[1]["htmlContent"]).group(1)
+    link_expiry = offer_tokens.verify(token).expires_at
+    assert abs(link_expiry - emp["expires_at"].replace(tzinfo=timezone.utc)) < timedelta(minutes=1)
+
+
+def test_outbox_status(client, employee_id):
+    for _ in range(3):
+        client.post("/email/send", json={"employee_id": employee_id, "letter_content": "x"})
+    with patch.object(outbox.email_client, "send_offer_letter", return_value={"status": "success"}):
+        OutboxWorker(mock_db).process_once()
+
+    data = client.get("/email/outbox/status").json()
+    assert data["queue_depth"] == 2
+    assert data["by_status"]["sent"] == 1
+    assert data["delivery_latency_ms"]["count"] == 1
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.monotonic()
+    for _ in range(7):
+        bucket.acquire()
+    # 2 from the burst, 5 more at 50/s
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,98 @@
+import time
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mongomock import MongoClient
+
+from app.services import profiling
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_ADMIN_TOKEN", TOKEN)
+
+
+def _profiled_app(store, sample_rate=0):
+    db = MongoClient().ProfileDB
+    db.rows.insert_many([{"n": i} for i in range(2000)])
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        deadline = time.perf_counter() + 0.03
+        while time.perf_counter() < deadline:
+            list(db.rows.find({"n": {"$gte": 0}}))
+        deadline = time.perf_counter() + 0.03
+        while time.perf_counter() < deadline:
+            pd.DataFrame({"a": range(20000)}).describe()
+        return {"ok": True}
+
+    app.add_middleware(profiling.ProfilingMiddleware, store=store, sample_rate=sample_rate)
+    return TestClient(app)
+
+
+def test_not_installed_unless_configured(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_ADMIN_TOKEN", "")
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0)
+    assert not profiling.enabled()
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0.01)
+    assert profiling.enabled()
+
+
+def test_admin_header_profiles_request(admin):
+    store = profiling.ProfileStore(keep=5, directory="")
+    client = _profiled_app(store)
+
+    assert "x-profile-id" not in client.get("/work").headers
+    res = client.get("/work", headers={"X-Profile-Token": TOKEN})
+    profile_id = res.headers["x-profile-id"]
+    summary, html = store.get(profile_id)
+    assert summary["path"] == "/work"
+    assert summary["route"] == "/work"
+    assert summary["status"] == 200
+    assert summary["breakdown_ms"]["mongo"] > 0
+    assert summary["breakdown_ms"]["pandas"] > 0
+    assert "<html" in html.lower()
+
+
+def test_wrong_token_is_not_profiled(admin):
+    store = profiling.ProfileStore(keep=5, directory="")
+    res = _profiled_app(store).get("/work", headers={"X-Profile-Token": "nope"})
+    assert "x-profile-id" not in res.headers
+    assert store.summaries() == []
+
+
+def test_sampling_rate_profiles_without_header():
+    store = profiling.ProfileStore(keep=5, directory="")
+    res = _profiled_app(store, sample_rate=1.0).get("/work")
+    assert store.get(res.headers["x-profile-id"]) is not None
+
+
+def test_store_keeps_most_recent(tmp_path):
+    store = profiling.ProfileStore(keep=2, directory=str(tmp_path))
+    for i in range(3):
+        store.add(f"p{i}", {"id": f"p{i}"}, "<html></html>")
+    assert [s["id"] for s in store.summaries()] == ["p2", "p1"]
+    assert store.get("p0") is None
+    assert (tmp_path / "p0.html").exists()
+
+
+def test_profile_routes_require_admin(client, admin, monkeypatch):
+    store = profiling.ProfileStore(keep=5, directory="")
+    store.add("abc", {"id": "abc", "breakdown_ms": {}}, "<html>report</html>")
+    monkeypatch.setattr(profiling, "profile_store", store)
+
+    assert client.get("/debug/profiles/").status_code == 403
+    headers = {"X-Profile-Token": TOKEN}
+    assert client.get("/debug/profiles/", headers=headers).json() == {"profiles": [{"id": "abc", "breakdown_ms": {}}]}
+    assert client.get("/debug/profiles/abc", headers=headers).text == "<html>report</html>"
+    assert client.get("/debug/profiles/abc?format=json", headers=headers).json()["id"] == "abc"
+    assert client.get("/debug/profiles/missing", headers=headers).status_code == 404
+
+
+def test_profile_routes_hidden_without_token(client):
+    assert client.get("/debug/profiles/", headers={"X-Profile-Token": "x"}).status_code == 404
@@ -0,0 +1,79 @@
+import gzip
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from app.services import offer_tokens, response_pages
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+
+def test_result_page_interpolates_and_escapes():
+    html = response_pages.result_page("accepted", "Tom & Jerry", "Acme")
+    assert "Offer Accepted!" in html
+    assert "Tom &amp; Jerry" in html
+    assert "Welcome to <strong>Acme</strong>" in html
+    assert response_pages.CSS_PATH in html
+    assert "fonts.googleapis" not in html
+
+
+def test_already_responded_page():
+    html = response_pages.already_responded_page("Rejected", "Ann", "Acme")
+    assert "Already Responded" in html
+    assert "<strong>declined</strong>" in html
+
+
+def test_invalid_page_is_prerendered_and_gzipped(client):
+    res = client.get("/offer/accept?token=not-a-real-token", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 404
+    assert "Invalid or Expired Link" in res.text
+    assert res.headers["content-encoding"] == "gzip"
+    assert "max-age" in res.headers["cache-control"]
+    assert gzip.decompress(response_pages.INVALID_PAGE_GZIP) == response_pages.INVALID_PAGE
+
+
+def test_invalid_page_from_offer_state_is_not_cached(client):
+    # The email went out but the "Offer Sent" status hasn't been written yet
+    emp_id = str(mock_db.employees.insert_one({"name": "Early", "email": "early@test.com", "status": "Pending"}).inserted_id)
+    token = offer_tokens.issue(emp_id, "Acme", offer_tokens.next_token_version(mock_db, emp_id))
+    res = client.get(f"/offer/accept?token={token}")
+    assert res.status_code == 404
+    assert res.headers["cache-control"] == "no-store"
+
+    mock_db.employees.update_one({"_id": ObjectId(emp_id)}, {"$set": {"status": "Offer Sent"}})
+    assert client.get(f"/offer/accept?token={token}").status_code == 200
+    mock_db.employees.delete_one({"_id": ObjectId(emp_id)})
+
+
+def test_stylesheet_is_cacheable(client):
+    res = client.get(response_pages.CSS_PATH)
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/css")
+    assert "immutable" in res.headers["cache-control"]
+
+    etag = res.headers["etag"]
+    assert client.get(response_pages.CSS_PATH, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/offer/assets/response-old.css").status_code == 404
+
+
+def test_pages_survive_missing_names():
+    for name in (None, float("nan"), "  "):
+        assert "Candidate" in response_pages.result_page("accepted", name, "Acme")
+        assert "Candidate" in response_pages.already_responded_page("Accepted", name, "Acme")
+
+
+def test_accept_with_null_name(client):
+    emp_id = str(mock_db.employees.insert_one({
+        "name": None, "email": "nameless@test.com", "status": "Offer Sent",
+        "expires_at": datetime.now(timezone.utc) + timedelta(hours=1),
+    }).inserted_id)
+    token = offer_tokens.issue(emp_id, "Acme", offer_tokens.next_token_version(mock_db, emp_id))
+    res = client.get(f"/offer/accept?token={token}")
+    assert res.status_code == 200
+    assert "Candidate" in res.text
+    # Answering again renders the already-responded page for the same nameless employee
+    assert client.get(f"/offer/reject?token={token}").status_code == 200
+    mock_db.employees.delete_one({"email": "nameless@test.com"})
@@ -0,0 +1,135 @@
+import asyncio
+import math
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+from app import main
+from app.services import search
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+
+def _employee(name, email, designation, status="Pending", joining_date=None, department="Engineering", company=None):
+    doc = {
+        "name": name, "email": email, "designation": designation, "department": department,
+        "status": status, "joining_date": joining_date,
+    }
+    if company:
+        doc["funnel_bucket"] = {"company": company}
+    doc[search.SEARCH_FIELD] = search.search_keys(doc)
+    return doc
+
+
+@pytest.fixture
+def employees():
+    mock_db.employees.delete_many({})
+    mock_db.employees.insert_many([
+        _employee("Asha Kumar", "asha.k@z.com", "Software Engineer", "Offer Sent", datetime(2026, 1, 15), company="Arah"),
+        _employee("Ravi Kumar", "ravi@z.com", "QA Analyst", "Accepted", "2026-02-01", department="Quality"),
+        _employee("Meera Iyer", "meera@z.com", "Engineering Manager", "Pending", "2025-12-20"),
+    ])
+    yield
+    mock_db.employees.delete_many({})
+
+
+def _names(res):
+    assert res.status_code == 200, res.text
+    return [e["name"] for e in res.json()]
+
+
+def test_search_keys_cover_words_and_full_values():
+    keys = search.search_keys({"name": "Asha Kumar", "email": "Asha.K@Z.com", "designation": math.nan})
+    assert {"asha kumar", "asha", "kumar", "asha.k@z.com", "k", "z", "com"} == set(keys)
+
+
+def test_build_filter_composes_clauses():
+    assert search.build_filter() == {}
+    assert search.build_filter(equals={"status": ["Pending"], "department": None}) == {"status": "Pending"}
+    query = search.build_filter(equals={"status": ["Pending", "Accepted"]}, q="as ku")
+    assert query["$and"][0] == {"status": {"$in": ["Pending", "Accepted"]}}
+    assert [c[search.SEARCH_FIELD]["$regex"] for c in query["$and"][1:]] == ["^as", "^ku"]
+    assert search.build_filter(q="a.*") == {search.SEARCH_FIELD: {"$regex": "^a"}}
+
+
+def test_date_range_matches_datetimes_and_strings():
+    clause = search.date_range("joining_date", date(2026, 1, 1), date(2026, 1, 31))
+    assert clause["$or"][0]["joining_date"] == {"$gte": datetime(2026, 1, 1), "$lt": datetime(2026, 2, 1)}
+    assert clause["$or"][1]["joining_date"] == {"$gte": "2026-01-01", "$lte": "2026-01-31"}
+
+
+def test_sort_spec():
+    assert search.sort_spec(None) == [("_id", 1)]
+    assert search.sort_spec("-name") == [("name", -1), ("_id", -1)]
+    with pytest.raises(ValueError):
+        search.sort_spec("compensation")
+
+
+def test_employee_filters(client, employees):
+    assert _names(client.get("/employees/?q=kum&sort=name")) == ["Asha Kumar", "Ravi Kumar"]
+    assert _names(client.get("/employees/?q=software")) == ["Asha Kumar"]
+    assert _names(client.get("/employees/?q=engin&sort=-name")) == ["Meera Iyer", "Asha Kumar"]
+    assert _names(client.get("/employees/?status=Accepted&status=Pending&sort=name")) == ["Meera Iyer", "Ravi Kumar"]
+    assert _names(client.get("/employees/?department=Quality")) == ["Ravi Kumar"]
+    assert _names(client.get("/employees/?offer_company=Arah")) == ["Asha Kumar"]
+    assert _names(client.get("/employees/?joining_from=2026-01-01&sort=joining_date")) == ["Ravi Kumar", "Asha Kumar"]
+    assert _names(client.get("/employees/?joining_to=2026-01-15&sort=name")) == ["Asha Kumar", "Meera Iyer"]
+    assert _names(client.get("/employees/?sort=name&skip=1&limit=1")) == ["Meera Iyer"]
+    assert client.get("/employees/?sort=salary").status_code == 400
+
+
+def test_company_filters(client):
+    mock_db.companies.delete_many({})
+    for name in ("Acme Corp", "Beta Labs"):
+        client.post("/agreement-companies/", json={"name": name, "email": f"hr@{name.split()[0].lower()}.com", "percentage": 8.33})
+    assert [c["name"] for c in client.get("/agreement-companies/?q=lab").json()] == ["Beta Labs"]
+    assert [c["name"] for c in client.get("/agreement-companies/?company=Acme Corp").json()] == ["Acme Corp"]
+    mock_db.companies.delete_many({})
+
+
+class _BulkCollection:
+    """mongomock's bulk_write predates pymongo 4.13's UpdateOne; apply the ops one by one."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def bulk_write(self, ops, ordered=True):
+        modified = sum(self._collection.update_one(op._filter, op._doc).modified_count for op in ops)
+        return type("Result", (), {"modified_count": modified})()
+
+
+def test_ensure_indexes_backfills_search_keys(employees, monkeypatch):
+    monkeypatch.setattr(search, "BACKFILL_BATCH", 2)
+    mock_db.employees.insert_many([{"name": f"Legacy Person {i}", "email": f"old{i}@z.com"} for i in range(3)])
+    search.ensure_indexes({"employees": _BulkCollection(mock_db.employees), "companies": _BulkCollection(mock_db.companies)})
+    legacy = mock_db.employees.find_one({"email": "old2@z.com"})
+    assert "legacy" in legacy[search.SEARCH_FIELD]
+    assert mock_db.employees.count_documents({search.SEARCH_FIELD: {"$exists": False}}) == 0
+    assert "status_1__id_1" in mock_db.employees.index_information()
+
+
+def test_search_covers_old_documents_with_warmup_disabled(client, employees, monkeypatch):
+    mock_db.employees.insert_one({"name": "Legacy Person", "email": "old@z.com", "status": "Pending"})
+    for flag in ("WARMUP", "HEALTH_MONITOR", "EMAIL_OUTBOX_WORKER"):
+        monkeypatch.setenv(flag, "0")
+    monkeypatch.setattr(main.warmup, "state", main.warmup.state)
+    monkeypatch.setattr(main.health_monitor, "enabled", main.health_monitor.enabled)
+    monkeypatch.setattr(main.database, "db", {"employees": _BulkCollection(mock_db.employees), "companies": _BulkCollection(mock_db.companies)})
+
+    class AsyncClient:
+        async def close(self):
+            pass
+    monkeypatch.setattr(main.database, "async_client", AsyncClient())
+
+    async def start_and_stop():
+        async with main.lifespan(main.app):
+            pass
+
+    asyncio.run(start_and_stop())
+    assert _names(client.get("/employees/?q=legacy")) == ["Legacy Person"]
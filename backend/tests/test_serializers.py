@@ -0,0 +1,67 @@
+import json
+import math
+import os
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+
+from app import schemas
+from app.responses import dumps
+from app.routes.agreement_company import CompanyResponse, company_serializer
+from app.routes.employee import employee_serializer
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+EMPLOYEES = [
+    {
+        "_id": ObjectId(), "emp_id": "EMP001", "name": "Asha", "email": "asha@z.com",
+        "designation": "Engineer", "department": "R&D", "joining_date": datetime(2026, 1, 15),
+        "status": "Offer Sent", "offer_token": "secret", "created_at": datetime(2026, 1, 1, 9, 30),
+        "compensation": {"ctc": 600000, "basic_salary": 25000.5, "pf": 1800},
+    },
+    {"_id": ObjectId(), "email": "bare@z.com"},
+    {"_id": ObjectId(), "email": "none@z.com", "location": None, "compensation": None},
+]
+
+
+def _pydantic(model, doc):
+    return json.loads(model.model_validate({**doc, "id": str(doc["_id"])}).model_dump_json())
+
+
+def test_employee_matches_response_model():
+    for doc in EMPLOYEES:
+        assert json.loads(dumps(employee_serializer.one(doc))) == _pydantic(schemas.Employee, doc)
+
+
+def test_projection_fetches_only_model_fields():
+    assert "offer_token" not in employee_serializer.projection
+    assert employee_serializer.projection["compensation"] == 1
+    assert "id" not in employee_serializer.projection
+
+
+def test_company_matches_sanitized_response_model():
+    doc = {"_id": ObjectId(), "name": "Acme", "email": "hr@acme.com", "compensation": {"percentage": 8.33}}
+    assert json.loads(dumps(company_serializer.one(doc))) == _pydantic(CompanyResponse, doc)
+
+    imported = {"_id": ObjectId(), "name": 42, "email": 9876543210.0, "designation": math.nan}
+    out = company_serializer.one(imported)
+    assert out["name"] == "42"
+    assert out["email"] == "9876543210@imported.local"
+    assert out["designation"] is None
+    assert out["compensation"] == {"percentage": 0.0}
+    assert company_serializer.one({"_id": ObjectId()})["email"] == "unknown@imported.local"
+
+
+def test_list_routes_use_fast_path(client):
+    mock_db.employees.delete_many({})
+    mock_db.employees.insert_many([dict(doc) for doc in EMPLOYEES])
+    res = client.get("/employees/")
+    assert res.status_code == 200
+    by_email = {e["email"]: e for e in res.json()}
+    assert by_email["asha@z.com"]["joining_date"] == "2026-01-15"
+    assert by_email["asha@z.com"]["compensation"]["hra"] == 0.0
+    assert "offer_token" not in by_email["asha@z.com"]
+    assert by_email["bare@z.com"]["location"] == "Remote"
+    mock_db.employees.delete_many({})
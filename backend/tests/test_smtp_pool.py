@@ -0,0 +1,178 @@
+import smtplib
+import threading
+import time
+from email.mime.text import MIMEText
+from unittest.mock import patch
+
+import pytest
+
+from app.services.smtp_pool import SMTPConnectionPool, SMTPNotSent
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.alive = True
+        self.logins = 0
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def noop(self):
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected("gone")
+        return (250, b"OK")
+
+    def send_message(self, msg):
+        # Like smtplib: MAIL/RCPT first, then the message body in data()
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.data(msg)
+
+    def data(self, msg):
+        self.sent.append(msg)
+
+    def quit(self):
+        self.alive = False
+
+    def close(self):
+        self.alive = False
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp():
+    FakeSMTP.instances = []
+    with patch("app.services.smtp_pool.smtplib.SMTP", FakeSMTP):
+        yield
+
+
+def _msg():
+    msg = MIMEText("hello")
+    msg["To"] = "a@test.com"
+    return msg
+
+
+def test_pool_reuses_connection():
+    pool = SMTPConnectionPool("smtp.test", 587, "user", "pw")
+    for _ in range(5):
+        pool.send_message(_msg())
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+    assert pool.stats["sent"] == 5
+    assert pool.stats["reuses"] == 4
+
+
+def test_pool_reconnects_stale_connection():
+    pool = SMTPConnectionPool("smtp.test", 587, "user", "pw", probe_after=0)
+    pool.send_message(_msg())
+    FakeSMTP.instances[0].alive = False
+
+    pool.send_message(_msg())
+    assert len(FakeSMTP.instances) == 2
+    assert len(FakeSMTP.instances[1].sent) == 1
+    assert pool.stats["reconnects"] == 1
+
+
+def test_pool_retries_when_dropped_mid_send():
+    pool = SMTPConnectionPool("smtp.test", 587, "user", "pw", probe_after=3600)
+    pool.send_message(_msg())
+    FakeSMTP.instances[0].alive = False
+
+    pool.send_message(_msg())
+    assert len(FakeSMTP.instances) == 2
+    assert pool.stats["sent"] == 2
+
+
+def test_pool_recycles_after_message_limit():
+    pool = SMTPConnectionPool("smtp.test", 587, "user", "pw", max_messages_per_connection=2)
+    for _ in range(4):
+        pool.send_message(_msg())
+    assert len(FakeSMTP.instances) == 2
+
+
+def test_pool_caps_concurrent_connections():
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    class SlowSMTP(FakeSMTP):
+        def send_message(self, msg):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    with patch("app.services.smtp_pool.smtplib.SMTP", SlowSMTP):
+        pool = SMTPConnectionPool("smtp.test", 587, "user", "pw", max_connections=2)
+        threads = [threading.Thread(target=pool.send_message, args=(_msg(),)) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert max(peak) <= 2
+    assert len(FakeSMTP.instances) <= 2
+    assert pool.stats["sent"] == 10
+
+
+def test_close_shuts_in_flight_connections_on_return():
+    closed_mid_send = []
+
+    class ClosingSMTP(FakeSMTP):
+        def send_message(self, msg):
+            super().send_message(msg)
+            if not closed_mid_send:
+                closed_mid_send.append(1)
+                pool.close()
+
+    with patch("app.services.smtp_pool.smtplib.SMTP", ClosingSMTP):
+        pool = SMTPConnectionPool("smtp.test", 587, "user", "pw")
+        pool.send_message(_msg())
+
+    assert pool._idle == []
+    assert FakeSMTP.instances[0].alive is False
+
+
+def test_closed_pool_opens_no_connections():
+    pool = SMTPConnectionPool("smtp.test", 587, "user", "pw")
+    pool.close()
+    with pytest.raises(SMTPNotSent):
+        pool.send_message(_msg())
+    assert FakeSMTP.instances == []
+
+
+def test_disconnect_after_data_is_not_resent():
+    class DroppingSMTP(FakeSMTP):
+        def data(self, msg):
+            super().data(msg)
+            raise smtplib.SMTPServerDisconnected("dropped after the body")
+
+    with patch("app.services.smtp_pool.smtplib.SMTP", DroppingSMTP):
+        pool = SMTPConnectionPool("smtp.test", 587, "user", "pw")
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            pool.send_message(_msg())
+
+    assert len(FakeSMTP.instances) == 1
+    assert pool.stats["reconnects"] == 0
+
+
+def test_disconnect_before_data_on_both_connections_is_not_sent():
+    pool = SMTPConnectionPool("smtp.test", 587, "user", "pw")
+    pool.send_message(_msg())
+    FakeSMTP.instances[0].alive = False
+
+    class DeadSMTP(FakeSMTP):
+        def send_message(self, msg):
+            raise smtplib.SMTPServerDisconnected("gone")
+
+    with patch("app.services.smtp_pool.smtplib.SMTP", DeadSMTP):
+        with pytest.raises(SMTPNotSent):
+            pool.send_message(_msg())
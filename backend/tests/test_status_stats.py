@@ -0,0 +1,76 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.status_stats import StatusCounts, company_counts, employee_counts
+
+sys.path.insert(0, os.path.dirname(__file__))
+from conftest import mock_db
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    mock_db.employees.delete_many({})
+    mock_db.companies.delete_many({})
+    employee_counts.invalidate()
+    company_counts.invalidate()
+    yield
+    mock_db.employees.delete_many({})
+    mock_db.companies.delete_many({})
+
+
+def test_counts_are_cached_until_invalidated():
+    counts = StatusCounts("employees", ("Pending", "Accepted"), ttl=60)
+    mock_db.employees.insert_many([{"status": "Pending"}, {"status": "Pending"}, {"status": "On Hold"}, {}])
+    first = counts.get(mock_db)
+    assert first == {"total": 4, "by_status": {"Pending": 3, "Accepted": 0, "On Hold": 1}}
+
+    mock_db.employees.insert_one({"status": "Accepted"})
+    assert counts.get(mock_db) is first
+    counts.invalidate()
+    assert counts.get(mock_db)["by_status"]["Accepted"] == 1
+
+
+def test_ttl_expiry():
+    counts = StatusCounts("employees", ("Pending",), ttl=0)
+    assert counts.get(mock_db)["total"] == 0
+    mock_db.employees.insert_one({"status": "Pending"})
+    assert counts.get(mock_db)["total"] == 1
+
+
+def test_write_during_aggregation_is_not_cached():
+    counts = StatusCounts("employees", ("Pending",), ttl=60)
+
+    class RacingDb:
+        def __getitem__(self, name):
+            counts.invalidate()  # a status change lands while the aggregation runs
+            return mock_db[name]
+
+    counts.get(RacingDb())
+    assert counts._cached is None
+
+
+def test_employee_stats_route(client):
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    mock_db.employees.insert_many([
+        {"name": "A", "email": "a@z.com", "status": "Offer Sent", "expires_at": past},
+        {"name": "B", "email": "b@z.com", "status": "Accepted"},
+    ])
+    res = client.get("/employees/stats")
+    assert res.status_code == 200
+    # The overdue offer is expired before counting, as the list endpoint would
+    assert res.json()["by_status"] == {"Pending": 0, "Offer Sent": 0, "Accepted": 1, "Rejected": 1}
+
+    client.post("/employees/", json={"name": "C", "email": "c@z.com", "ctc": 600000, "basic_salary": 240000})
+    stats = client.get("/employees/stats").json()
+    assert stats["total"] == 3 and stats["by_status"]["Pending"] == 1
+
+
+def test_company_stats_route(client):
+    client.post("/agreement-companies/", json={"name": "Acme", "email": "hr@acme.com", "percentage": 8.33})
+    assert client.get("/agreement-companies/stats").json() == {"total": 1, "by_status": {"Pending": 1, "Agreement Sent": 0}}
+    company_id = mock_db.companies.find_one()["_id"]
+    client.delete(f"/agreement-companies/{company_id}")
+    assert client.get("/agreement-companies/stats").json()["total"] == 0
@@ -0,0 +1,113 @@
+import re
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from app.routes import assets, upload
+from app.services.asset_store import AssetStore
+from app.services import template_render
+from app.services.template_render import TemplateRenderer, build_renditions
+
+
+def _pdf_bytes():
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_text((50, 80), "Template")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _png_bytes(alpha=False):
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 3000, 4000), alpha)
+    pix.clear_with(200)
+    return pix.tobytes("png")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AssetStore(tmp_path)
+    with patch.object(upload, "asset_store", store), patch.object(assets, "asset_store", store):
+        yield store
+
+
+def test_build_renditions_sizes_and_formats():
+    renditions = build_renditions(_pdf_bytes(), "pdf", dpi=300)
+    jpegs = {r.name: r for r in renditions if r.format == "jpeg"}
+    assert set(jpegs) == {"thumb", "preview", "print"}
+    assert jpegs["thumb"].width == 320
+    assert jpegs["preview"].width == 1240
+    assert jpegs["print"].width == 2480
+    assert len(jpegs["thumb"].data) < len(jpegs["preview"].data) < len(jpegs["print"].data)
+    assert jpegs["print"].data[:3] == b"\xff\xd8\xff"
+
+
+def test_build_renditions_without_pillow_is_jpeg_only():
+    with patch.object(template_render, "Image", None):
+        renditions = build_renditions(_pdf_bytes(), "pdf", dpi=72)
+    assert {r.format for r in renditions} == {"jpeg"}
+
+
+def test_transparent_image_keeps_alpha_and_print_is_capped():
+    renditions = build_renditions(_png_bytes(alpha=True), "image")
+    printed = next(r for r in renditions if r.name == "print" and r.format != "webp")
+    assert printed.format == "png"
+    assert printed.width == template_render.PRINT_MAX_WIDTH
+
+
+def test_template_pdf_upload_stores_hashed_renditions(client, store):
+    files = {"file": ("Acme.pdf", _pdf_bytes(), "application/pdf")}
+    res = client.post("/upload/template-pdf?dpi=72", files=files)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["filename"] == "Acme.pdf.jpg"
+    assert re.fullmatch(r"/assets/templates/[0-9a-f]{32}\.jpg", data["url"])
+    assert not any(p.name.startswith("Acme") for p in store.root.iterdir())
+
+    manifest = client.get("/assets/templates/manifest").json()
+    assert {r["url"] for r in manifest["Acme.pdf.jpg"]["renditions"]} == {r["url"] for r in data["renditions"]}
+
+    res = client.get("/assets/templates/by-name/Acme.pdf.jpg?rendition=thumb", follow_redirects=False)
+    assert res.status_code == 302
+    assert client.get(res.headers["location"]).content[:3] == b"\xff\xd8\xff"
+
+
+def test_same_name_upload_does_not_overwrite(client, store):
+    first = client.post("/upload/template-image", files={"file": ("Logo.png", _png_bytes(), "image/png")}).json()
+    second = client.post("/upload/template-image", files={"file": ("Logo.png", _png_bytes(alpha=True), "image/png")}).json()
+    assert first["url"] != second["url"]
+    assert client.get(first["url"]).status_code == 200
+    assert store.resolve("Logo.png")["renditions"] == second["renditions"]
+
+
+def test_asset_caching_and_ranges(client, store):
+    filename = store.put(b"0123456789", "pdf")
+    assert store.put(b"0123456789", "pdf") == filename
+    url = f"/assets/templates/{filename}"
+
+    res = client.get(url)
+    assert res.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert res.headers["etag"] == f'"{filename[:-4]}"'
+    assert client.get(url, headers={"If-None-Match": res.headers["etag"]}).status_code == 304
+
+    partial = client.get(url, headers={"Range": "bytes=2-5"})
+    assert partial.status_code == 206
+    assert partial.content == b"2345"
+
+    assert client.get("/assets/templates/../manifest.json").status_code == 404
+    assert client.get("/assets/templates/" + "0" * 32 + ".jpg").status_code == 404
+
+
+def test_template_pdf_upload_rejects_when_pool_is_full(client, store):
+    busy = TemplateRenderer(workers=1, max_pending=1, mode="thread")
+    busy._slots.acquire()
+    with patch.object(upload, "template_renderer", busy):
+        res = client.post("/upload/template-pdf", files={"file": ("B.pdf", _pdf_bytes(), "application/pdf")})
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "5"
+
+
+def test_template_pdf_upload_validates_type(client, store):
+    res = client.post("/upload/template-pdf", files={"file": ("x.txt", b"hi", "text/plain")})
+    assert res.status_code == 400
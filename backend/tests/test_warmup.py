@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from app.services import template_render
+from app.services import warmup as warmup_module
+from app.services.health import HealthMonitor
+from app.services.template_render import TemplateRenderer
+from app.services.warmup import Warmup
+
+
+def _run(w):
+    asyncio.run(w.run())
+    return w
+
+
+def test_runs_sync_and_async_steps_concurrently():
+    calls = []
+
+    def slow_sync():
+        time.sleep(0.1)
+        calls.append("sync")
+
+    async def slow_async():
+        await asyncio.sleep(0.1)
+        calls.append("async")
+
+    w = Warmup(steps=(("a", slow_sync), ("b", slow_async), ("c", slow_sync)))
+    start = time.perf_counter()
+    _run(w)
+    assert time.perf_counter() - start < 0.25
+    assert sorted(calls) == ["async", "sync", "sync"]
+    assert w.done
+    assert {r["status"] for r in w.results.values()} == {"ok"}
+
+
+def test_failures_and_timeouts_do_not_block_completion():
+    def boom():
+        raise RuntimeError("ollama down")
+
+    async def hang():
+        await asyncio.sleep(5)
+
+    w = _run(Warmup(steps=(("llm", boom), ("slow", hang)), step_timeout=0.05))
+    assert w.done
+    assert w.results["llm"] == {"status": "failed", "duration_ms": w.results["llm"]["duration_ms"], "error": "ollama down"}
+    assert w.results["slow"]["status"] == "timeout"
+
+
+def test_readiness_waits_for_warmup():
+    w = Warmup(steps=(("noop", lambda: None),))
+    monitor = HealthMonitor(checks={"mongo": (lambda: None, True)}, gate=w)
+    monitor.refresh()
+
+    ready, report = monitor.readiness()
+    assert not ready
+    assert report["status"] == "warming_up"
+    assert report["warmup"]["state"] == "pending"
+
+    _run(w)
+    ready, report = monitor.readiness()
+    assert ready
+    assert report["status"] == "ready"
+    assert report["warmup"]["steps"]["noop"]["status"] == "ok"
+
+
+def test_skip_counts_as_done():
+    w = Warmup(steps=(("never", lambda: 1 / 0),))
+    w.skip()
+    assert w.done and w.results == {}
+
+
+def test_template_step_compiles_company_templates():
+    from app.services import docx_engine, email_templates
+    email_templates._offer_templates.cache_clear()
+    docx_engine._company_template.cache_clear()
+    warmup_module.warm_templates()
+    assert email_templates._offer_templates.cache_info().currsize >= 1
+    assert docx_engine._company_template.cache_info().currsize >= 1
+
+
+def test_renderer_warm_starts_workers():
+    renderer = TemplateRenderer(workers=2, mode="thread")
+    try:
+        assert renderer.warm()
+    finally:
+        renderer.shutdown()
+
+
+def test_renderer_processes_are_not_forked_by_default(monkeypatch):
+    renderer = TemplateRenderer(workers=2, mode="process")
+    monkeypatch.setattr(template_render, "template_renderer", renderer)
+    warmup_module.warm_renderer()
+    assert renderer._executor is None
+
+    monkeypatch.setattr(template_render, "template_renderer", TemplateRenderer(workers=2, mode="thread"))
+    try:
+        warmup_module.warm_renderer()
+        assert template_render.template_renderer._executor is not None
+    finally:
+        template_render.template_renderer.shutdown()
+
+
+def test_llm_step_sends_empty_prompt(monkeypatch):
+    sent = {}
+
+    class Ok:
+        def raise_for_status(self):
+            pass
+
+    def fake_post(url, json, timeout):
+        sent.update(json)
+        return Ok()
+
+    monkeypatch.setattr("app.services.ai_service.requests.post", fake_post)
+    warmup_module.warm_llm()
+    assert sent["prompt"] == ""
+    assert sent["keep_alive"] == warmup_module.WARMUP_LLM_KEEP_ALIVE
@@ -9,6 +9,7 @@ import { generateOfferLetterPdf } from './utils/offerLetterPdfGenerator';
 import { generatePdfWithTemplate } from './utils/pdfTemplateGenerator';
 import { motion, AnimatePresence } from 'framer-motion';
 import { API_URL } from './config';
+import { buildEmailFormData } from './utils/emailForm';
 import {
   Users, Rocket, CheckCircle, XCircle, Clock,
   Search, LayoutGrid, List, Plus, Download,
@@ -137,16 +138,14 @@ function App() {
         const genData = await genRes.json();
         const contentWithoutHeader = genData.content.replace(/<div style="text-align: center; border-bottom: 2px solid #0056b3;[\s\S]*?<\/div>/i, '');
         const pdfDataUri = await generateOfferLetterPdf(contentWithoutHeader, template);
-        await fetch(`${API_URL}/email/send`, {
+        await fetch(`${API_URL}/email/send-file`, {
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({
+          body: await buildEmailFormData({
             employee_id: id,
             letter_content: genData.content,
-            pdf_base64: pdfDataUri,
             subject: `${type} - ${emp.name}`,
             company_name: company
-          })
+          }, pdfDataUri)
         });
       } catch (err) { console.error(err); }
     }
@@ -242,16 +241,14 @@ function App() {
         const genData = await genRes.json();
         const contentWithoutHeader = genData.content.replace(/<div style="text-align: center; border-bottom: 2px solid #0056b3;[\s\S]*?<\/div>/i, '');
         const pdfDataUri = await generatePdfWithTemplate(contentWithoutHeader, template);
-        await fetch(`${API_URL}/agreement-email/send`, {
+        await fetch(`${API_URL}/agreement-email/send-file`, {
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({
+          body: await buildEmailFormData({
             employee_id: id,
             letter_content: genData.content,
-            pdf_base64: pdfDataUri,
             subject: `Agreement - ${co.name}`,
             company_name: company
-          })
+          }, pdfDataUri)
         });
       } catch (err) { console.error(err); }
     }
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
 import { generatePdfWithTemplate } from '../utils/pdfTemplateGenerator';
 import { API_URL } from '../config';
+import { buildEmailFormData } from '../utils/emailForm';
 import {
     Sparkles, X, UploadCloud, FileText, Send,
     Download, AlignLeft, AlignCenter, AlignRight, Pencil
@@ -173,7 +174,8 @@ const AgreementLetterModal = ({ employee, onClose, onSuccess }) => {
             });
             const data = await res.json();
             if (!res.ok) throw new Error(data.detail || "Upload failed");
-            setSelectedTemplate(data.url);
+            // Hashed asset URL served by the API; cacheable forever
+            setSelectedTemplate(`${API_URL}${data.url}`);
 
             // Auto-extract company name from filename
             let parsedName = data.filename.replace(/\.pdf\.jpg$|\.jpg$|\.png$/i, '');
@@ -321,23 +323,21 @@ const AgreementLetterModal = ({ employee, onClose, onSuccess }) => {
 
         try {
             const subject = `${letterType} - ${employee.name}`;
-            const res = await fetch(`${API_URL}/agreement-email/send`, {
+            const res = await fetch(`${API_URL}/agreement-email/send-file`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
+                body: await buildEmailFormData({
                     employee_id: employee.id,
                     letter_content: generatedContent,
-                    pdf_base64: pdfUrl,
                     custom_message: emailBody,
                     subject: subject,
                     company_name: companyName
-                })
+                }, pdfUrl)
             });
 
             const data = await res.json();
             if (data.status === 'error') throw new Error(data.message);
 
-            alert("Email Sent Successfully! 🚀");
+            alert(data.status === 'queued' ? "Email queued for delivery! 🚀" : "Email Sent Successfully! 🚀");
             btn.innerText = 'Sent ✅';
             if (onSuccess) onSuccess();
 
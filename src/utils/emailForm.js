@@ -0,0 +1,13 @@
+// Builds the multipart body for /email/send-file and /agreement-email/send-file.
+// The PDF goes up as raw bytes, which is ~25% smaller than the base64 data URI.
+export const buildEmailFormData = async (fields, pdfDataUri, filename = 'letter.pdf') => {
+    const form = new FormData();
+    Object.entries(fields).forEach(([key, value]) => {
+        if (value !== undefined && value !== null) form.append(key, value);
+    });
+    if (pdfDataUri) {
+        const blob = await fetch(pdfDataUri).then(r => r.blob());
+        form.append('pdf', new Blob([blob], { type: 'application/pdf' }), filename);
+    }
+    return form;
+};
@@ -128,7 +128,7 @@ export const generateOfferLetterPdf = async (htmlContent, templateUrl = '/Arah_T
         let templatePdfDoc = null;
 
         if (isImage) {
-            const imgRes = await fetch(`${templateUrl}?t=${Date.now()}`);
+            const imgRes = await fetch(templateUrl);
             const ct = imgRes.headers.get('content-type');
             if (!imgRes.ok || (ct && ct.includes('text/html'))) {
                 throw new Error(`Template image not found: ${templateUrl}`);
@@ -141,7 +141,7 @@ export const generateOfferLetterPdf = async (htmlContent, templateUrl = '/Arah_T
             }
             templateImage = imageBytes;
         } else {
-            const pdfRes = await fetch(`${templateUrl}?t=${Date.now()}`);
+            const pdfRes = await fetch(templateUrl);
             if (!pdfRes.ok) throw new Error(`Template PDF not found: ${templateUrl}`);
             templatePdfDoc = await PDFDocument.load(await pdfRes.arrayBuffer());
         }
@@ -298,7 +298,7 @@ export const generatePdfWithTemplate = async (htmlContent, templateUrl = '/Arah_
         let templatePage = null;
 
         if (isImage) {
-            const imgRes = await fetch(`${templateUrl}?t=${Date.now()}`);
+            const imgRes = await fetch(templateUrl);
             const ct = imgRes.headers.get('content-type');
             if (!imgRes.ok || (ct && ct.includes('text/html'))) {
                 throw new Error(`Template image not found: ${templateUrl}`);
@@ -316,7 +316,7 @@ export const generatePdfWithTemplate = async (htmlContent, templateUrl = '/Arah_
                     catch { return await finalDoc.embedPng(imageBytes); }
                 })();
         } else {
-            const templateRes = await fetch(`${templateUrl}?t=${Date.now()}`);
+            const templateRes = await fetch(templateUrl);
             if (!templateRes.ok) throw new Error(`Template PDF not found: ${templateUrl}`);
             templatePdfDoc = await PDFDocument.load(await templateRes.arrayBuffer());
             const [embeddedPage] = await finalDoc.embedPdf(templatePdfDoc, [0]);